@@ -0,0 +1,255 @@
+"""
+HTTP conditional requests for the insights API.
+
+Every response is a function of the data files and the query parameters, so
+the validated parameters and the content of the files are hashed into a
+strong ETag (with the newest file mtime as Last-Modified) before the
+endpoint runs. Instances serving identical data therefore send identical
+ETags. A poll whose `If-None-Match` or `If-Modified-Since` still matches
+gets an empty 304 without loading, filtering or serializing anything, and a
+repeated query is answered from the serialized response cache (compressed
+once per content coding). Requests with invalid parameters always reach
+the endpoint, so they get their 422.
+"""
+
+import hashlib
+from datetime import datetime, timezone
+from email.utils import formatdate, parsedate_to_datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from fastapi import Request, Response
+from fastapi.dependencies.utils import get_flat_dependant, request_params_to_args
+from fastapi.routing import APIRoute
+
+from app.core.compression import compress, negotiate
+from app.core.config import settings
+from app.api.v1.response_cache import CachedResponse, ResponseCache
+from app.services import insight_loader
+from app.services.cache import FileIdentity, file_identity
+
+# Query parameters that don't change the response body
+IGNORED_PARAMS = {"refresh"}
+
+TRUE_VALUES = {"1", "true", "yes", "on"}
+
+# Serialized bodies of successful responses, keyed by ETag
+response_cache = ResponseCache(max_bytes=settings.RESPONSE_CACHE_MAX_BYTES)
+
+
+# Data file -> (identity it was hashed at, SHA-1 of its content)
+_content_hashes: Dict[Path, Tuple[FileIdentity, str]] = {}
+
+# (identity, content hash) of a data file; both None if it doesn't exist
+FileState = Tuple[Optional[FileIdentity], Optional[str]]
+
+
+def _cached_states(files: List[Path]) -> Optional[List[FileState]]:
+    """States of `files` if every existing one was hashed at its identity."""
+    states = []
+    for path in files:
+        identity = file_identity(path)
+        cached = _content_hashes.get(path)
+        if identity is None:
+            states.append((None, None))
+        elif cached is not None and cached[0] == identity:
+            states.append(cached)
+        else:
+            return None
+    return states
+
+
+def _hash_files(files: List[Path]) -> List[FileState]:
+    """States of `files`, hashing those changed since they were last hashed."""
+    states = []
+    for path in files:
+        identity = file_identity(path)
+        cached = _content_hashes.get(path)
+        if identity is None:
+            states.append((None, None))
+            continue
+        if cached is None or cached[0] != identity:
+            digest = hashlib.sha1()
+            try:
+                with open(path, "rb") as f:
+                    for chunk in iter(lambda: f.read(1 << 20), b""):
+                        digest.update(chunk)
+            except OSError:
+                states.append((None, None))
+                continue
+            cached = _content_hashes[path] = (identity, digest.hexdigest())
+        states.append(cached)
+    return states
+
+
+async def data_state() -> List[FileState]:
+    """
+    State of every data file. Files are only read (in the loader pool) when
+    they changed since they were last hashed; otherwise this is one stat per
+    file.
+    """
+    files = insight_loader.source_files(settings.OUTPUT_DIR, settings.DATA_DIR)
+    states = _cached_states(files)
+    if states is None:
+        states = await insight_loader.run_in_pool(_hash_files, files)
+    return states
+
+
+def data_validators(
+    path: str, params: Dict[str, Any], states: List[FileState]
+) -> Tuple[str, Optional[float]]:
+    """
+    Return (ETag, Last-Modified timestamp) for a request.
+
+    The ETag covers the API version, the path, the validated query
+    parameters (defaults included) and the content of every data file.
+    Last-Modified is None when no data file exists.
+    """
+    params = sorted(
+        (key, value) for key, value in params.items() if key not in IGNORED_PARAMS
+    )
+    hashes = [digest for _, digest in states]
+    content = repr((settings.VERSION, path, params, hashes))
+    etag = '"' + hashlib.sha1(content.encode()).hexdigest()[:20] + '"'
+
+    mtimes = [identity[2] for identity, _ in states if identity is not None]
+    last_modified = max(mtimes) / 1e9 if mtimes else None
+    return etag, last_modified
+
+
+def data_version(output_dir: str, data_dir: str) -> str:
+    """
+    Short hash of the identity (inode, size, mtime) of every data file; it
+    changes whenever any of them is replaced, modified or removed.
+    """
+    files = insight_loader.source_files(output_dir, data_dir)
+    identities = [file_identity(path) for path in files]
+    return hashlib.sha1(repr(identities).encode()).hexdigest()[:12]
+
+
+def variant_etag(etag: str, encoding: str) -> str:
+    """ETag of the `encoding`-compressed representation (strong ETags differ)."""
+    return f'{etag[:-1]}-{encoding}"'
+
+
+def not_modified_etag(
+    request: Request, etag: str, last_modified: Optional[float]
+) -> Optional[str]:
+    """
+    The ETag to send with a 304 if the client's cached copy is current,
+    else None.
+
+    `If-None-Match` takes precedence over `If-Modified-Since` (RFC 9110);
+    entity tags are compared weakly, as required for GET, and a tag of any
+    compressed variant matches.
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        for tag in if_none_match.split(","):
+            tag = tag.strip()
+            if tag == "*":
+                return etag
+            opaque = tag.removeprefix("W/")
+            if opaque == etag or opaque.startswith(etag[:-1] + "-"):
+                return tag
+        return None
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is None or last_modified is None:
+        return None
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return None
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    # HTTP dates have one-second resolution
+    modified = datetime.fromtimestamp(int(last_modified), tz=timezone.utc)
+    return etag if modified <= since else None
+
+
+def cache_headers(etag: str, last_modified: Optional[float]) -> Dict[str, str]:
+    """ETag, Last-Modified and Cache-Control headers for a response."""
+    max_age = settings.HTTP_CACHE_MAX_AGE
+    headers = {
+        "ETag": etag,
+        "Cache-Control": f"public, max-age={max_age}, must-revalidate",
+        "Vary": "Accept-Encoding",
+    }
+    if last_modified is not None:
+        headers["Last-Modified"] = formatdate(last_modified, usegmt=True)
+    return headers
+
+
+def cached_response(
+    key: str, entry: CachedResponse, encoding: Optional[str], headers: Dict[str, str]
+) -> Response:
+    """
+    Response for a cached body, compressed with `encoding` when it's large
+    enough (`COMPRESSION_MIN_SIZE`). Each compressed variant is kept on the
+    cache entry, so it is only compressed once.
+    """
+    body = entry.body
+    if encoding is not None and len(body) >= settings.COMPRESSION_MIN_SIZE:
+        body = entry.variants.get(encoding)
+        if body is None:
+            body = compress(entry.body, encoding, settings.COMPRESSION_LEVEL)
+            response_cache.add_variant(key, encoding, body)
+        headers = {
+            **headers,
+            "ETag": variant_etag(headers["ETag"], encoding),
+            "Content-Encoding": encoding,
+        }
+    return Response(body, media_type=entry.media_type, headers=headers)
+
+
+class ConditionalRoute(APIRoute):
+    """
+    Route that validates GET requests against the current data version and
+    serves repeated queries from `response_cache`.
+
+    Requests with `refresh=true` always run the endpoint (and replace the
+    cached body). Only successful responses are tagged, cached and
+    compressed here; errors pass through unchanged (to the compression
+    middleware).
+    """
+
+    def get_route_handler(self) -> Callable:
+        handler = super().get_route_handler()
+        query_params = get_flat_dependant(self.dependant).query_params
+
+        async def conditional_handler(request: Request) -> Response:
+            if request.method not in ("GET", "HEAD"):
+                return await handler(request)
+            params, errors = request_params_to_args(query_params, request.query_params)
+            if errors:
+                # The endpoint answers with the validation errors
+                return await handler(request)
+            refresh = request.query_params.get("refresh", "").lower() in TRUE_VALUES
+            encoding = None
+            if settings.COMPRESSION_ENABLED:
+                encoding = negotiate(request.headers.get("accept-encoding"))
+
+            etag, last_modified = data_validators(
+                request.url.path, params, await data_state()
+            )
+            headers = cache_headers(etag, last_modified)
+            if not refresh:
+                current_etag = not_modified_etag(request, etag, last_modified)
+                if current_etag is not None:
+                    headers["ETag"] = current_etag
+                    return Response(status_code=304, headers=headers)
+                cached = response_cache.get(etag)
+                if cached is not None:
+                    return cached_response(etag, cached, encoding, headers)
+
+            response = await handler(request)
+            body = getattr(response, "body", None)
+            if response.status_code != 200 or body is None:
+                return response
+
+            entry = CachedResponse(body, response.media_type)
+            response_cache.set(etag, entry)
+            return cached_response(etag, entry, encoding, headers)
+
+        return conditional_handler
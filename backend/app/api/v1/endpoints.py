@@ -16,18 +16,23 @@ curl "http://localhost:8000/api/v1/alerts-feed?limit=10&types=outbreak,resource"
 curl "http://localhost:8000/api/v1/telecom-advice?name=ikeja"
 """
 
-from datetime import datetime
+import heapq
+from operator import itemgetter
 from fastapi import APIRouter, Depends, HTTPException, Query
-from typing import Optional, List
+from typing import Optional
 import logging
 
 from app.core.config import Settings, settings as app_settings
-from app.services import insight_loader
+from app.services import alerts_feed, insight_loader
+from app.services.record_index import InvalidCursor
 from app.api.v1 import schemas, utils
+from app.api.v1.conditional import ConditionalRoute
+from app.api.v1.serialization import render, validated_rows_async, validator
 
 logger = logging.getLogger("app")
 
-router = APIRouter()
+# Every route answers conditional GETs (ETag / Last-Modified / 304)
+router = APIRouter(route_class=ConditionalRoute)
 
 
 def get_settings() -> Settings:
@@ -51,6 +56,9 @@ async def get_outbreak_alerts(
         100, ge=1, le=1000, description="Maximum number of records to return"
     ),
     offset: int = Query(0, ge=0, description="Starting offset for pagination"),
+    cursor: Optional[str] = Query(
+        None, description="next_cursor of the previous page (instead of offset)"
+    ),
     refresh: bool = Query(False, description="Force reload data from disk"),
     settings: Settings = Depends(get_settings),
 ):
@@ -59,48 +67,56 @@ async def get_outbreak_alerts(
 
     Returns PHCs with resource shortage alerts, sorted by alert level and score.
     """
+    if cursor is not None and offset:
+        raise HTTPException(
+            status_code=400, detail="Use either offset or cursor, not both"
+        )
+
     try:
+        if level and level not in ["Low", "Medium", "High"]:
+            raise HTTPException(
+                status_code=400,
+                detail="Invalid level. Must be Low, Medium, or High",
+            )
+
         # Load data
-        records = insight_loader.load_outbreak_alerts(
+        alerts = await insight_loader.load_outbreak_alerts_async(
             settings.OUTPUT_DIR, refresh=refresh
         )
 
-        # Apply filters
-        if state:
-            records = utils.filter_by_state(records, state)
-        if lga:
-            records = utils.filter_by_lga(records, lga)
-        if level:
-            if level not in ["Low", "Medium", "High"]:
-                raise HTTPException(
-                    status_code=400,
-                    detail="Invalid level. Must be Low, Medium, or High",
-                )
-            records = [r for r in records if r.get("alert_level") == level]
-
-        # Sort by alert level and shortage score
-        records = utils.sort_by_alert_level(records, "alert_level", "shortage_score")
-
-        # Get total count before pagination
-        total_count = len(records)
-
-        # Apply pagination
-        paginated_records = utils.paginate(records, limit, offset)
+        # Filter through the prebuilt indexes and page over the records,
+        # which are already sorted by alert level and shortage score (and
+        # validated once per loaded dataset)
+        rows = await validated_rows_async(alerts, schemas.OutbreakAlertRecord)
+        total_count, paginated_records, next_cursor = alerts.page(
+            state=state,
+            lga=lga,
+            level=level,
+            offset=offset,
+            limit=limit,
+            cursor=cursor,
+            rows=rows,
+        )
 
         logger.info(
             f"Returning {len(paginated_records)} outbreak alerts (total: {total_count})"
         )
 
-        return schemas.OutbreakAlertsResponse(
-            count=len(paginated_records),
-            limit=limit,
-            offset=offset,
-            data=paginated_records,
+        return render(
+            {
+                "count": len(paginated_records),
+                "limit": limit,
+                "offset": offset,
+                "data": paginated_records,
+                "next_cursor": next_cursor,
+            }
         )
 
     except FileNotFoundError as e:
         logger.error(f"Data file not found: {e}")
         raise HTTPException(status_code=404, detail=str(e))
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except ValueError as e:
         logger.error(f"Data validation error: {e}")
         raise HTTPException(status_code=500, detail=f"Invalid data structure: {e}")
@@ -130,49 +146,55 @@ async def get_underserved_phcs(
     """
     try:
         # Load data
-        records = insight_loader.load_underserved_phcs(
+        underserved = await insight_loader.load_underserved_phcs_async(
             settings.OUTPUT_DIR, refresh=refresh
         )
 
-        # Apply filters
-        if state:
-            records = utils.filter_by_state(records, state)
+        # Apply filters using the prebuilt state index
+        rows = await validated_rows_async(underserved, schemas.UnderservedPHCRecord)
+        records = underserved.filter(state=state, rows=rows)
 
         if not records:
-            return schemas.UnderservedResponse(
-                summary=schemas.UnderservedSummary(
-                    avg_underserved_index=0.0, top_underserved_phcs=[]
-                ),
-                count=0,
-                data=[],
+            return render(
+                {
+                    "summary": {
+                        "avg_underserved_index": 0.0,
+                        "top_underserved_phcs": [],
+                    },
+                    "count": 0,
+                    "data": [],
+                }
             )
 
         # Compute average underserved index
         avg_index = sum(r["underserved_index"] for r in records) / len(records)
 
-        # Get top N underserved PHCs
-        sorted_by_index = sorted(
-            records, key=lambda x: x["underserved_index"], reverse=True
+        # Get top N underserved PHCs (heap selection, no full sort)
+        top_records = heapq.nlargest(
+            top_n, records, key=itemgetter("underserved_index")
         )
         top_phcs = [
-            schemas.TopUnderservedPHC(
-                name=r["name"],
-                display_name=r["display_name"],
-                underserved_index=r["underserved_index"],
-            )
-            for r in sorted_by_index[:top_n]
+            {
+                "name": r["name"],
+                "display_name": r["display_name"],
+                "underserved_index": r["underserved_index"],
+            }
+            for r in top_records
         ]
 
         logger.info(
             f"Returning {len(records)} underserved PHCs with avg index {avg_index:.3f}"
         )
 
-        return schemas.UnderservedResponse(
-            summary=schemas.UnderservedSummary(
-                avg_underserved_index=round(avg_index, 3), top_underserved_phcs=top_phcs
-            ),
-            count=len(records),
-            data=records,
+        return render(
+            {
+                "summary": {
+                    "avg_underserved_index": round(avg_index, 3),
+                    "top_underserved_phcs": top_phcs,
+                },
+                "count": len(records),
+                "data": records,
+            }
         )
 
     except FileNotFoundError as e:
@@ -207,109 +229,24 @@ async def get_alerts_feed(
     into a single feed with consistent structure.
     """
     try:
-        feed_items = []
-        timestamp = datetime.utcnow().isoformat() + "Z"
-
         # Parse types filter
-        requested_types = []
+        requested_types = None
         if types:
-            requested_types = [t.strip().lower() for t in types.split(",")]
-
-        # Load outbreak alerts
-        if not types or "outbreak" in requested_types:
-            try:
-                outbreak_records = insight_loader.load_outbreak_alerts(
-                    settings.OUTPUT_DIR, refresh=refresh
-                )
-                for record in outbreak_records:
-                    feed_items.append(
-                        {
-                            "id": utils.generate_alert_id(
-                                record["name"], "outbreak", timestamp
-                            ),
-                            "phc_name": record["name"],
-                            "display_name": record["display_name"],
-                            "lga": record["lga"],
-                            "state": record["state"],
-                            "type": "Outbreak Alert",
-                            "level": record["alert_level"],
-                            "score": float(record["shortage_score"]),
-                            "timestamp": timestamp,
-                        }
-                    )
-            except FileNotFoundError:
-                logger.warning("Outbreak alerts file not found, skipping")
-
-        # Load underserved PHCs
-        if not types or "underserved" in requested_types:
-            try:
-                underserved_records = insight_loader.load_underserved_phcs(
-                    settings.OUTPUT_DIR, refresh=refresh
-                )
-                for record in underserved_records:
-                    # Map underserved_index to level
-                    level = (
-                        "High"
-                        if record["underserved_index"] >= 0.7
-                        else "Medium" if record["underserved_index"] >= 0.4 else "Low"
-                    )
-                    feed_items.append(
-                        {
-                            "id": utils.generate_alert_id(
-                                record["name"], "underserved", timestamp
-                            ),
-                            "phc_name": record["name"],
-                            "display_name": record["display_name"],
-                            "lga": record["lga"],
-                            "state": record["state"],
-                            "type": "Underserved Facility",
-                            "level": level,
-                            "score": record["underserved_index"],
-                            "timestamp": timestamp,
-                        }
-                    )
-            except FileNotFoundError:
-                logger.warning("Underserved PHCs file not found, skipping")
-
-        # Load resource warnings
-        if not types or "resource" in requested_types:
-            try:
-                resource_records = insight_loader.load_resource_warnings(
-                    settings.OUTPUT_DIR, refresh=refresh
-                )
-                for record in resource_records:
-                    feed_items.append(
-                        {
-                            "id": utils.generate_alert_id(
-                                record["name"], "resource", timestamp
-                            ),
-                            "phc_name": record["name"],
-                            "display_name": record["display_name"],
-                            "lga": record["lga"],
-                            "state": record["state"],
-                            "type": "Resource Risk",
-                            "level": record["resource_alert"],
-                            "score": record["resource_risk_score"],
-                            "timestamp": timestamp,
-                        }
-                    )
-            except FileNotFoundError:
-                logger.warning("Resource warnings file not found, skipping")
-
-        # Apply state filter
-        if state:
-            feed_items = utils.filter_by_state(feed_items, state)
-
-        # Sort by level priority then score
-        level_priority = {"High": 3, "Medium": 2, "Low": 1}
-        feed_items.sort(key=lambda x: (-level_priority.get(x["level"], 0), -x["score"]))
-
-        # Apply limit
-        feed_items = feed_items[:limit]
+            requested_types = {t.strip().lower() for t in types.split(",")}
+
+        # The feed is materialized (and validated) once per data version; a
+        # request only filters it by type and state and takes the first
+        # `limit` items
+        feed = await alerts_feed.load_alerts_feed_async(
+            settings.OUTPUT_DIR,
+            refresh=refresh,
+            validate_item=validator(schemas.AlertFeedItem),
+        )
+        feed_items = feed.select(requested_types, state=state, limit=limit)
 
         logger.info(f"Returning {len(feed_items)} alerts in feed")
 
-        return schemas.AlertsFeedResponse(total=len(feed_items), feed=feed_items)
+        return render({"total": len(feed_items), "feed": feed_items})
 
     except Exception as e:
         logger.error(f"Error generating alerts feed: {e}")
@@ -337,18 +274,20 @@ async def get_telecom_advice(
     network connectivity information.
     """
     try:
-        # Load telecom advice data
-        records = insight_loader.get_telecom_advice(settings.DATA_DIR, refresh=refresh)
+        # Load telecom advice (classified and validated once per data file)
+        advice = await insight_loader.get_telecom_advice_async(
+            settings.DATA_DIR, refresh=refresh
+        )
+        rows = await validated_rows_async(advice, schemas.TelecomAdviceRecord)
 
         # Apply filters
+        records = advice.filter(state=state, rows=rows)
         if name:
             records = utils.filter_by_name(records, name)
-        if state:
-            records = utils.filter_by_state(records, state)
 
         logger.info(f"Returning {len(records)} telecom advice records")
 
-        return schemas.TelecomAdviceResponse(count=len(records), data=records)
+        return render({"count": len(records), "data": records})
 
     except FileNotFoundError as e:
         logger.error(f"Data file not found: {e}")
@@ -376,6 +315,9 @@ async def get_resource_warnings(
         100, ge=1, le=1000, description="Maximum number of records to return"
     ),
     offset: int = Query(0, ge=0, description="Starting offset for pagination"),
+    cursor: Optional[str] = Query(
+        None, description="next_cursor of the previous page (instead of offset)"
+    ),
     refresh: bool = Query(False, description="Force reload data from disk"),
     settings: Settings = Depends(get_settings),
 ):
@@ -384,46 +326,56 @@ async def get_resource_warnings(
 
     Returns PHCs with resource shortage warnings, sorted by risk score.
     """
+    if cursor is not None and offset:
+        raise HTTPException(
+            status_code=400, detail="Use either offset or cursor, not both"
+        )
+
     try:
+        if level and level not in ["Low", "Medium", "High"]:
+            raise HTTPException(
+                status_code=400,
+                detail="Invalid level. Must be Low, Medium, or High",
+            )
+
         # Load data
-        records = insight_loader.load_resource_warnings(
+        resource_warnings = await insight_loader.load_resource_warnings_async(
             settings.OUTPUT_DIR, refresh=refresh
         )
 
-        # Apply filters
-        if state:
-            records = utils.filter_by_state(records, state)
-        if lga:
-            records = utils.filter_by_lga(records, lga)
-        if level:
-            if level not in ["Low", "Medium", "High"]:
-                raise HTTPException(
-                    status_code=400,
-                    detail="Invalid level. Must be Low, Medium, or High",
-                )
-            records = [r for r in records if r.get("resource_alert") == level]
-
-        # Sort by risk score
-        records = sorted(records, key=lambda x: x["resource_risk_score"], reverse=True)
-
-        # Get total count before pagination
-        total_count = len(records)
-
-        # Apply pagination
-        paginated_records = utils.paginate(records, limit, offset)
+        # Filter through the prebuilt indexes and page over the records,
+        # which are already sorted by risk score (and validated once per
+        # loaded dataset)
+        rows = await validated_rows_async(
+            resource_warnings, schemas.ResourceWarningRecord
+        )
+        total_count, paginated_records, next_cursor = resource_warnings.page(
+            state=state,
+            lga=lga,
+            level=level,
+            offset=offset,
+            limit=limit,
+            cursor=cursor,
+            rows=rows,
+        )
 
         logger.info(
             f"Returning {len(paginated_records)} resource warnings (total: {total_count})"
         )
 
-        return schemas.ResourceWarningsResponse(
-            count=len(paginated_records),
-            data=paginated_records,
+        return render(
+            {
+                "count": len(paginated_records),
+                "data": paginated_records,
+                "next_cursor": next_cursor,
+            }
         )
 
     except FileNotFoundError as e:
         logger.error(f"Data file not found: {e}")
         raise HTTPException(status_code=404, detail=str(e))
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except ValueError as e:
         logger.error(f"Data validation error: {e}")
         raise HTTPException(status_code=500, detail=f"Invalid data structure: {e}")
@@ -442,70 +394,51 @@ async def get_metrics_summary(
         100, ge=1, le=1000, description="Maximum number of records to return"
     ),
     offset: int = Query(0, ge=0, description="Starting offset for pagination"),
+    cursor: Optional[str] = Query(
+        None, description="next_cursor of the previous page (instead of offset)"
+    ),
+    refresh: bool = Query(False, description="Force reload data from disk"),
     settings: Settings = Depends(get_settings),
 ):
     """
     Get comprehensive metrics summary for all PHCs.
 
-    Returns data from the metrics_summary.csv file with all PHC metrics.
+    Returns all PHC metrics from metrics.arrow when present, otherwise
+    from metrics_summary.csv.
     """
-    try:
-        import pandas as pd
-        from pathlib import Path
-
-        file_path = Path(settings.OUTPUT_DIR) / "metrics_summary.csv"
-
-        if not file_path.exists():
-            raise HTTPException(
-                status_code=404, detail=f"Metrics summary file not found: {file_path}"
-            )
-
-        logger.info(f"Loading metrics summary from {file_path}")
-
-        # Load CSV
-        df = pd.read_csv(file_path)
-
-        # Normalize column names
-        column_mapping = {
-            "Name of Primary Health Center": "name",
-            "PHC LGA": "lga",
-            "State of PHC": "state",
-            "shortage_score": "shortage_score",
-            "mean_service_score": "mean_service_score",
-            "underserved_index": "underserved_index",
-            "resource_risk_score": "resource_risk_score",
-            "resource_alert": "resource_alert",
-        }
-
-        df = df.rename(columns=column_mapping)
-
-        # Convert to records
-        records = df.to_dict("records")
-
-        # Apply filters
-        if state:
-            records = [r for r in records if r.get("state", "").lower() == state.lower()]
-        if lga:
-            records = [r for r in records if r.get("lga", "").lower() == lga.lower()]
+    if cursor is not None and offset:
+        raise HTTPException(
+            status_code=400, detail="Use either offset or cursor, not both"
+        )
 
-        # Get total count before pagination
-        total_count = len(records)
+    try:
+        summary = await insight_loader.load_metrics_summary_async(
+            settings.OUTPUT_DIR, refresh=refresh
+        )
 
-        # Apply pagination
-        paginated_records = records[offset : offset + limit]
+        # Filter through the prebuilt state/LGA indexes and page in file order
+        rows = await validated_rows_async(summary, schemas.MetricsSummaryRecord)
+        total_count, paginated_records, next_cursor = summary.page(
+            state=state, lga=lga, offset=offset, limit=limit, cursor=cursor, rows=rows
+        )
 
         logger.info(
             f"Returning {len(paginated_records)} metrics records (total: {total_count})"
         )
 
-        return schemas.MetricsSummaryResponse(
-            count=len(paginated_records),
-            data=paginated_records,
+        return render(
+            {
+                "count": len(paginated_records),
+                "data": paginated_records,
+                "next_cursor": next_cursor,
+            }
         )
 
     except FileNotFoundError as e:
         logger.error(f"Data file not found: {e}")
         raise HTTPException(status_code=404, detail=str(e))
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Error loading metrics summary: {e}")
         raise HTTPException(
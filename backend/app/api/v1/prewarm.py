@@ -0,0 +1,188 @@
+"""
+Startup prewarm and readiness.
+
+A fresh worker would otherwise pay for reading, indexing and validating each
+dataset on the first request that needs it. `prewarm` does all of that at
+startup: every dataset is loaded into the loader cache, its rows are
+validated against the response schema (`validated_rows_async`) and the alerts feed
+is materialized. `readiness` records how long it took and which data version
+was loaded, and `/ready` reports 503 until it is done so the platform only
+routes traffic to warm instances. Datasets that fail to load are retried
+with exponential backoff, so a transient read error during boot does not
+keep the instance out of rotation until it is restarted.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple, Type
+
+from pydantic import BaseModel
+
+from app.api.v1 import schemas
+from app.api.v1.conditional import data_version
+from app.api.v1.serialization import validated_rows_async, validator
+from app.core.config import settings
+from app.services import alerts_feed, insight_loader
+from app.services.record_index import IndexedRecords
+
+logger = logging.getLogger("app")
+
+# Dataset name -> (async loader, whether it reads DATA_DIR rather than
+# OUTPUT_DIR, response schema)
+DATASETS: Dict[
+    str, Tuple[Callable[[str], Awaitable[IndexedRecords]], bool, Type[BaseModel]]
+] = {
+    "outbreak_alerts": (
+        insight_loader.load_outbreak_alerts_async,
+        False,
+        schemas.OutbreakAlertRecord,
+    ),
+    "underserved_phcs": (
+        insight_loader.load_underserved_phcs_async,
+        False,
+        schemas.UnderservedPHCRecord,
+    ),
+    "resource_warnings": (
+        insight_loader.load_resource_warnings_async,
+        False,
+        schemas.ResourceWarningRecord,
+    ),
+    "metrics_summary": (
+        insight_loader.load_metrics_summary_async,
+        False,
+        schemas.MetricsSummaryRecord,
+    ),
+    "telecom_advice": (
+        insight_loader.get_telecom_advice_async,
+        True,
+        schemas.TelecomAdviceRecord,
+    ),
+}
+
+
+class Readiness:
+    """
+    Outcome of the startup prewarm.
+
+    `ready` is set once every dataset has been loaded (or found missing);
+    a dataset that fails to load leaves the instance not ready until a
+    retry loads it. `retries` counts the retry rounds so far.
+    """
+
+    def __init__(self):
+        self.ready = False
+        self.started_at: Optional[float] = None
+        self.load_seconds: Optional[float] = None
+        self.data_version: Optional[str] = None
+        self.records: Dict[str, int] = {}
+        self.missing: List[str] = []
+        self.errors: Dict[str, str] = {}
+        self.retries = 0
+
+    def reset(self) -> None:
+        self.__init__()
+
+    def to_dict(self) -> Dict:
+        if self.ready:
+            status = "ready"
+        elif self.errors:
+            status = "failed"
+        elif self.started_at is not None:
+            status = "warming"
+        else:
+            status = "not_started"
+        return {
+            "status": status,
+            "load_seconds": self.load_seconds,
+            "data_version": self.data_version,
+            "records": self.records,
+            "missing": self.missing,
+            "errors": self.errors,
+            "retries": self.retries,
+        }
+
+
+# Readiness of this process (reported by /ready)
+readiness = Readiness()
+
+
+async def _warm_dataset(name: str, output_dir: str, data_dir: str) -> None:
+    load, uses_data_dir, model = DATASETS[name]
+    records = await load(data_dir if uses_data_dir else output_dir)
+    await validated_rows_async(records, model)
+    readiness.records[name] = len(records)
+
+
+async def _warm_datasets(names: List[str], output_dir: str, data_dir: str) -> None:
+    results = await asyncio.gather(
+        *(_warm_dataset(name, output_dir, data_dir) for name in names),
+        return_exceptions=True,
+    )
+    for name, result in zip(names, results):
+        if isinstance(result, FileNotFoundError):
+            logger.warning(f"Prewarm: {name} data file not found, skipping")
+            readiness.errors.pop(name, None)
+            readiness.missing.append(name)
+        elif isinstance(result, Exception):
+            logger.error(f"Prewarm: failed to load {name}: {result}")
+            readiness.errors[name] = str(result)
+        else:
+            readiness.errors.pop(name, None)
+
+
+async def _warm_alerts_feed(output_dir: str) -> None:
+    try:
+        feed = await alerts_feed.load_alerts_feed_async(
+            output_dir, validate_item=validator(schemas.AlertFeedItem)
+        )
+        readiness.records["alerts_feed"] = sum(
+            len(source.items) for source in feed.sources.values()
+        )
+        readiness.errors.pop("alerts_feed", None)
+    except Exception as e:
+        logger.error(f"Prewarm: failed to build alerts feed: {e}")
+        readiness.errors["alerts_feed"] = str(e)
+
+
+async def prewarm(
+    output_dir: str,
+    data_dir: str,
+    retry_seconds: float = settings.PREWARM_RETRY_SECONDS,
+    max_retry_seconds: float = settings.PREWARM_RETRY_MAX_SECONDS,
+) -> Readiness:
+    """
+    Load, index and validate every dataset, then build the alerts feed.
+
+    Datasets are warmed concurrently. Missing files are logged and skipped
+    (their endpoints answer 404 as usual); any other error is recorded in
+    `readiness.errors` and leaves the instance not ready. Failed steps are
+    retried after `retry_seconds`, doubling up to `max_retry_seconds`,
+    until they succeed (0 disables retries).
+    """
+    readiness.reset()
+    readiness.started_at = time.perf_counter()
+
+    await _warm_datasets(list(DATASETS), output_dir, data_dir)
+    delay = retry_seconds
+    while True:
+        if not readiness.errors.keys() & DATASETS.keys():
+            await _warm_alerts_feed(output_dir)
+        if not readiness.errors or not retry_seconds:
+            break
+        logger.warning(f"Prewarm: retrying {', '.join(readiness.errors)} in {delay}s")
+        await asyncio.sleep(delay)
+        delay = min(delay * 2, max_retry_seconds)
+        readiness.retries += 1
+        failed = [name for name in DATASETS if name in readiness.errors]
+        await _warm_datasets(failed, output_dir, data_dir)
+
+    version = data_version(output_dir, data_dir)
+    readiness.load_seconds = round(time.perf_counter() - readiness.started_at, 3)
+    readiness.data_version = version
+    readiness.ready = not readiness.errors
+    logger.info(
+        f"Prewarm finished in {readiness.load_seconds}s "
+        f"(data version {version}, ready={readiness.ready})"
+    )
+    return readiness
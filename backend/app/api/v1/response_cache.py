@@ -0,0 +1,104 @@
+"""
+LRU cache of serialized API responses.
+
+Entries are keyed by the request's ETag, which already covers the endpoint,
+the normalized query parameters and the data version, so a cached body is
+valid for exactly as long as the ETag is. Repeated queries skip loading,
+filtering, validation and JSON encoding. Compressed variants of a body are
+kept on its entry, so each is compressed once.
+"""
+
+from collections import OrderedDict
+from typing import Dict, Optional
+
+
+class CachedResponse:
+    """A serialized response body, its media type and compressed variants."""
+
+    __slots__ = ("body", "media_type", "variants")
+
+    def __init__(self, body: bytes, media_type: Optional[str]):
+        self.body = body
+        self.media_type = media_type
+        # Content coding ("gzip", "br") -> compressed body
+        self.variants: Dict[str, bytes] = {}
+
+    @property
+    def size(self) -> int:
+        return len(self.body) + sum(len(v) for v in self.variants.values())
+
+
+class ResponseCache:
+    """
+    Size-bounded LRU cache of response bodies.
+
+    Only used from the event loop, so no locking is needed.
+
+    Args:
+        max_bytes: Total body bytes kept before the least recently used
+            entries are evicted (0 disables caching)
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, CachedResponse]" = OrderedDict()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        """Return the cached response for `key` (marking it recently used)."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def set(self, key: str, entry: CachedResponse) -> None:
+        """Store `entry`, evicting least recently used entries to make room."""
+        if entry.size > self.max_bytes:
+            return
+        self.discard(key)
+        self._entries[key] = entry
+        self.size += entry.size
+        self._evict()
+
+    def add_variant(self, key: str, encoding: str, body: bytes) -> None:
+        """Keep a compressed variant on the entry for `key`, if still cached."""
+        entry = self._entries.get(key)
+        if entry is None or encoding in entry.variants:
+            return
+        entry.variants[encoding] = body
+        self.size += len(body)
+        self._evict()
+
+    def _evict(self) -> None:
+        while self.size > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self.size -= evicted.size
+            self.evictions += 1
+
+    def discard(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.size -= entry.size
+
+    def clear(self) -> None:
+        """Drop all entries and reset the counters."""
+        self._entries.clear()
+        self.size = 0
+        self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Entry count, byte size and hit/miss/eviction counters."""
+        return {
+            "entries": len(self._entries),
+            "bytes": self.size,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
@@ -43,6 +43,9 @@ class OutbreakAlertsResponse(BaseModel):
     data: List[OutbreakAlertRecord] = Field(
         ..., description="List of outbreak alert records"
     )
+    next_cursor: Optional[str] = Field(
+        None, description="Cursor for the next page (None on the last page)"
+    )
 
 
 class UnderservedPHCRecord(BaseModel):
@@ -190,6 +193,9 @@ class ResourceWarningsResponse(BaseModel):
     data: List[ResourceWarningRecord] = Field(
         ..., description="List of resource warning records"
     )
+    next_cursor: Optional[str] = Field(
+        None, description="Cursor for the next page (None on the last page)"
+    )
 
 
 class MetricsSummaryRecord(BaseModel):
@@ -212,6 +218,9 @@ class MetricsSummaryResponse(BaseModel):
     data: List[MetricsSummaryRecord] = Field(
         ..., description="List of all PHC metrics"
     )
+    next_cursor: Optional[str] = Field(
+        None, description="Cursor for the next page (None on the last page)"
+    )
 
 
 class ErrorResponse(BaseModel):
@@ -0,0 +1,150 @@
+"""
+Response compression (brotli when installed, else gzip).
+
+`CompressionMiddleware` compresses any response body of at least
+`minimum_size` bytes that isn't already encoded. API routes serve bodies
+pre-compressed from the response cache instead, so hot payloads are
+compressed once; the middleware passes those through untouched.
+"""
+
+import gzip
+import logging
+from functools import lru_cache
+from typing import List, Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+logger = logging.getLogger("app")
+
+# Content types worth compressing (prefix match)
+COMPRESSIBLE_TYPES = (
+    "application/json",
+    "application/javascript",
+    "application/xml",
+    "text/",
+)
+
+
+@lru_cache(maxsize=1)
+def _brotli_available() -> bool:
+    try:
+        import brotli  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def supported_encodings() -> List[str]:
+    """Content codings we can produce, most preferred first."""
+    return ["br", "gzip"] if _brotli_available() else ["gzip"]
+
+
+def negotiate(accept_encoding: Optional[str]) -> Optional[str]:
+    """
+    Pick the content coding for an `Accept-Encoding` header value.
+
+    Returns the most preferred supported coding the client accepts (q > 0),
+    or None to send the body uncompressed.
+    """
+    if not accept_encoding:
+        return None
+
+    accepted = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[coding.strip().lower()] = quality
+
+    for encoding in supported_encodings():
+        if accepted.get(encoding, accepted.get("*", 0.0)) > 0:
+            return encoding
+    return None
+
+
+def compress(body: bytes, encoding: str, level: int) -> bytes:
+    """
+    Compress `body` with `encoding` ("br" or "gzip").
+
+    `level` is the gzip level (1-9), also used as the brotli quality. Output
+    is deterministic (no gzip timestamp), so compressed bodies can share
+    strong ETags.
+    """
+    if encoding == "br":
+        import brotli
+
+        return brotli.compress(body, quality=min(max(level, 0), 11))
+    return gzip.compress(body, compresslevel=min(max(level, 1), 9), mtime=0)
+
+
+def is_compressible(content_type: Optional[str]) -> bool:
+    return bool(content_type) and content_type.startswith(COMPRESSIBLE_TYPES)
+
+
+class CompressionMiddleware:
+    """
+    ASGI middleware compressing single-message response bodies.
+
+    Streaming responses, already-encoded responses and bodies smaller than
+    `minimum_size` are sent unchanged.
+
+    Args:
+        app: Wrapped application
+        minimum_size: Smallest body (in bytes) worth compressing
+        level: gzip level (1-9), also used as the brotli quality
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = 1024, level: int = 6):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.level = level
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate(Headers(scope=scope).get("accept-encoding"))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start: Optional[Message] = None
+        passthrough = False
+
+        async def compressing_send(message: Message) -> None:
+            nonlocal start, passthrough
+            if message["type"] == "http.response.start":
+                start = message
+                return
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            headers = MutableHeaders(raw=start["headers"])
+            if (
+                message.get("more_body", False)
+                or "content-encoding" in headers
+                or len(body) < self.minimum_size
+                or not is_compressible(headers.get("content-type"))
+            ):
+                passthrough = True
+                await send(start)
+                await send(message)
+                return
+
+            body = compress(body, encoding, self.level)
+            headers["Content-Encoding"] = encoding
+            headers["Content-Length"] = str(len(body))
+            headers.add_vary_header("Accept-Encoding")
+            await send(start)
+            await send({"type": "http.response.body", "body": body})
+
+        await self.app(scope, receive, compressing_send)
@@ -14,6 +14,41 @@ class Settings(BaseSettings):
     OUTPUT_DIR: str = "outputs"
     DATA_DIR: str = "data"
 
+    # Data cache: "ttl" expires entries after CACHE_TTL_SECONDS (and on file
+    # change); "file" keeps entries until their source file changes
+    CACHE_INVALIDATION: str = "ttl"
+    CACHE_TTL_SECONDS: int = 30
+    # Serve TTL-expired data while it is reloaded in the background
+    CACHE_STALE_WHILE_REVALIDATE: bool = True
+    # Reload changed files in a background thread instead of on request
+    CACHE_WATCH: bool = False
+    CACHE_WATCH_INTERVAL: float = 2.0
+    # Threads that read/parse data files off the event loop
+    LOADER_THREADS: int = 4
+    # Directory for memory-mapped dataset snapshots shared by all workers on
+    # the host (e.g. /dev/shm/checkmyphc); empty keeps a copy per worker
+    SNAPSHOT_DIR: str = ""
+    # Seconds clients may reuse a response before revalidating it (with
+    # If-None-Match / If-Modified-Since, answered by a 304 if unchanged)
+    HTTP_CACHE_MAX_AGE: int = 0
+    # Bytes of serialized responses kept for repeated queries (0 disables)
+    RESPONSE_CACHE_MAX_BYTES: int = 32 * 1024 * 1024
+    # JSON encoder for responses: "auto"/"orjson" (orjson when installed) or "json"
+    JSON_RESPONSE: str = "auto"
+    # Response compression (brotli when installed, else gzip) for bodies of at
+    # least COMPRESSION_MIN_SIZE bytes; COMPRESSION_LEVEL is the gzip level
+    # (1-9), also used as the brotli quality
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_MIN_SIZE: int = 1024
+    COMPRESSION_LEVEL: int = 6
+    # Load, index and validate every dataset at startup; /ready answers 503
+    # until this is done (when disabled, datasets load on first request)
+    PREWARM: bool = True
+    # Delay before retrying a dataset that failed to prewarm, doubled after
+    # each failed retry up to PREWARM_RETRY_MAX_SECONDS (0 disables retries)
+    PREWARM_RETRY_SECONDS: float = 1.0
+    PREWARM_RETRY_MAX_SECONDS: float = 60.0
+
     # CORS configuration
     CORS_ORIGINS: str = "*"
 
@@ -5,14 +5,21 @@ A production-ready FastAPI service that serves insights data
 for the CheckMyPHC frontend application.
 """
 
+import asyncio
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 import logging
 
+from app.core.compression import CompressionMiddleware
 from app.core.config import settings
 from app.core.logging import setup_logging
 from app.api.v1 import endpoints
+from app.api.v1.conditional import response_cache
+from app.api.v1.prewarm import prewarm, readiness
+from app.api.v1.serialization import ResponseClass
+from app.services import insight_loader
 
 # Setup logging
 logger = setup_logging(log_level=settings.LOG_LEVEL, log_file="logs/app.log")
@@ -25,8 +32,26 @@ app = FastAPI(
     docs_url="/docs",
     redoc_url="/redoc",
     openapi_url="/openapi.json",
+    default_response_class=ResponseClass,
+)
+
+# Background reloader for changed data files (enabled with CACHE_WATCH)
+cache_watcher = insight_loader.cache_watcher(
+    [settings.OUTPUT_DIR, settings.DATA_DIR],
+    interval=settings.CACHE_WATCH_INTERVAL,
 )
 
+# Startup prewarm, run in the background so /health answers meanwhile
+prewarm_task = None
+
+# Compress responses (API routes serve pre-compressed cached bodies)
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.COMPRESSION_MIN_SIZE,
+        level=settings.COMPRESSION_LEVEL,
+    )
+
 # Configure CORS
 app.add_middleware(
     CORSMiddleware,
@@ -39,7 +64,9 @@ app.add_middleware(
 
 @app.on_event("startup")
 async def startup_event():
-    """Log startup information."""
+    """Log startup information and start prewarming the datasets."""
+    global prewarm_task
+
     logger.info("=" * 80)
     logger.info(f"Starting {settings.PROJECT_NAME} v{settings.VERSION}")
     logger.info(f"Output Directory: {settings.OUTPUT_DIR}")
@@ -47,12 +74,30 @@ async def startup_event():
     logger.info(f"Log Level: {settings.LOG_LEVEL}")
     logger.info(f"Debug Mode: {settings.DEBUG}")
     logger.info(f"CORS Origins: {settings.CORS_ORIGINS}")
+    logger.info(
+        f"Cache: {settings.CACHE_INVALIDATION} invalidation, watch={settings.CACHE_WATCH}"
+    )
+    logger.info(f"Prewarm: {settings.PREWARM}")
     logger.info("=" * 80)
 
+    if settings.PREWARM:
+        prewarm_task = asyncio.create_task(
+            prewarm(settings.OUTPUT_DIR, settings.DATA_DIR)
+        )
+    else:
+        readiness.ready = True
+
+    if settings.CACHE_WATCH:
+        cache_watcher.start()
+
 
 @app.on_event("shutdown")
 async def shutdown_event():
-    """Log shutdown information."""
+    """Stop prewarming, the cache watcher and loader pool, and log shutdown."""
+    if prewarm_task is not None and not prewarm_task.done():
+        prewarm_task.cancel()
+    cache_watcher.stop()
+    insight_loader.shutdown()
     logger.info("Shutting down CheckMyPHC Insights API")
 
 
@@ -78,7 +123,7 @@ async def health_check():
     """
     Detailed health check endpoint.
 
-    Returns service health status.
+    Returns service health status and response cache counters.
     """
     return JSONResponse(
         {
@@ -86,10 +131,26 @@ async def health_check():
             "service": settings.PROJECT_NAME,
             "version": settings.VERSION,
             "timestamp": None,  # Will be set by FastAPI
+            "response_cache": response_cache.stats(),
         }
     )
 
 
+@app.get("/ready", tags=["Health"])
+async def readiness_check():
+    """
+    Readiness check endpoint.
+
+    Returns 503 until the startup prewarm has loaded, indexed and validated
+    every dataset (or if one failed to load), then 200 with the load
+    duration and the data version that was loaded.
+    """
+    return JSONResponse(
+        {"service": settings.PROJECT_NAME, **readiness.to_dict()},
+        status_code=200 if readiness.ready else 503,
+    )
+
+
 # Include API v1 router
 app.include_router(
     endpoints.router, prefix=settings.API_V1_PREFIX, tags=["Insights API v1"]
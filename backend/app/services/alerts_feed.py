@@ -0,0 +1,238 @@
+"""
+Materialized alerts feed combining outbreak alerts, underserved facilities
+and resource warnings.
+
+The feed items are built once per data version (the versions of the three
+loaded datasets) instead of on every request. Each source's items are kept
+in feed order (in a compact `ColumnStore`) with a state index, so a request
+only picks sources by type, filters by state and merges the first `limit`
+items, which are the only ones materialized as dicts.
+"""
+
+import hashlib
+import heapq
+import logging
+from datetime import datetime
+from itertools import islice
+from typing import Callable, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from app.services import insight_loader
+from app.services.record_index import IndexedRecords, level_then_score
+from app.services.record_store import ColumnStore
+
+logger = logging.getLogger("app")
+
+# Feed order: level priority, then score, both descending
+feed_sort_key = level_then_score("level", "score")
+
+
+def underserved_level(underserved_index: float) -> str:
+    """Map underserved_index to a feed level."""
+    if underserved_index >= 0.7:
+        return "High"
+    if underserved_index >= 0.4:
+        return "Medium"
+    return "Low"
+
+
+def _outbreak_fields(record: Dict) -> Dict:
+    return {
+        "type": "Outbreak Alert",
+        "level": record["alert_level"],
+        "score": float(record["shortage_score"]),
+    }
+
+
+def _underserved_fields(record: Dict) -> Dict:
+    return {
+        "type": "Underserved Facility",
+        "level": underserved_level(record["underserved_index"]),
+        "score": record["underserved_index"],
+    }
+
+
+def _resource_fields(record: Dict) -> Dict:
+    return {
+        "type": "Resource Risk",
+        "level": record["resource_alert"],
+        "score": record["resource_risk_score"],
+    }
+
+
+# Feed alert type -> (async loader, type/level/score builder)
+FEED_SOURCES = {
+    "outbreak": (insight_loader.load_outbreak_alerts_async, _outbreak_fields),
+    "underserved": (insight_loader.load_underserved_phcs_async, _underserved_fields),
+    "resource": (insight_loader.load_resource_warnings_async, _resource_fields),
+}
+
+
+def alert_id(alert_type: str, record: Dict, level: str) -> str:
+    """
+    Stable, content-derived alert ID.
+
+    The same PHC raising the same type of alert at the same level gets the
+    same ID in every poll and across reloads, so clients can dedupe; a level
+    change is a new alert.
+    """
+    content = "\x1f".join(
+        [alert_type, record["name"], record["lga"], record["state"], level]
+    )
+    return hashlib.md5(content.encode()).hexdigest()[:16]
+
+
+def _data_timestamp(records: IndexedRecords) -> str:
+    """ISO 8601 modification time of the file the records were loaded from."""
+    try:
+        modified = datetime.utcfromtimestamp(records.source.stat().st_mtime)
+    except (AttributeError, OSError):
+        modified = datetime.utcnow()
+    return modified.isoformat() + "Z"
+
+
+class FeedSource:
+    """One source's feed items in feed order, plus a state index."""
+
+    def __init__(
+        self,
+        alert_type: str,
+        records: IndexedRecords,
+        build_fields: Callable[[Dict], Dict],
+        validate_item: Optional[Callable[[Dict], Dict]] = None,
+    ):
+        timestamp = _data_timestamp(records)
+        items = []
+        seen: Dict[str, int] = {}
+        for record in records:
+            fields = build_fields(record)
+            item_id = alert_id(alert_type, record, fields["level"])
+            # Identical duplicate records still get distinct, stable IDs
+            occurrence = seen.get(item_id, 0)
+            seen[item_id] = occurrence + 1
+            if occurrence:
+                item_id = f"{item_id}-{occurrence}"
+
+            item = {
+                "id": item_id,
+                "phc_name": record["name"],
+                "display_name": record["display_name"],
+                "lga": record["lga"],
+                "state": record["state"],
+                **fields,
+                "timestamp": timestamp,
+            }
+            items.append(item if validate_item is None else validate_item(item))
+
+        items.sort(key=feed_sort_key)
+        self.by_state: Dict[str, List[int]] = {}
+        for position, item in enumerate(items):
+            state_key = str(item["state"]).lower()
+            self.by_state.setdefault(state_key, []).append(position)
+        self.items = ColumnStore(items)
+
+    def select(self, state: Optional[str] = None) -> Iterable[Mapping]:
+        """Item views (in feed order) for one state, or all of them."""
+        if state:
+            items = self.items
+            return (items[p] for p in self.by_state.get(state.lower(), []))
+        return self.items
+
+
+class AlertsFeed:
+    """
+    The full feed for one combination of dataset versions.
+
+    Args:
+        sources: Alert type -> loaded records (None when the file is missing)
+        validate_item: Applied to every item once, when the feed is built
+            (e.g. validation against the response schema)
+    """
+
+    def __init__(
+        self,
+        sources: Dict[str, Optional[IndexedRecords]],
+        validate_item: Optional[Callable[[Dict], Dict]] = None,
+    ):
+        self.versions = _versions(sources)
+        self.sources = {
+            alert_type: FeedSource(
+                alert_type, records, FEED_SOURCES[alert_type][1], validate_item
+            )
+            for alert_type, records in sources.items()
+            if records is not None
+        }
+
+    def select(
+        self,
+        types: Optional[Iterable[str]] = None,
+        state: Optional[str] = None,
+        limit: int = 200,
+    ) -> List[Dict]:
+        """
+        The first `limit` items of the requested types and state, in feed order.
+
+        Ties keep source order (outbreak, underserved, resource).
+        """
+        selected = [
+            source.select(state)
+            for alert_type, source in self.sources.items()
+            if types is None or alert_type in types
+        ]
+        merged = heapq.merge(*selected, key=feed_sort_key)
+        return [dict(item) for item in islice(merged, limit)]
+
+
+def _versions(sources: Dict[str, Optional[IndexedRecords]]) -> Tuple:
+    return tuple(
+        (alert_type, records.version if records is not None else None)
+        for alert_type, records in sources.items()
+    )
+
+
+# Output directory -> feed for the most recently seen data versions
+_feeds: Dict[str, AlertsFeed] = {}
+
+
+async def load_alerts_feed_async(
+    output_dir: str,
+    refresh: bool = False,
+    validate_item: Optional[Callable[[Dict], Dict]] = None,
+) -> AlertsFeed:
+    """
+    Return the materialized feed for the current data in `output_dir`.
+
+    The three sources come from the loader cache; the feed is rebuilt (in
+    the loader thread pool) only when one of their versions changed, once
+    however many requests are waiting on it. Missing source files are
+    skipped. `validate_item` is passed to `AlertsFeed` when the feed is
+    rebuilt.
+    """
+    sources: Dict[str, Optional[IndexedRecords]] = {}
+    for alert_type, (load, _) in FEED_SOURCES.items():
+        try:
+            sources[alert_type] = await load(output_dir, refresh=refresh)
+        except FileNotFoundError:
+            logger.warning(f"{alert_type.title()} alerts file not found, skipping")
+            sources[alert_type] = None
+
+    versions = _versions(sources)
+    feed = _feeds.get(output_dir)
+    if feed is None or feed.versions != versions:
+        feed = await insight_loader.run_single_flight(
+            f"alerts_feed:{output_dir}:{versions}",
+            _rebuild_feed,
+            output_dir,
+            sources,
+            validate_item,
+        )
+    return feed
+
+
+def _rebuild_feed(
+    output_dir: str,
+    sources: Dict[str, Optional[IndexedRecords]],
+    validate_item: Optional[Callable[[Dict], Dict]],
+) -> AlertsFeed:
+    logger.info("Data changed, rebuilding alerts feed")
+    feed = _feeds[output_dir] = AlertsFeed(sources, validate_item)
+    return feed
@@ -0,0 +1,411 @@
+"""
+In-process cache for loaded datasets.
+
+Entries can be invalidated by age (TTL) and/or by the identity of the file
+they were loaded from, and a background watcher can reload changed entries
+off the request path.
+"""
+
+import asyncio
+import logging
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger("app")
+
+CACHE_MODES = ("ttl", "file")
+
+FileIdentity = Tuple[int, int, int]
+
+
+def file_identity(path: Path) -> Optional[FileIdentity]:
+    """Return (inode, size, mtime_ns) of a file, or None if it doesn't exist."""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_ino, stat.st_size, stat.st_mtime_ns
+
+
+class CacheEntry:
+    """Cached value plus what is needed to validate and reload it."""
+
+    __slots__ = ("value", "timestamp", "source", "identity", "loader")
+
+    def __init__(
+        self,
+        value: Any,
+        source: Optional[Path] = None,
+        loader: Optional[Callable[[], Any]] = None,
+        identity: Optional[FileIdentity] = None,
+    ):
+        self.value = value
+        self.timestamp = datetime.utcnow()
+        self.source = Path(source) if source is not None else None
+        if identity is None and self.source is not None:
+            identity = file_identity(self.source)
+        self.identity = identity
+        self.loader = loader
+
+    def source_changed(self) -> bool:
+        """True if the source file was replaced, rewritten or removed."""
+        return self.source is not None and file_identity(self.source) != self.identity
+
+
+class _Flight:
+    """A load in progress that concurrent callers for the same key wait on."""
+
+    __slots__ = ("done", "value", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value: Any = None
+        self.error: Optional[BaseException] = None
+
+    def result(self) -> Any:
+        self.done.wait()
+        if self.error is not None:
+            raise self.error
+        return self.value
+
+
+class DataLoadCache:
+    """
+    Cache for loaded data.
+
+    Modes:
+    - "ttl": entries expire `ttl_seconds` after being stored, and earlier if
+      their source file changes.
+    - "file": entries with a source file live until that file's identity
+      (inode, size, mtime) changes; entries without one fall back to the TTL.
+
+    Loads through `get_or_load` are single-flight: concurrent misses on a key
+    run its loader once and share the result. With `stale_while_revalidate`,
+    an entry that only outlived its TTL (its source file is unchanged) is
+    still returned while it is reloaded in the background.
+
+    `aget_or_load` is the event-loop friendly variant: hits return without
+    leaving the loop, misses run in a pool of at most `max_workers` threads.
+    Threads rather than processes, since loaded values are shared in-process.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: int = 30,
+        mode: str = "ttl",
+        stale_while_revalidate: bool = False,
+        max_workers: int = 4,
+    ):
+        if mode not in CACHE_MODES:
+            raise ValueError(
+                f"Invalid cache mode '{mode}', expected one of {CACHE_MODES}"
+            )
+        self.ttl_seconds = ttl_seconds
+        self.mode = mode
+        self.stale_while_revalidate = stale_while_revalidate
+        self.cache: Dict[str, CacheEntry] = {}
+        self.max_workers = max_workers
+        self._flights: Dict[str, _Flight] = {}
+        self._pending: Dict[str, Future] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _is_valid(self, entry: CacheEntry) -> bool:
+        if entry.source_changed():
+            return False
+        return not self._is_expired(entry)
+
+    def _is_expired(self, entry: CacheEntry) -> bool:
+        if self.mode == "file" and entry.source is not None:
+            return False
+        age = (datetime.utcnow() - entry.timestamp).total_seconds()
+        return age >= self.ttl_seconds
+
+    def get(self, key: str) -> Optional[Any]:
+        """Get cached value if still valid."""
+        entry = self.cache.get(key)
+        if entry is not None and self._is_valid(entry):
+            return entry.value
+        return None
+
+    def set(
+        self,
+        key: str,
+        value: Any,
+        source: Optional[Path] = None,
+        loader: Optional[Callable[[], Any]] = None,
+    ):
+        """
+        Store value in cache.
+
+        Args:
+            key: Cache key
+            value: Loaded data
+            source: File the value was loaded from (enables file invalidation)
+            loader: Callable returning a freshly loaded value; used by
+                `reload_changed` to refresh the entry in the background
+        """
+        with self._lock:
+            self.cache[key] = CacheEntry(value, source, loader)
+
+    def get_or_load(
+        self,
+        key: str,
+        loader: Callable[[], Any],
+        source: Optional[Path] = None,
+        refresh: bool = False,
+    ) -> Any:
+        """
+        Return the cached value for `key`, loading it with `loader` on a miss.
+
+        Args:
+            key: Cache key
+            loader: Callable that reads and returns the value
+            source: File the value is read from; an entry cached from a
+                different file is treated as a miss
+            refresh: Skip the cache and reload (still single-flight)
+
+        Raises:
+            Whatever `loader` raises, in every caller waiting on that load
+        """
+        source = Path(source) if source is not None else None
+        hit, value = self._lookup(key, loader, source, refresh)
+        if hit:
+            return value
+        return self._load(key, loader, source)
+
+    async def aget_or_load(
+        self,
+        key: str,
+        loader: Callable[[], Any],
+        source: Optional[Path] = None,
+        refresh: bool = False,
+    ) -> Any:
+        """
+        Async `get_or_load`: a miss is loaded in the worker pool and awaited,
+        so the event loop keeps serving other requests meanwhile.
+        """
+        source = Path(source) if source is not None else None
+        hit, value = self._lookup(key, loader, source, refresh)
+        if hit:
+            return value
+        return await asyncio.wrap_future(self._submit(key, loader, source))
+
+    async def run_in_pool(self, func: Callable[..., Any], *args) -> Any:
+        """Await blocking `func(*args)` run in the worker pool."""
+        return await asyncio.wrap_future(self._pool().submit(func, *args))
+
+    async def run_single_flight(self, key: str, func: Callable[..., Any], *args) -> Any:
+        """
+        `run_in_pool`, but concurrent calls with the same `key` share one run
+        of `func` (the result is not cached). `key` must not be a cache key.
+        """
+        return await asyncio.wrap_future(self._submit_once(key, func, *args))
+
+    def _lookup(
+        self,
+        key: str,
+        loader: Callable[[], Any],
+        source: Optional[Path],
+        refresh: bool,
+    ) -> Tuple[bool, Any]:
+        """(True, value) for a usable entry, else (False, None)."""
+        entry = self.cache.get(key)
+        if refresh or entry is None or entry.source != source or entry.source_changed():
+            return False, None
+        if not self._is_expired(entry):
+            return True, entry.value
+        if self.stale_while_revalidate:
+            self._revalidate(key, loader, source)
+            return True, entry.value
+        return False, None
+
+    def _load(self, key: str, loader: Callable[[], Any], source: Optional[Path]) -> Any:
+        """Run `loader` for `key` unless a load is already in flight, then wait on it."""
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+
+        if not leader:
+            logger.debug(f"Waiting for in-flight load of '{key}'")
+            return flight.result()
+
+        try:
+            # Identity is taken before reading, so a write during the load
+            # still invalidates the entry afterwards
+            identity = file_identity(source) if source is not None else None
+            flight.value = loader()
+            with self._lock:
+                self.cache[key] = CacheEntry(flight.value, source, loader, identity)
+            return flight.value
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+
+    def _pool(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="data-loader"
+                )
+            return self._executor
+
+    def _submit(
+        self, key: str, loader: Callable[[], Any], source: Optional[Path]
+    ) -> Future:
+        """Load `key` in the worker pool, reusing a load already queued for it."""
+        return self._submit_once(key, self._load, key, loader, source)
+
+    def _submit_once(self, key: str, func: Callable[..., Any], *args) -> Future:
+        """Run `func(*args)` in the worker pool unless a run for `key` is queued."""
+        pool = self._pool()
+        with self._lock:
+            future = self._pending.get(key)
+            queued = future is None
+            if queued:
+                future = self._pending[key] = pool.submit(func, *args)
+        if queued:
+            # Outside the lock: an already finished future runs this inline
+            future.add_done_callback(lambda f: self._finish_pending(key, f))
+        return future
+
+    def _finish_pending(self, key: str, future: Future):
+        with self._lock:
+            if self._pending.get(key) is future:
+                del self._pending[key]
+
+    def _revalidate(self, key: str, loader: Callable[[], Any], source: Optional[Path]):
+        """Reload `key` in the worker pool unless a load is already running."""
+        if key in self._flights or key in self._pending:
+            return
+
+        def log_failure(future: Future):
+            if future.exception() is not None:
+                logger.warning(
+                    f"Background refresh of '{key}' failed: {future.exception()}"
+                )
+
+        logger.debug(f"Serving stale '{key}' while it is refreshed")
+        self._submit(key, loader, source).add_done_callback(log_failure)
+
+    def reload_changed(self) -> List[str]:
+        """
+        Reload every entry whose source file changed, using its loader.
+
+        Entries without a loader, or whose reload fails, are dropped so the
+        next request reloads them.
+
+        Returns:
+            Keys that were reloaded or dropped
+        """
+        changed = [
+            (key, entry)
+            for key, entry in list(self.cache.items())
+            if entry.source_changed()
+        ]
+        for key, entry in changed:
+            if entry.loader is not None:
+                logger.info(f"Source of '{key}' changed, reloading in background")
+                try:
+                    self._load(key, entry.loader, entry.source)
+                    continue
+                except Exception as e:
+                    logger.warning(f"Background reload of '{key}' failed: {e}")
+
+            with self._lock:
+                if self.cache.get(key) is entry:
+                    del self.cache[key]
+        return [key for key, _ in changed]
+
+    def clear(self):
+        """Clear all cached data."""
+        with self._lock:
+            self.cache.clear()
+
+    def shutdown(self):
+        """Stop the worker pool; it is recreated on the next miss."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+
+class CacheWatcher:
+    """
+    Background thread that reloads cache entries when their files change.
+
+    Uses inotify-style notifications through `watchfiles` when it is
+    installed (it ships with uvicorn[standard]) and falls back to polling
+    file identities every `interval` seconds.
+    """
+
+    def __init__(
+        self,
+        cache: DataLoadCache,
+        directories: Iterable[str],
+        interval: float = 2.0,
+        use_notifications: bool = True,
+    ):
+        self.cache = cache
+        self.directories = [str(d) for d in directories]
+        self.interval = interval
+        self.use_notifications = use_notifications
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        if self.running:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="data-cache-watcher", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self):
+        directories = [d for d in self.directories if os.path.isdir(d)]
+        watch = None
+        if self.use_notifications and directories:
+            try:
+                from watchfiles import watch
+            except ImportError:
+                logger.info("watchfiles not installed, polling for data changes")
+
+        logger.info(f"Watching {directories} for data changes")
+        if watch is not None:
+            for _ in watch(
+                *directories,
+                stop_event=self._stop,
+                rust_timeout=int(self.interval * 1000),
+                yield_on_timeout=True,
+            ):
+                self._reload()
+        else:
+            while not self._stop.wait(self.interval):
+                self._reload()
+
+    def _reload(self):
+        try:
+            self.cache.reload_changed()
+        except Exception as e:
+            logger.warning(f"Cache watcher reload failed: {e}")
@@ -0,0 +1,142 @@
+"""
+Pandas-free CSV reading for the API process.
+
+The API only reads two small CSV files (metrics summary, telecommunication),
+so importing pandas for them would dominate a cold start. `read_csv` parses
+them with the stdlib `csv` module and infers column types the way
+`pandas.read_csv` does by default:
+
+- pandas' default missing-value markers ("", "NA", "nan", "null", ...) are
+  read as None
+- a column whose cells all parse as integers is int (float if some cells
+  are missing), as numbers float, as True/False bool, and str otherwise
+- blank lines are skipped and repeated header names get ".1", ".2", ...
+  suffixes
+
+pandas stays a dependency of the insight engine only.
+"""
+
+import csv
+import re
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# Cells pandas.read_csv treats as missing by default
+NA_VALUES = frozenset(
+    {
+        "",
+        "#N/A",
+        "#N/A N/A",
+        "#NA",
+        "-1.#IND",
+        "-1.#QNAN",
+        "-NaN",
+        "-nan",
+        "1.#IND",
+        "1.#QNAN",
+        "<NA>",
+        "N/A",
+        "NA",
+        "NULL",
+        "NaN",
+        "None",
+        "n/a",
+        "nan",
+        "null",
+    }
+)
+
+BOOL_VALUES = {
+    "True": True,
+    "TRUE": True,
+    "true": True,
+    "False": False,
+    "FALSE": False,
+    "false": False,
+}
+
+INT_PATTERN = re.compile(r"[+-]?\d+")
+
+
+def _parse_float(cell: str) -> Optional[float]:
+    """`cell` as a float, or None if it isn't a number."""
+    if "_" in cell:  # accepted by float(), not by pandas
+        return None
+    try:
+        return float(cell)
+    except ValueError:
+        return None
+
+
+def _convert_column(cells: List[Optional[str]]) -> List:
+    """Convert one column's cells (None for missing) to its inferred type."""
+    present = [cell for cell in cells if cell is not None]
+    if not present:
+        return cells
+
+    if all(INT_PATTERN.fullmatch(cell) for cell in present):
+        convert = float if len(present) < len(cells) else int
+        return [None if cell is None else convert(int(cell)) for cell in cells]
+
+    floats = [_parse_float(cell) for cell in present]
+    if all(value is not None for value in floats):
+        values = iter(floats)
+        return [None if cell is None else next(values) for cell in cells]
+
+    if all(cell in BOOL_VALUES for cell in present):
+        return [None if cell is None else BOOL_VALUES[cell] for cell in cells]
+
+    return cells
+
+
+def _unique_columns(header: List[str]) -> List[str]:
+    """Header names with repeats renamed "name.1", "name.2", ... (as pandas)."""
+    columns: List[str] = []
+    seen = set()
+    for name in header:
+        unique, count = name, 0
+        while unique in seen:
+            count += 1
+            unique = f"{name}.{count}"
+        seen.add(unique)
+        columns.append(unique)
+    return columns
+
+
+def read_csv(file_path: Path) -> Dict[str, List]:
+    """
+    Read a CSV file with a header row into columns.
+
+    Args:
+        file_path: CSV file to read
+
+    Returns:
+        Column name -> values (one per data row, None for missing cells),
+        in file order
+
+    Raises:
+        FileNotFoundError: If `file_path` doesn't exist
+    """
+    with open(file_path, newline="", encoding="utf-8-sig") as f:
+        reader = csv.reader(f)
+        header = next(reader, [])
+        rows = [row for row in reader if row]
+
+    columns = _unique_columns(header)
+    width = len(columns)
+    cells: List[List[Optional[str]]] = [[] for _ in columns]
+    for row in rows:
+        row = row[:width] + [""] * (width - len(row))
+        for column, cell in zip(cells, row):
+            column.append(None if cell in NA_VALUES else cell)
+
+    return {
+        name: _convert_column(column_cells)
+        for name, column_cells in zip(columns, cells)
+    }
+
+
+def to_records(columns: Dict[str, List]) -> List[Dict]:
+    """Columns (as returned by `read_csv`) -> one dict per row."""
+    names = list(columns)
+    return [dict(zip(names, row)) for row in zip(*columns.values())]
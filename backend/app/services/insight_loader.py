@@ -1,19 +1,46 @@
 """
 Data loading and normalization services for CheckMyPHC insights.
 Reads JSON outputs and CSV files, normalizes PHC names consistently.
+
+CSV files are parsed with `csv_reader` rather than pandas, so the API
+process never imports pandas (it is only needed by the insight engine).
 """
 
 import json
 import re
-from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
-import pandas as pd
+from typing import Any, Callable, Dict, Iterable, List, Tuple
 import logging
 
+from app.core.config import settings
+from app.services.cache import CacheWatcher, DataLoadCache
+from app.services.csv_reader import read_csv, to_records
+from app.services.name_table import NameTable
+from app.services.snapshot import SnapshotStore
+from app.services.record_index import (
+    IndexedRecords,
+    level_then_score,
+    score_descending,
+)
+
 logger = logging.getLogger("app")
 
 
+OUTBREAK_ALERTS_FILE = "outbreak_alerts.json"
+UNDERSERVED_PHCS_FILE = "underserved_phcs.json"
+RESOURCE_WARNINGS_FILE = "resource_warnings.json"
+TELECOMMUNICATION_FILE = "telecommunication.csv"
+# Arrow IPC file written by `python -m insight_engine --columnar`
+COLUMNAR_METRICS_FILE = "metrics.arrow"
+METRICS_SUMMARY_FILE = "metrics_summary.csv"
+
+METRICS_COLUMN_MAPPING = {
+    "Name of Primary Health Center": "name",
+    "PHC LGA": "lga",
+    "State of PHC": "state",
+}
+
 ALERT_LEVEL_CANONICAL = {
     "low": "Low",
     "medium": "Medium",
@@ -121,33 +148,32 @@ def _resolve_alert_level(raw_level, shortage_score: float) -> str:
     return "Low"
 
 
-class DataLoadCache:
-    """Simple cache for loaded data with timestamp-based expiry."""
-
-    def __init__(self, ttl_seconds: int = 30):
-        self.ttl_seconds = ttl_seconds
-        self.cache: Dict[str, Tuple[datetime, any]] = {}
-
-    def get(self, key: str) -> Optional[any]:
-        """Get cached value if still valid."""
-        if key in self.cache:
-            timestamp, value = self.cache[key]
-            age = (datetime.utcnow() - timestamp).total_seconds()
-            if age < self.ttl_seconds:
-                return value
-        return None
+# Global cache instance
+_cache = DataLoadCache(
+    ttl_seconds=settings.CACHE_TTL_SECONDS,
+    mode=settings.CACHE_INVALIDATION,
+    stale_while_revalidate=settings.CACHE_STALE_WHILE_REVALIDATE,
+    max_workers=settings.LOADER_THREADS,
+)
 
-    def set(self, key: str, value: any):
-        """Store value in cache with current timestamp."""
-        self.cache[key] = (datetime.utcnow(), value)
 
-    def clear(self):
-        """Clear all cached data."""
-        self.cache.clear()
+@lru_cache(maxsize=None)
+def _snapshot_store(directory: str) -> SnapshotStore:
+    return SnapshotStore(Path(directory))
 
 
-# Global cache instance
-_cache = DataLoadCache(ttl_seconds=30)
+def _shared(
+    key: str, file_path: Path, read: Callable[[], IndexedRecords]
+) -> Callable[[], IndexedRecords]:
+    """
+    `read`, going through the host-wide snapshot in `SNAPSHOT_DIR` when it
+    is set: the first worker to load a version of the file writes it, and
+    every worker maps it read-only instead of keeping its own copy.
+    """
+    if not settings.SNAPSHOT_DIR:
+        return read
+    store = _snapshot_store(settings.SNAPSHOT_DIR)
+    return lambda: store.load(key, file_path, read)
 
 
 def normalize_phc_name(name: str) -> str:
@@ -196,7 +222,11 @@ def get_display_name(name: str) -> str:
     return name.strip().title()
 
 
-def load_outbreak_alerts(output_dir: str, refresh: bool = False) -> List[Dict]:
+# Shared (normalized, display) names for every loader
+phc_names = NameTable(normalize_phc_name, get_display_name)
+
+
+def load_outbreak_alerts(output_dir: str, refresh: bool = False) -> IndexedRecords:
     """
     Load outbreak alerts from JSON file.
 
@@ -205,22 +235,38 @@ def load_outbreak_alerts(output_dir: str, refresh: bool = False) -> List[Dict]:
         refresh: Force reload from disk
 
     Returns:
-        List of outbreak alert records with normalized fields
+        Outbreak alert records with normalized fields and filter indexes,
+        sorted by alert level then shortage score
 
     Raises:
         FileNotFoundError: If outbreak_alerts.json doesn't exist
         ValueError: If JSON structure is invalid
     """
-    cache_key = f"outbreak_alerts_{output_dir}"
+    return _cache.get_or_load(*_outbreak_alerts_args(output_dir), refresh=refresh)
+
+
+async def load_outbreak_alerts_async(
+    output_dir: str, refresh: bool = False
+) -> IndexedRecords:
+    """Async `load_outbreak_alerts`: a cache miss is read in the loader thread pool."""
+    return await _cache.aget_or_load(
+        *_outbreak_alerts_args(output_dir), refresh=refresh
+    )
 
-    if not refresh:
-        cached = _cache.get(cache_key)
-        if cached is not None:
-            logger.debug("Returning cached outbreak alerts")
-            return cached
 
-    file_path = Path(output_dir) / "outbreak_alerts.json"
+def _outbreak_alerts_args(output_dir: str) -> Tuple[str, Callable, Path]:
+    """(cache key, reader, source file) for `load_outbreak_alerts`."""
+    file_path = Path(output_dir) / OUTBREAK_ALERTS_FILE
+    key = f"outbreak_alerts_{output_dir}"
+    return (
+        key,
+        _shared(key, file_path, lambda: _read_outbreak_alerts(file_path)),
+        file_path,
+    )
 
+
+def _read_outbreak_alerts(file_path: Path) -> IndexedRecords:
+    """Read and normalize outbreak alert records."""
     if not file_path.exists():
         raise FileNotFoundError(f"Outbreak alerts file not found: {file_path}")
 
@@ -249,7 +295,7 @@ def load_outbreak_alerts(output_dir: str, refresh: bool = False) -> List[Dict]:
                 )
                 continue
 
-            normalized_name = normalize_phc_name(original_name)
+            normalized_name, display_name = phc_names.lookup(original_name)
 
             lga_raw = _first_non_empty(record, ["lga", "LGA", "PHC LGA"])
             state_raw = _first_non_empty(
@@ -281,7 +327,7 @@ def load_outbreak_alerts(output_dir: str, refresh: bool = False) -> List[Dict]:
 
             normalized_record = {
                 "name": normalized_name,
-                "display_name": get_display_name(original_name),
+                "display_name": display_name,
                 "lga": _normalize_lga_name(lga_raw),
                 "state": _normalize_state_name(state_raw),
                 "shortage_score": max(0, int(round(shortage_score_value))),
@@ -295,12 +341,16 @@ def load_outbreak_alerts(output_dir: str, refresh: bool = False) -> List[Dict]:
             continue
 
     logger.info(f"Loaded {len(normalized_records)} outbreak alert records")
-    _cache.set(cache_key, normalized_records)
 
-    return normalized_records
+    return IndexedRecords(
+        normalized_records,
+        level_field="alert_level",
+        source=file_path,
+        sort_key=level_then_score("alert_level", "shortage_score"),
+    )
 
 
-def load_underserved_phcs(output_dir: str, refresh: bool = False) -> List[Dict]:
+def load_underserved_phcs(output_dir: str, refresh: bool = False) -> IndexedRecords:
     """
     Load underserved PHCs from JSON file.
 
@@ -309,22 +359,37 @@ def load_underserved_phcs(output_dir: str, refresh: bool = False) -> List[Dict]:
         refresh: Force reload from disk
 
     Returns:
-        List of underserved PHC records with normalized fields
+        Underserved PHC records with normalized fields and filter indexes
 
     Raises:
         FileNotFoundError: If underserved_phcs.json doesn't exist
         ValueError: If JSON structure is invalid
     """
-    cache_key = f"underserved_phcs_{output_dir}"
+    return _cache.get_or_load(*_underserved_phcs_args(output_dir), refresh=refresh)
+
+
+async def load_underserved_phcs_async(
+    output_dir: str, refresh: bool = False
+) -> IndexedRecords:
+    """Async `load_underserved_phcs`: a cache miss is read in the loader thread pool."""
+    return await _cache.aget_or_load(
+        *_underserved_phcs_args(output_dir), refresh=refresh
+    )
 
-    if not refresh:
-        cached = _cache.get(cache_key)
-        if cached is not None:
-            logger.debug("Returning cached underserved PHCs")
-            return cached
 
-    file_path = Path(output_dir) / "underserved_phcs.json"
+def _underserved_phcs_args(output_dir: str) -> Tuple[str, Callable, Path]:
+    """(cache key, reader, source file) for `load_underserved_phcs`."""
+    file_path = Path(output_dir) / UNDERSERVED_PHCS_FILE
+    key = f"underserved_phcs_{output_dir}"
+    return (
+        key,
+        _shared(key, file_path, lambda: _read_underserved_phcs(file_path)),
+        file_path,
+    )
 
+
+def _read_underserved_phcs(file_path: Path) -> IndexedRecords:
+    """Read and normalize underserved PHC records."""
     if not file_path.exists():
         raise FileNotFoundError(f"Underserved PHCs file not found: {file_path}")
 
@@ -338,7 +403,7 @@ def load_underserved_phcs(output_dir: str, refresh: bool = False) -> List[Dict]:
     for record in data:
         try:
             original_name = record.get("phc_name", record.get("name", ""))
-            normalized_name = normalize_phc_name(original_name)
+            normalized_name, display_name = phc_names.lookup(original_name)
 
             # Coerce underserved_index to float
             underserved_index = record.get("underserved_index", 0)
@@ -347,7 +412,7 @@ def load_underserved_phcs(output_dir: str, refresh: bool = False) -> List[Dict]:
 
             normalized_record = {
                 "name": normalized_name,
-                "display_name": get_display_name(original_name),
+                "display_name": display_name,
                 "lga": record.get("lga", ""),
                 "state": record.get("state", ""),
                 "underserved_index": float(underserved_index),
@@ -359,12 +424,11 @@ def load_underserved_phcs(output_dir: str, refresh: bool = False) -> List[Dict]:
             continue
 
     logger.info(f"Loaded {len(normalized_records)} underserved PHC records")
-    _cache.set(cache_key, normalized_records)
 
-    return normalized_records
+    return IndexedRecords(normalized_records, source=file_path)
 
 
-def load_resource_warnings(output_dir: str, refresh: bool = False) -> List[Dict]:
+def load_resource_warnings(output_dir: str, refresh: bool = False) -> IndexedRecords:
     """
     Load resource warnings from JSON file.
 
@@ -373,22 +437,38 @@ def load_resource_warnings(output_dir: str, refresh: bool = False) -> List[Dict]
         refresh: Force reload from disk
 
     Returns:
-        List of resource warning records with normalized fields
+        Resource warning records with normalized fields and filter indexes,
+        sorted by risk score (highest first)
 
     Raises:
         FileNotFoundError: If resource_warnings.json doesn't exist
         ValueError: If JSON structure is invalid
     """
-    cache_key = f"resource_warnings_{output_dir}"
+    return _cache.get_or_load(*_resource_warnings_args(output_dir), refresh=refresh)
+
+
+async def load_resource_warnings_async(
+    output_dir: str, refresh: bool = False
+) -> IndexedRecords:
+    """Async `load_resource_warnings`: a cache miss is read in the loader thread pool."""
+    return await _cache.aget_or_load(
+        *_resource_warnings_args(output_dir), refresh=refresh
+    )
 
-    if not refresh:
-        cached = _cache.get(cache_key)
-        if cached is not None:
-            logger.debug("Returning cached resource warnings")
-            return cached
 
-    file_path = Path(output_dir) / "resource_warnings.json"
+def _resource_warnings_args(output_dir: str) -> Tuple[str, Callable, Path]:
+    """(cache key, reader, source file) for `load_resource_warnings`."""
+    file_path = Path(output_dir) / RESOURCE_WARNINGS_FILE
+    key = f"resource_warnings_{output_dir}"
+    return (
+        key,
+        _shared(key, file_path, lambda: _read_resource_warnings(file_path)),
+        file_path,
+    )
 
+
+def _read_resource_warnings(file_path: Path) -> IndexedRecords:
+    """Read and normalize resource warning records."""
     if not file_path.exists():
         raise FileNotFoundError(f"Resource warnings file not found: {file_path}")
 
@@ -402,7 +482,7 @@ def load_resource_warnings(output_dir: str, refresh: bool = False) -> List[Dict]
     for record in data:
         try:
             original_name = record.get("phc_name", record.get("name", ""))
-            normalized_name = normalize_phc_name(original_name)
+            normalized_name, display_name = phc_names.lookup(original_name)
 
             # Coerce resource_risk_score to numeric
             risk_score = record.get("resource_risk_score", 0)
@@ -411,7 +491,7 @@ def load_resource_warnings(output_dir: str, refresh: bool = False) -> List[Dict]
 
             normalized_record = {
                 "name": normalized_name,
-                "display_name": get_display_name(original_name),
+                "display_name": display_name,
                 "lga": record.get("lga", ""),
                 "state": record.get("state", ""),
                 "resource_risk_score": float(risk_score),
@@ -423,12 +503,18 @@ def load_resource_warnings(output_dir: str, refresh: bool = False) -> List[Dict]
             continue
 
     logger.info(f"Loaded {len(normalized_records)} resource warning records")
-    _cache.set(cache_key, normalized_records)
 
-    return normalized_records
+    return IndexedRecords(
+        normalized_records,
+        level_field="resource_alert",
+        source=file_path,
+        sort_key=score_descending("resource_risk_score"),
+    )
 
 
-def load_telecommunication_data(data_dir: str, refresh: bool = False) -> pd.DataFrame:
+def load_telecommunication_data(
+    data_dir: str, refresh: bool = False
+) -> Dict[str, List]:
     """
     Load telecommunication data from CSV file.
 
@@ -437,44 +523,196 @@ def load_telecommunication_data(data_dir: str, refresh: bool = False) -> pd.Data
         refresh: Force reload from disk
 
     Returns:
-        DataFrame with telecommunication data and normalized PHC names
+        Column name -> values, with normalized PHC names added as the
+        "name" and "display_name" columns
 
     Raises:
         FileNotFoundError: If telecommunication.csv doesn't exist
     """
-    cache_key = f"telecommunication_{data_dir}"
+    return _cache.get_or_load(*_telecommunication_data_args(data_dir), refresh=refresh)
+
+
+async def load_telecommunication_data_async(
+    data_dir: str, refresh: bool = False
+) -> Dict[str, List]:
+    """Async `load_telecommunication_data`: a cache miss is read in the loader thread pool."""
+    return await _cache.aget_or_load(
+        *_telecommunication_data_args(data_dir), refresh=refresh
+    )
 
-    if not refresh:
-        cached = _cache.get(cache_key)
-        if cached is not None:
-            logger.debug("Returning cached telecommunication data")
-            return cached
 
-    file_path = Path(data_dir) / "telecommunication.csv"
+def _telecommunication_data_args(data_dir: str) -> Tuple[str, Callable, Path]:
+    """(cache key, reader, source file) for `load_telecommunication_data`."""
+    file_path = Path(data_dir) / TELECOMMUNICATION_FILE
+    return (
+        f"telecommunication_{data_dir}",
+        lambda: _read_telecommunication_data(file_path),
+        file_path,
+    )
 
+
+def _read_telecommunication_data(file_path: Path) -> Dict[str, List]:
+    """Read telecommunication data (as columns) and normalize PHC names."""
     if not file_path.exists():
         raise FileNotFoundError(f"Telecommunication file not found: {file_path}")
 
     logger.info(f"Loading telecommunication data from {file_path}")
 
-    df = pd.read_csv(file_path)
+    columns = read_csv(file_path)
 
     # Normalize PHC names if name column exists
     name_col = None
     for col in ["PHC Name", "phc_name", "Name", "name"]:
-        if col in df.columns:
+        if col in columns:
             name_col = col
             break
 
     if name_col:
-        df["original_name"] = df[name_col]
-        df["name"] = df[name_col].apply(normalize_phc_name)
-        df["display_name"] = df[name_col].apply(get_display_name)
+        columns["original_name"] = columns[name_col]
+        names = [phc_names.lookup(raw_name) for raw_name in columns[name_col]]
+        columns["name"] = [name for name, _ in names]
+        columns["display_name"] = [display_name for _, display_name in names]
+
+    logger.info(f"Loaded {_row_count(columns)} telecommunication records")
+
+    return columns
+
+
+def _row_count(columns: Dict[str, List]) -> int:
+    return len(next(iter(columns.values()), []))
+
+
+def _read_columnar_metrics(file_path: Path) -> List[Dict]:
+    """
+    Read the Arrow IPC metrics file through a read-only memory map.
+
+    Raises:
+        ImportError: If pyarrow is not installed
+    """
+    import pyarrow as pa
+
+    with pa.memory_map(str(file_path), "r") as source:
+        table = pa.ipc.open_file(source).read_all()
+        table = table.rename_columns(
+            [METRICS_COLUMN_MAPPING.get(col, col) for col in table.column_names]
+        )
+        # Dictionary-encoded columns decode to plain strings here
+        return table.to_pylist()
+
+
+@lru_cache(maxsize=1)
+def _pyarrow_available() -> bool:
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        logger.warning("pyarrow is not installed, columnar metrics files are ignored")
+        return False
+    return True
+
+
+def _metrics_source_path(output_dir: str) -> Path:
+    """
+    Pick the metrics file to read: the columnar `metrics.arrow` (memory-mapped,
+    no text parsing) when present and pyarrow is available, else the CSV.
+
+    Raises:
+        FileNotFoundError: If neither metrics file exists
+    """
+    columnar_path = Path(output_dir) / COLUMNAR_METRICS_FILE
+    if columnar_path.exists():
+        if _pyarrow_available():
+            return columnar_path
+        logger.debug(f"pyarrow is not installed, ignoring {columnar_path}")
+
+    file_path = Path(output_dir) / METRICS_SUMMARY_FILE
+    if not file_path.exists():
+        raise FileNotFoundError(f"Metrics summary file not found: {file_path}")
+    return file_path
+
+
+def _normalize_metrics_record(record: Dict) -> Dict:
+    """Replace NaN/missing cells with None and ensure name/state/lga are strings."""
+    normalized = {
+        key: (None if isinstance(value, float) and value != value else value)
+        for key, value in record.items()
+    }
+    for key in ("name", "state", "lga"):
+        value = normalized.get(key)
+        normalized[key] = "" if value is None else str(value)
+    return normalized
 
-    logger.info(f"Loaded {len(df)} telecommunication records")
-    _cache.set(cache_key, df)
 
-    return df
+def load_metrics_summary(output_dir: str, refresh: bool = False) -> IndexedRecords:
+    """
+    Load the per-PHC metrics summary with normalized column names.
+
+    The parsed, indexed summary is cached and reused until the source file
+    changes (or the cache entry expires), or a columnar file appears/disappears.
+
+    Args:
+        output_dir: Directory containing output files
+        refresh: Force reload from disk
+
+    Returns:
+        IndexedRecords with records and state/LGA indexes
+
+    Raises:
+        FileNotFoundError: If neither metrics file exists
+    """
+    return _cache.get_or_load(*_metrics_summary_args(output_dir), refresh=refresh)
+
+
+async def load_metrics_summary_async(
+    output_dir: str, refresh: bool = False
+) -> IndexedRecords:
+    """Async `load_metrics_summary`: a cache miss is read in the loader thread pool."""
+    return await _cache.aget_or_load(
+        *_metrics_summary_args(output_dir), refresh=refresh
+    )
+
+
+def _metrics_summary_args(output_dir: str) -> Tuple[str, Callable, Path]:
+    """(cache key, reader, source file) for `load_metrics_summary`."""
+    file_path = _metrics_source_path(output_dir)
+    key = f"metrics_summary_{output_dir}"
+    return (
+        key,
+        _shared(key, file_path, lambda: _read_metrics_summary(file_path)),
+        file_path,
+    )
+
+
+def _read_metrics_summary(file_path: Path) -> IndexedRecords:
+    """Read the metrics file and build its indexes."""
+    logger.info(f"Loading metrics summary from {file_path}")
+
+    if file_path.name == COLUMNAR_METRICS_FILE:
+        raw_records = _read_columnar_metrics(file_path)
+    else:
+        columns = read_csv(file_path)
+        raw_records = to_records(
+            {METRICS_COLUMN_MAPPING.get(col, col): v for col, v in columns.items()}
+        )
+
+    summary = IndexedRecords(
+        [_normalize_metrics_record(record) for record in raw_records],
+        source=file_path,
+    )
+
+    logger.info(f"Loaded {len(summary.records)} metrics records")
+    return summary
+
+
+# Network descriptions that call for SMS; otherwise these call for WhatsApp
+POOR_NETWORK_INDICATORS = ["2g", "no network", "limited", "poor", "weak", "bad"]
+GOOD_NETWORK_INDICATORS = ["3g", "4g", "5g", "good", "strong", "excellent", "stable"]
+
+POOR_NETWORK_PATTERN = re.compile(
+    "|".join(map(re.escape, POOR_NETWORK_INDICATORS)), re.IGNORECASE
+)
+GOOD_NETWORK_PATTERN = re.compile(
+    "|".join(map(re.escape, GOOD_NETWORK_INDICATORS)), re.IGNORECASE
+)
 
 
 def determine_preferred_channel(telecom_info: str) -> str:
@@ -495,38 +733,86 @@ def determine_preferred_channel(telecom_info: str) -> str:
     if not telecom_info or not isinstance(telecom_info, str):
         return "SMS"
 
-    info_lower = telecom_info.lower()
-
     # Check for poor connectivity indicators
-    poor_indicators = ["2g", "no network", "limited", "poor", "weak", "bad"]
-    if any(indicator in info_lower for indicator in poor_indicators):
+    if POOR_NETWORK_PATTERN.search(telecom_info):
         return "SMS"
 
     # Check for good connectivity indicators
-    good_indicators = ["3g", "4g", "5g", "good", "strong", "excellent", "stable"]
-    if any(indicator in info_lower for indicator in good_indicators):
+    if GOOD_NETWORK_PATTERN.search(telecom_info):
         return "WhatsApp"
 
     # Default to SMS when unsure
     return "SMS"
 
 
-def get_telecom_advice(data_dir: str, refresh: bool = False) -> List[Dict]:
+def classify_preferred_channels(telecom_notes: Iterable) -> List[str]:
+    """
+    `determine_preferred_channel` over a column of notes. Notes repeat a
+    lot, so each distinct note is classified once.
+    """
+    channels: Dict = {}
+    result = []
+    for note in telecom_notes:
+        channel = channels.get(note)
+        if channel is None:
+            channel = channels[note] = determine_preferred_channel(note)
+        result.append(channel)
+    return result
+
+
+def get_telecom_advice(data_dir: str, refresh: bool = False) -> IndexedRecords:
     """
     Load telecom data and provide communication channel advice.
 
+    The advice records are cached (with state/LGA indexes) and rebuilt only
+    when the telecommunication file changes.
+
     Args:
         data_dir: Directory containing source data files
         refresh: Force reload from disk
 
     Returns:
-        List of records with preferred communication channels
+        IndexedRecords with preferred communication channels
+
+    Raises:
+        FileNotFoundError: If the telecommunication file doesn't exist
     """
-    df = load_telecommunication_data(data_dir, refresh)
+    return _cache.get_or_load(*_telecom_advice_args(data_dir), refresh=refresh)
+
+
+async def get_telecom_advice_async(
+    data_dir: str, refresh: bool = False
+) -> IndexedRecords:
+    """Async `get_telecom_advice`: a cache miss is built in the loader thread pool."""
+    return await _cache.aget_or_load(*_telecom_advice_args(data_dir), refresh=refresh)
+
+
+def _telecom_advice_args(data_dir: str) -> Tuple[str, Callable, Path]:
+    """(cache key, reader, source file) for `get_telecom_advice`."""
+    file_path = Path(data_dir) / TELECOMMUNICATION_FILE
+    key = f"telecom_advice_{data_dir}"
+    return (
+        key,
+        _shared(key, file_path, lambda: _build_telecom_advice(file_path)),
+        file_path,
+    )
+
+
+def _first_column(columns: Dict[str, List], names: List[str]) -> List:
+    """The first of the `names` columns present in `columns`, else a column of ""."""
+    for name in names:
+        if name in columns:
+            return columns[name]
+    return [""] * _row_count(columns)
+
+
+def _build_telecom_advice(file_path: Path) -> IndexedRecords:
+    """Read the telecommunication file and classify every PHC's channel at once."""
+    columns = _read_telecommunication_data(file_path)
 
     # Find the transportation/connectivity column
     transport_col = None
-    for col in df.columns:
+    for col in columns:
         if (
             "transportation" in col.lower()
             or "network" in col.lower()
@@ -535,26 +821,60 @@ def get_telecom_advice(data_dir: str, refresh: bool = False) -> List[Dict]:
             transport_col = col
             break
 
-    records = []
-    for _, row in df.iterrows():
-        telecom_notes = ""
-        if transport_col and pd.notna(row.get(transport_col)):
-            telecom_notes = str(row[transport_col])
+    if transport_col:
+        telecom_notes = [
+            "" if note is None else str(note) for note in columns[transport_col]
+        ]
+    else:
+        telecom_notes = [""] * _row_count(columns)
 
-        record = {
-            "name": row.get("name", ""),
-            "display_name": row.get("display_name", ""),
-            "lga": row.get("LGA", row.get("lga", "")),
-            "state": row.get("State", row.get("state", "")),
-            "telecom_notes": telecom_notes,
-            "preferred_channel": determine_preferred_channel(telecom_notes),
-        }
-        records.append(record)
+    advice = {
+        "name": _first_column(columns, ["name"]),
+        "display_name": _first_column(columns, ["display_name"]),
+        "lga": _first_column(columns, ["LGA", "lga"]),
+        "state": _first_column(columns, ["State", "state"]),
+        "telecom_notes": telecom_notes,
+        "preferred_channel": classify_preferred_channels(telecom_notes),
+    }
 
-    return records
+    return IndexedRecords(to_records(advice), source=file_path)
 
 
 def clear_cache():
     """Clear all cached data. Useful for testing or forced refresh."""
     _cache.clear()
+    _snapshot_store.cache_clear()
     logger.info("Data cache cleared")
+
+
+async def run_in_pool(func: Callable[..., Any], *args) -> Any:
+    """Await blocking `func(*args)` run in the loader pool, off the event loop."""
+    return await _cache.run_in_pool(func, *args)
+
+
+async def run_single_flight(key: str, func: Callable[..., Any], *args) -> Any:
+    """`run_in_pool`, sharing one run of `func` among concurrent calls with `key`."""
+    return await _cache.run_single_flight(key, func, *args)
+
+
+def shutdown():
+    """Stop the loader pool (it is recreated on the next load)."""
+    _cache.shutdown()
+
+
+def cache_watcher(directories: Iterable[str], interval: float) -> CacheWatcher:
+    """Watcher reloading cached data when files in `directories` change."""
+    return CacheWatcher(_cache, directories, interval=interval)
+
+
+def source_files(output_dir: str, data_dir: str) -> List[Path]:
+    """Every file the API serves data from, whether or not it currently exists."""
+    output = Path(output_dir)
+    return [
+        output / OUTBREAK_ALERTS_FILE,
+        output / UNDERSERVED_PHCS_FILE,
+        output / RESOURCE_WARNINGS_FILE,
+        output / METRICS_SUMMARY_FILE,
+        output / COLUMNAR_METRICS_FILE,
+        Path(data_dir) / TELECOMMUNICATION_FILE,
+    ]
@@ -0,0 +1,64 @@
+"""
+Process-wide table of normalized PHC names.
+
+The same facility names repeat across every loaded file and every reload.
+The table normalizes each distinct raw name once and hands back interned
+(normalized, display) strings, so all datasets share one copy of each name
+and reloads skip the regex and `.title()` work.
+"""
+
+import sys
+import threading
+from typing import Callable, Dict, Tuple
+
+
+class NameTable:
+    """
+    Memoized raw name -> (normalized name, display name).
+
+    Safe to use from the loader threads: a name looked up concurrently may
+    be normalized twice, but both threads get the same interned strings.
+
+    Args:
+        normalize: Raw name -> normalized name
+        display: Raw name -> display name
+        max_size: Distinct raw names kept; the table is emptied when it
+            would grow past this (names are still interned)
+    """
+
+    def __init__(
+        self,
+        normalize: Callable[[str], str],
+        display: Callable[[str], str],
+        max_size: int = 1_000_000,
+    ):
+        self.normalize = normalize
+        self.display = display
+        self.max_size = max_size
+        self._names: Dict[str, Tuple[str, str]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def lookup(self, raw_name: str) -> Tuple[str, str]:
+        """Return the shared (normalized, display) strings for `raw_name`."""
+        if not isinstance(raw_name, str):
+            # Not memoized; keeps the normalizers' handling of odd values
+            return self.normalize(raw_name), self.display(raw_name)
+        names = self._names.get(raw_name)
+        if names is not None:
+            return names
+        names = (
+            sys.intern(self.normalize(raw_name)),
+            sys.intern(self.display(raw_name)),
+        )
+        with self._lock:
+            if len(self._names) >= self.max_size:
+                self._names.clear()
+            names = self._names.setdefault(raw_name, names)
+        return names
+
+    def clear(self) -> None:
+        with self._lock:
+            self._names.clear()
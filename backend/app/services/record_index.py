@@ -0,0 +1,317 @@
+"""
+Loaded record lists with hash indexes for the API's filters.
+
+Indexes are built once when a dataset is loaded (and cached), so a filtered
+query costs O(matches) instead of a scan with `.lower()` over every record.
+The records themselves are kept in a compact `ColumnStore`.
+"""
+
+import base64
+import hashlib
+import json
+import threading
+from bisect import bisect_left, bisect_right
+from collections.abc import Mapping, Sequence
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from app.services.cache import file_identity
+from app.services.record_store import ColumnStore
+
+LEVEL_PRIORITY = {"High": 3, "Medium": 2, "Low": 1}
+
+
+def level_then_score(level_field: str, score_field: str) -> Callable[[Dict], Tuple]:
+    """Sort key: level (High > Medium > Low > unknown), then score descending."""
+
+    def key(record: Dict) -> Tuple:
+        level = record.get(level_field, "Low")
+        return (-LEVEL_PRIORITY.get(level, 0), -record.get(score_field, 0))
+
+    return key
+
+
+def score_descending(score_field: str) -> Callable[[Dict], Tuple]:
+    """Sort key: score descending."""
+
+    def key(record: Dict) -> Tuple:
+        return (-record.get(score_field, 0),)
+
+    return key
+
+
+class InvalidCursor(ValueError):
+    """A pagination cursor that is malformed or can no longer be resumed."""
+
+
+def encode_cursor(version: str, sort_key: Tuple, position: int, record_id) -> str:
+    """Opaque, URL-safe token for "continue after the record at `position`"."""
+    payload = json.dumps(
+        [version, list(sort_key), position, record_id], separators=(",", ":")
+    )
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(token: str) -> Tuple[str, Tuple, int, object]:
+    """Inverse of `encode_cursor`; raises InvalidCursor for anything else."""
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        version, sort_key, position, record_id = json.loads(
+            base64.urlsafe_b64decode(padded)
+        )
+        if not isinstance(version, str) or not isinstance(position, int):
+            raise TypeError("unexpected cursor fields")
+        return version, tuple(sort_key), position, record_id
+    except (ValueError, TypeError) as e:
+        raise InvalidCursor(f"Invalid cursor: {e}") from e
+
+
+def _index_key(value) -> str:
+    """Case-insensitive index key; missing values index as ""."""
+    return "" if value is None else str(value).lower()
+
+
+class IndexedRecords(Sequence):
+    """
+    Records plus state, LGA, (state, LGA) and level indexes.
+
+    With a `sort_key` the records are sorted once here (stably, so ties keep
+    file order) and kept in that order. Index values are record positions,
+    so every filtered result, and every page of it, is an order-preserving
+    slice that needs no per-request sort. State and LGA lookups are
+    case-insensitive; levels match exactly.
+
+    The records are stored column-wise (`ColumnStore`); indexing and
+    iteration yield read-only `Row` mapping views.
+
+    Args:
+        records: Normalized records
+        level_field: Field holding the alert level to index (None for none)
+        source: File the records were loaded from
+        sort_key: Key the records are pre-sorted by (None keeps file order)
+        id_field: Field identifying a record across reloads (for cursors)
+    """
+
+    def __init__(
+        self,
+        records: List[Dict],
+        level_field: Optional[str] = None,
+        source: Optional[Path] = None,
+        sort_key: Optional[Callable[[Dict], Tuple]] = None,
+        id_field: str = "name",
+    ):
+        if sort_key is not None:
+            records = sorted(records, key=sort_key)
+        self.level_field = level_field
+        self.source = source
+        self.sort_key = sort_key
+        self.id_field = id_field
+        self.keys = [sort_key(r) for r in records] if sort_key is not None else None
+        self._views: Dict[str, Sequence] = {}
+        self._views_lock = threading.Lock()
+        identity = file_identity(source) if source is not None else None
+        self.version = hashlib.sha1(repr(identity).encode()).hexdigest()[:12]
+        self.by_state: Dict[str, List[int]] = {}
+        self.by_lga: Dict[str, List[int]] = {}
+        self.by_state_lga: Dict[Tuple[str, str], List[int]] = {}
+        self.by_level: Dict[str, List[int]] = {}
+
+        for position, record in enumerate(records):
+            state_key = _index_key(record.get("state"))
+            lga_key = _index_key(record.get("lga"))
+            self.by_state.setdefault(state_key, []).append(position)
+            self.by_lga.setdefault(lga_key, []).append(position)
+            self.by_state_lga.setdefault((state_key, lga_key), []).append(position)
+            if level_field is not None:
+                level = record.get(level_field)
+                self.by_level.setdefault(level, []).append(position)
+
+        self.records = ColumnStore(records)
+        self.share_view: Optional[Callable[[str, Callable], ColumnStore]] = None
+
+    @classmethod
+    def from_parts(
+        cls,
+        records: ColumnStore,
+        indexes: Dict[str, Dict],
+        keys: Optional[Sequence],
+        level_field: Optional[str],
+        source: Optional[Path],
+        id_field: str,
+        version: str,
+    ) -> "IndexedRecords":
+        """
+        IndexedRecords over records and indexes built elsewhere (e.g. mapped
+        from a shared snapshot file).
+
+        Args:
+            records: The stored records, already in their sorted order
+            indexes: "by_state", "by_lga", "by_state_lga" and "by_level"
+                index dicts (key -> ascending positions)
+            keys: Sort key of every record (None if kept in file order)
+        """
+        indexed = cls.__new__(cls)
+        indexed.records = records
+        indexed.level_field = level_field
+        indexed.source = source
+        indexed.sort_key = None
+        indexed.id_field = id_field
+        indexed.keys = keys
+        indexed.version = version
+        indexed.by_state = indexes["by_state"]
+        indexed.by_lga = indexes["by_lga"]
+        indexed.by_state_lga = indexes["by_state_lga"]
+        indexed.by_level = indexes["by_level"]
+        indexed._views = {}
+        indexed._views_lock = threading.Lock()
+        indexed.share_view = None
+        return indexed
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def __getitem__(self, position):
+        return self.records[position]
+
+    def __iter__(self):
+        return iter(self.records)
+
+    def mapped(self, name: str, func: Callable[[Mapping], Dict]) -> ColumnStore:
+        """
+        `func` applied to every record, in list order, computed once per
+        loaded dataset (e.g. records validated for serialization) and kept
+        as a `ColumnStore`.
+
+        The result is aligned with the records, so it can be passed as
+        `rows` to `filter` and `page`. `name` identifies the mapping; later
+        calls with the same name return the memoized rows regardless of
+        `func`. With `share_view` set (shared snapshots), the rows are built
+        through it, so processes sharing the records share them too.
+        Concurrent first calls build the rows once.
+        """
+        rows = self._views.get(name)
+        if rows is not None:
+            return rows
+
+        def build() -> ColumnStore:
+            return ColumnStore(func(record) for record in self.records)
+
+        with self._views_lock:
+            rows = self._views.get(name)
+            if rows is None:
+                if self.share_view is None:
+                    rows = build()
+                else:
+                    rows = self.share_view(name, build)
+                self._views[name] = rows
+        return rows
+
+    def view(self, name: str) -> Optional[ColumnStore]:
+        """The `mapped` rows called `name`, or None until they are built."""
+        return self._views.get(name)
+
+    def positions(
+        self,
+        state: Optional[str] = None,
+        lga: Optional[str] = None,
+        level: Optional[str] = None,
+    ) -> Sequence:
+        """Ascending positions of records matching every given filter."""
+        if state and lga:
+            positions = self.by_state_lga.get((state.lower(), lga.lower()), [])
+        elif state:
+            positions = self.by_state.get(state.lower(), [])
+        elif lga:
+            positions = self.by_lga.get(lga.lower(), [])
+        elif level:
+            return self.by_level.get(level, [])
+        else:
+            return range(len(self.records))
+
+        if level:
+            field = self.level_field
+            positions = [p for p in positions if self.records[p].get(field) == level]
+        return positions
+
+    def filter(
+        self,
+        state: Optional[str] = None,
+        lga: Optional[str] = None,
+        level: Optional[str] = None,
+        rows: Optional[ColumnStore] = None,
+    ) -> Sequence:
+        """
+        Return records matching state, LGA and/or level, in list order.
+
+        With `rows` (aligned with the records, see `mapped`) the matching
+        rows are returned instead, materialized as dicts.
+        """
+        if rows is not None:
+            return rows.dicts(self.positions(state, lga, level))
+        if not (state or lga or level):
+            return self.records
+        records = self.records
+        return [records[p] for p in self.positions(state, lga, level)]
+
+    def page(
+        self,
+        state: Optional[str] = None,
+        lga: Optional[str] = None,
+        level: Optional[str] = None,
+        offset: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        rows: Optional[ColumnStore] = None,
+    ) -> Tuple[int, List[Mapping], Optional[str]]:
+        """
+        Return (number of matches, one page of matches, next page cursor).
+
+        The page starts at `offset`, or right after the record a `cursor`
+        points at (found by bisecting the ascending match positions, so deep
+        pages cost the same as the first). Only that page is materialized,
+        from `rows` when given (see `filter`). The next cursor is None on
+        the last page.
+
+        Raises:
+            InvalidCursor: If `cursor` is malformed, or from an older version
+                of a dataset kept in file order (which cannot be re-seeked)
+        """
+        positions = self.positions(state, lga, level)
+        if cursor is not None:
+            offset = bisect_right(positions, self._resume_position(cursor))
+
+        records = self.records
+        page_positions = positions[offset : offset + limit]
+        if rows is None:
+            page = [records[p] for p in page_positions]
+        else:
+            page = rows.dicts(page_positions)
+
+        next_cursor = None
+        if page_positions and offset + limit < len(positions):
+            last = page_positions[-1]
+            last_key = self.keys[last] if self.keys is not None else ()
+            next_cursor = encode_cursor(
+                self.version, last_key, last, records[last].get(self.id_field)
+            )
+        return len(positions), page, next_cursor
+
+    def _resume_position(self, cursor: str) -> int:
+        """Position of the record the cursor's page ended with (or just before)."""
+        version, sort_key, position, record_id = decode_cursor(cursor)
+        if version == self.version:
+            return position
+        if self.keys is None:
+            raise InvalidCursor(
+                "Cursor is from an older version of the data; restart from the first page"
+            )
+        try:
+            first_tie = bisect_left(self.keys, sort_key)
+            end_of_ties = bisect_right(self.keys, sort_key)
+        except TypeError as e:
+            raise InvalidCursor(f"Invalid cursor: {e}") from e
+
+        for tie in range(first_tie, end_of_ties):
+            if self.records[tie].get(self.id_field) == record_id:
+                return tie
+        return first_tie - 1
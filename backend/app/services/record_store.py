@@ -0,0 +1,217 @@
+"""
+Compact column store for loaded records.
+
+A list of dicts costs a hash table per record. `ColumnStore` keeps one
+typed column per field instead:
+
+- bool, int and float fields in `array` columns (float columns holding None
+  store it as NaN)
+- low-cardinality strings (state, LGA, levels) dictionary-encoded as codes
+  into a list of distinct values
+- everything else (names, mixed values) in a plain list of references
+
+Rows are read through `Row`, a `__slots__` mapping view, and only the rows a
+response actually returns are materialized as dicts (`dicts`).
+"""
+
+import math
+from array import array
+from collections.abc import Mapping, Sequence
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Tuple
+
+# Placeholder for a field missing from some records
+_MISSING = object()
+
+
+def _is_int(value) -> bool:
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def classify_column(values: List) -> Tuple[str, Any]:
+    """
+    Pick the typed encoding for one column; return (kind, encoded values).
+
+    Shared by `ColumnStore` and the snapshot files, so both store a column
+    the same way:
+
+    - "bool": `array("B")` of flags
+    - "int": `array("q")`
+    - "float" / "nullable_float": `array("d")`, None stored as NaN (a column
+      holding both None and NaN is not typed)
+    - "dict": (distinct values, `array("I")` of codes into them), for strings
+      repeating at least twice on average
+    - "str": None; other all-string columns
+    - "values": None; anything else (empty, mixed, missing fields)
+    """
+    if not values or any(v is _MISSING for v in values):
+        return "values", None
+
+    if all(isinstance(v, bool) for v in values):
+        return "bool", array("B", values)
+
+    if all(_is_int(v) for v in values):
+        try:
+            return "int", array("q", values)
+        except OverflowError:
+            return "values", None
+
+    if all(v is None or isinstance(v, float) for v in values):
+        has_none = any(v is None for v in values)
+        has_nan = any(v is not None and math.isnan(v) for v in values)
+        if not (has_none and has_nan):
+            floats = array("d", (math.nan if v is None else v for v in values))
+            return ("nullable_float" if has_none else "float"), floats
+
+    if all(isinstance(v, str) for v in values):
+        distinct: Dict[str, int] = {}
+        codes = array("I", (distinct.setdefault(v, len(distinct)) for v in values))
+        if len(distinct) * 2 <= len(values):
+            return "dict", (list(distinct), codes)
+        return "str", None
+
+    return "values", None
+
+
+def _encode_column(values: List) -> Callable[[int], Any]:
+    """Store one column compactly; return its position -> value getter."""
+    kind, encoded = classify_column(values)
+    if kind == "bool":
+        return lambda position: bool(encoded[position])
+    if kind in ("int", "float"):
+        return encoded.__getitem__
+    if kind == "nullable_float":
+
+        def nullable_float(position: int):
+            value = encoded[position]
+            return None if value != value else value
+
+        return nullable_float
+    if kind == "dict":
+        table, codes = encoded
+        return lambda position: table[codes[position]]
+    return values.__getitem__
+
+
+class ColumnStore(Sequence):
+    """
+    Records stored column by column; indexing returns `Row` views.
+
+    Args:
+        records: Records to store (field order follows the first record)
+    """
+
+    def __init__(self, records: Iterable[Dict]):
+        records = list(records)
+        fields: Dict[str, None] = {}
+        for record in records:
+            for field in record:
+                fields.setdefault(field, None)
+
+        self.fields = list(fields)
+        self._length = len(records)
+        self._sparse = False
+        self._getters: Dict[str, Callable[[int], Any]] = {}
+        for field in self.fields:
+            values = [record.get(field, _MISSING) for record in records]
+            if any(v is _MISSING for v in values):
+                self._sparse = True
+                self._getters[field] = values.__getitem__
+            else:
+                self._getters[field] = _encode_column(values)
+
+    @classmethod
+    def from_getters(
+        cls,
+        fields: List[str],
+        length: int,
+        getters: Dict[str, Callable[[int], Any]],
+        sparse: bool = False,
+    ) -> "ColumnStore":
+        """
+        Store over already-encoded columns (e.g. mapped from a snapshot file).
+
+        Args:
+            fields: Field names, in order
+            length: Number of rows
+            getters: Field -> position -> value (`_MISSING` where absent)
+            sparse: Whether some rows lack some fields
+        """
+        store = cls.__new__(cls)
+        store.fields = list(fields)
+        store._length = length
+        store._sparse = sparse
+        store._getters = dict(getters)
+        return store
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __getitem__(self, position):
+        if isinstance(position, slice):
+            return [self[p] for p in range(*position.indices(self._length))]
+        if position < 0:
+            position += self._length
+        if not 0 <= position < self._length:
+            raise IndexError("ColumnStore index out of range")
+        return Row(self, position)
+
+    def __iter__(self) -> Iterator["Row"]:
+        for position in range(self._length):
+            yield Row(self, position)
+
+    def value(self, position: int, field: str):
+        """Value of `field` in the row at `position` (KeyError if absent)."""
+        value = self._getters[field](position)
+        if value is _MISSING:
+            raise KeyError(field)
+        return value
+
+    def column(self, field: str) -> List:
+        """Every row's value of `field` (`_MISSING` where absent)."""
+        get = self._getters[field]
+        return [get(position) for position in range(self._length)]
+
+    @property
+    def sparse(self) -> bool:
+        return self._sparse
+
+    def dicts(self, positions: Iterable[int]) -> List[Dict]:
+        """Materialize the rows at `positions` as plain dicts."""
+        getters = list(self._getters.items())
+        rows = [{field: get(p) for field, get in getters} for p in positions]
+        if self._sparse:
+            rows = [{k: v for k, v in row.items() if v is not _MISSING} for row in rows]
+        return rows
+
+
+class Row(Mapping):
+    """Read-only mapping view of one row of a `ColumnStore`."""
+
+    __slots__ = ("_store", "_position")
+
+    def __init__(self, store: ColumnStore, position: int):
+        self._store = store
+        self._position = position
+
+    def __getitem__(self, field: str):
+        return self._store.value(self._position, field)
+
+    def __iter__(self) -> Iterator[str]:
+        if not self._store._sparse:
+            return iter(self._store.fields)
+        return (field for field in self._store.fields if field in self)
+
+    def __len__(self) -> int:
+        if not self._store._sparse:
+            return len(self._store.fields)
+        return sum(1 for _ in self)
+
+    def __contains__(self, field) -> bool:
+        try:
+            self[field]
+        except KeyError:
+            return False
+        return True
+
+    def __repr__(self) -> str:
+        return f"Row({dict(self)!r})"
@@ -0,0 +1,421 @@
+"""
+Memory-mapped dataset snapshots shared by every worker on a host.
+
+Without them each uvicorn worker parses, normalizes and indexes every data
+file itself, and keeps its own copy. With `SNAPSHOT_DIR` set, the first
+worker to load a data version writes it to a binary snapshot file there. It
+holds the file under an exclusive lock, so this happens once per host. Every
+worker, including the writer, then maps the file read-only and reads the
+columns in place:
+
+- bool/int/float columns and dictionary codes are `memoryview`s of the map
+- other strings are UTF-8 in one blob plus an offsets table, decoded on access
+- anything else (mixed types, missing fields) is JSON, decoded on access
+- index entries are ranges of one shared array of uint32 positions
+
+A snapshot file is named after the dataset key, the identity of its source
+file, `SNAPSHOT_FORMAT_VERSION` and the app version. A changed file or a new
+release therefore gets a new snapshot, and older snapshots of the dataset are
+deleted once it is written. Workers still mapping an old snapshot keep it
+until they reload. Views derived from the records (`IndexedRecords.mapped`,
+e.g. validated rows) are shared the same way.
+"""
+
+import hashlib
+import json
+import logging
+import mmap
+import os
+import re
+import struct
+import threading
+from array import array
+from collections.abc import Sequence
+from contextlib import contextmanager
+from itertools import accumulate
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from app.core.config import settings
+from app.services.cache import file_identity
+from app.services.record_index import IndexedRecords
+from app.services.record_store import _MISSING, ColumnStore, classify_column
+
+logger = logging.getLogger("app")
+
+MAGIC = b"PHCSNAP1"
+HEADER = struct.Struct("<8sQ")
+
+# Version of the stored records; bump it whenever the code that builds or
+# encodes them changes (loaders, csv_reader, name_table, record_index,
+# record_store, this module), so existing snapshots are not reused
+SNAPSHOT_FORMAT_VERSION = 1
+
+# Errors that mean a snapshot can't be written (the data is kept in-process)
+_WRITE_ERRORS = (OSError, TypeError, ValueError, OverflowError)
+
+
+def snapshot_name(key: str, source: Optional[Path]) -> str:
+    """File name of the snapshot of dataset `key` for the current `source`."""
+    slug = re.sub(r"[^A-Za-z0-9_]+", "_", key).strip("_")[:64]
+    key_hash = hashlib.sha1(key.encode()).hexdigest()[:8]
+    identity = file_identity(source) if source is not None else None
+    version = hashlib.sha1(
+        repr(
+            (str(source), identity, SNAPSHOT_FORMAT_VERSION, settings.VERSION)
+        ).encode()
+    ).hexdigest()[:16]
+    return f"{slug}-{key_hash}-{version}.snap"
+
+
+class _Writer:
+    """Sections of a snapshot file, each 8-byte aligned."""
+
+    def __init__(self):
+        self.chunks: List[bytes] = []
+        self.size = 0
+
+    def add(self, data) -> List[int]:
+        data = bytes(data)
+        padding = -self.size % 8
+        if padding:
+            self.chunks.append(b"\0" * padding)
+            self.size += padding
+        section = [self.size, len(data)]
+        self.chunks.append(data)
+        self.size += len(data)
+        return section
+
+    def add_blob(self, values: List[bytes]) -> Dict:
+        offsets = array("Q", [0, *accumulate(len(value) for value in values)])
+        return {"offsets": self.add(offsets), "data": self.add(b"".join(values))}
+
+    def to_bytes(self, header: Dict) -> bytes:
+        header_bytes = json.dumps(header, separators=(",", ":")).encode()
+        prefix = HEADER.pack(MAGIC, len(header_bytes)) + header_bytes
+        prefix += b"\0" * (-len(prefix) % 8)
+        return prefix + b"".join(self.chunks)
+
+
+def _encode_column(values: List, writer: _Writer) -> Dict:
+    """Write one column, typed as in `ColumnStore`; return its header entry."""
+    kind, encoded = classify_column(values)
+    if kind in ("bool", "int"):
+        return {"kind": kind, "data": writer.add(encoded)}
+    if kind in ("float", "nullable_float"):
+        return {
+            "kind": "float",
+            "nullable": kind == "nullable_float",
+            "data": writer.add(encoded),
+        }
+    if kind == "dict":
+        table, codes = encoded
+        return {"kind": "dict", "table": table, "data": writer.add(codes)}
+    if kind == "str":
+        return {"kind": "str", **writer.add_blob([v.encode() for v in values])}
+
+    # A missing field is an empty value; JSON values are never empty
+    encoded = [b"" if v is _MISSING else json.dumps(v).encode() for v in values]
+    return {"kind": "json", **writer.add_blob(encoded)}
+
+
+def _section(buffer: memoryview, section: List[int]) -> memoryview:
+    offset, size = section
+    return buffer[offset : offset + size]
+
+
+def _column_getter(column: Dict, buffer: memoryview) -> Callable[[int], Any]:
+    """Position -> value getter reading one column from the mapped file."""
+    kind = column["kind"]
+    if kind in ("bool", "int", "float", "dict"):
+        typecode = {"bool": "B", "int": "q", "float": "d", "dict": "I"}[kind]
+        items = _section(buffer, column["data"]).cast(typecode)
+        if kind == "bool":
+            return lambda position: bool(items[position])
+        if kind == "dict":
+            table = column["table"]
+            return lambda position: table[items[position]]
+        if kind == "float" and column["nullable"]:
+
+            def nullable_float(position: int):
+                value = items[position]
+                return None if value != value else value
+
+            return nullable_float
+        return items.__getitem__
+
+    offsets = _section(buffer, column["offsets"]).cast("Q")
+    blob = _section(buffer, column["data"])
+    if kind == "str":
+        return lambda position: str(
+            blob[offsets[position] : offsets[position + 1]], "utf-8"
+        )
+
+    def json_value(position: int):
+        value = blob[offsets[position] : offsets[position + 1]]
+        return json.loads(bytes(value)) if len(value) else _MISSING
+
+    return json_value
+
+
+def _encode_store(store: ColumnStore, writer: _Writer) -> Dict:
+    return {
+        "length": len(store),
+        "fields": store.fields,
+        "sparse": store.sparse,
+        "columns": {
+            field: _encode_column(store.column(field), writer) for field in store.fields
+        },
+    }
+
+
+def _decode_store(header: Dict, buffer: memoryview) -> ColumnStore:
+    getters = {
+        field: _column_getter(header["columns"][field], buffer)
+        for field in header["fields"]
+    }
+    return ColumnStore.from_getters(
+        header["fields"], header["length"], getters, header["sparse"]
+    )
+
+
+def encode_columns(store: ColumnStore) -> bytes:
+    """Snapshot file contents for a `ColumnStore`."""
+    writer = _Writer()
+    return writer.to_bytes({"store": _encode_store(store, writer)})
+
+
+def encode_dataset(records: IndexedRecords) -> bytes:
+    """Snapshot file contents for `IndexedRecords` (records, indexes, keys)."""
+    writer = _Writer()
+    positions = array("I")
+    indexes = {}
+    for name in ("by_state", "by_lga", "by_state_lga", "by_level"):
+        entries = []
+        for key, matches in getattr(records, name).items():
+            entries.append([key, len(positions), len(matches)])
+            positions.extend(matches)
+        indexes[name] = entries
+
+    keys = None
+    if records.keys is not None:
+        keys = _encode_column([list(key) for key in records.keys], writer)
+
+    header = {
+        "store": _encode_store(records.records, writer),
+        "positions": writer.add(positions),
+        "indexes": indexes,
+        "keys": keys,
+        "level_field": records.level_field,
+        "source": str(records.source) if records.source is not None else None,
+        "id_field": records.id_field,
+        "version": records.version,
+    }
+    return writer.to_bytes(header)
+
+
+def _map(path: Path) -> Tuple[Dict, memoryview]:
+    """(header, buffer of the data sections) of a snapshot file, mapped read-only."""
+    with open(path, "rb") as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    magic, header_size = HEADER.unpack_from(mapped)
+    if magic != MAGIC:
+        raise ValueError(f"{path} is not a snapshot file")
+    data_start = HEADER.size + header_size
+    header = json.loads(mapped[HEADER.size : data_start])
+    return header, memoryview(mapped)[data_start + -data_start % 8 :]
+
+
+def map_columns(path: Path) -> ColumnStore:
+    """The `ColumnStore` in a snapshot file, read in place."""
+    header, buffer = _map(path)
+    return _decode_store(header["store"], buffer)
+
+
+class _SortKeys(Sequence):
+    """Sort keys decoded (as tuples) on access, for bisecting."""
+
+    def __init__(self, get: Callable[[int], List], length: int):
+        self._get = get
+        self._length = length
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __getitem__(self, position: int) -> Tuple:
+        return tuple(self._get(position))
+
+
+def map_dataset(path: Path) -> IndexedRecords:
+    """The `IndexedRecords` in a snapshot file, read in place."""
+    header, buffer = _map(path)
+    store = _decode_store(header["store"], buffer)
+    positions = _section(buffer, header["positions"]).cast("I")
+    indexes = {}
+    for name, entries in header["indexes"].items():
+        indexes[name] = {
+            (tuple(key) if isinstance(key, list) else key): positions[
+                start : start + count
+            ]
+            for key, start, count in entries
+        }
+
+    keys = None
+    if header["keys"] is not None:
+        keys = _SortKeys(_column_getter(header["keys"], buffer), len(store))
+
+    source = header["source"]
+    return IndexedRecords.from_parts(
+        store,
+        indexes,
+        keys,
+        level_field=header["level_field"],
+        source=Path(source) if source is not None else None,
+        id_field=header["id_field"],
+        version=header["version"],
+    )
+
+
+@contextmanager
+def _exclusive_lock(lock_path: Path) -> Iterator[None]:
+    """
+    Hold an exclusive lock on `lock_path` across processes (flock). Without
+    fcntl, or if the lock file can't be opened, no lock is taken; the
+    atomic rename still keeps readers safe, but the work may be duplicated.
+    """
+    try:
+        import fcntl
+    except ImportError:
+        yield
+        return
+    try:
+        lock_file = open(lock_path, "a")
+    except OSError:
+        yield
+        return
+    with lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def _unlink(path: Path) -> None:
+    try:
+        path.unlink()
+    except OSError:
+        pass
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    temp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        with open(temp_path, "wb") as f:
+            f.write(data)
+        os.replace(temp_path, path)
+    finally:
+        if temp_path.exists():
+            temp_path.unlink()
+
+
+class SnapshotStore:
+    """
+    Shared snapshots of loaded datasets in one directory.
+
+    `load` returns a dataset mapped from its snapshot file and remembers it,
+    so a cache reload of unchanged data (e.g. on TTL expiry) is just a stat.
+    If a snapshot can't be written, the freshly loaded records are returned
+    unshared and a warning is logged.
+    """
+
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+        self._mapped: Dict[str, Tuple[Path, IndexedRecords]] = {}
+        self._lock = threading.Lock()
+
+    def load(
+        self,
+        key: str,
+        source: Optional[Path],
+        build: Callable[[], IndexedRecords],
+    ) -> IndexedRecords:
+        """
+        Dataset `key` for the current version of `source`.
+
+        Args:
+            key: Dataset name (the loader cache key)
+            source: File the dataset is built from
+            build: Reads and builds the dataset; only called by the first
+                process to need this version
+
+        Raises:
+            Whatever `build` raises (e.g. FileNotFoundError)
+        """
+        path = self.directory / snapshot_name(key, source)
+        mapped = self._mapped.get(key)
+        if mapped is not None and mapped[0] == path:
+            return mapped[1]
+
+        records = self._share(path, build, encode_dataset, map_dataset)
+        if path.exists():
+            records.share_view = lambda name, build_view: self._share(
+                path.with_suffix(f".{_view_slug(name)}.snap"),
+                build_view,
+                encode_columns,
+                map_columns,
+            )
+            with self._lock:
+                self._mapped[key] = (path, records)
+        return records
+
+    def _share(
+        self,
+        path: Path,
+        build: Callable[[], Any],
+        encode: Callable[[Any], bytes],
+        decode: Callable[[Path], Any],
+    ) -> Any:
+        """Map the snapshot at `path`, first writing it from `build()` if needed."""
+        if not path.exists():
+            try:
+                self.directory.mkdir(parents=True, exist_ok=True)
+            except OSError:
+                pass
+            lock_path = path.with_suffix(".lock")
+            with _exclusive_lock(lock_path):
+                if not path.exists():
+                    value = build()
+                    try:
+                        _write_atomic(path, encode(value))
+                    except _WRITE_ERRORS as e:
+                        logger.warning(
+                            f"Could not write snapshot {path.name}, "
+                            f"keeping it in this process only: {e}"
+                        )
+                        return value
+                    logger.info(f"Wrote shared snapshot {path.name}")
+                    self._remove_older(path)
+                # Once the snapshot exists nobody takes its lock again
+                _unlink(lock_path)
+        return decode(path)
+
+    def _remove_older(self, path: Path) -> None:
+        """
+        Delete this dataset's snapshots, views and lock files for older
+        versions.
+        """
+        key_prefix = path.name.rsplit("-", 1)[0] + "-"
+        version_prefix = path.name.split(".", 1)[0] + "."
+        for other in self.directory.glob(f"{key_prefix}*"):
+            if not other.name.startswith(version_prefix):
+                _unlink(other)
+
+    def clear(self) -> None:
+        """Forget the mapped datasets (the files are kept)."""
+        with self._lock:
+            self._mapped.clear()
+
+
+def _view_slug(name: str) -> str:
+    return re.sub(r"[^A-Za-z0-9_]+", "_", name)[:64]
@@ -35,12 +35,15 @@ def configure_test_settings(test_fixtures_dir, monkeypatch):
     monkeypatch.setattr(settings, "OUTPUT_DIR", str(test_fixtures_dir))
     monkeypatch.setattr(settings, "DATA_DIR", str(test_fixtures_dir))
 
-    # Clear cache before each test
+    # Clear caches before each test
+    from app.api.v1.conditional import response_cache
     from app.services.insight_loader import clear_cache
 
     clear_cache()
+    response_cache.clear()
 
     yield
 
-    # Clear cache after each test
+    # Clear caches after each test
     clear_cache()
+    response_cache.clear()
@@ -0,0 +1,16 @@
+"""
+Smoke tests for the benchmark scripts, so they keep running as the app changes.
+"""
+
+from benchmarks import json_encoding
+
+
+class TestJsonEncodingBenchmark:
+    def test_runs_on_the_fixtures(self, test_fixtures_dir, capsys):
+        json_encoding.main(
+            ["--output-dir", str(test_fixtures_dir), "--items", "5", "--repeat", "1"]
+        )
+
+        output = capsys.readouterr().out
+        for endpoint in ["/outbreak-alerts", "/metrics-summary", "/alerts-feed"]:
+            assert endpoint in output
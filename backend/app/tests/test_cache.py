@@ -0,0 +1,358 @@
+"""
+Tests for the data load cache and its background watcher.
+"""
+
+import asyncio
+import json
+import os
+import threading
+import time
+
+import pytest
+
+from app.services import alerts_feed, insight_loader
+from app.services.cache import CacheWatcher, DataLoadCache
+
+
+def write_alerts(path, shortage_scores):
+    records = [
+        {
+            "Name of Primary Health Center": f"PHC {i}",
+            "PHC LGA": "Jalingo",
+            "State of PHC": "Taraba",
+            "shortage_score": score,
+        }
+        for i, score in enumerate(shortage_scores)
+    ]
+    path.write_text(json.dumps(records))
+
+
+def bump_mtime(path):
+    """Move the mtime forward so rewrites within one clock tick are detected."""
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+class TestDataLoadCache:
+    def test_rejects_unknown_mode(self):
+        with pytest.raises(ValueError):
+            DataLoadCache(mode="forever")
+
+    def test_ttl_mode_expires_entries(self):
+        cache = DataLoadCache(ttl_seconds=0, mode="ttl")
+        cache.set("key", [1])
+        assert cache.get("key") is None
+
+    def test_file_mode_keeps_entries_until_source_changes(self, tmp_path):
+        source = tmp_path / "data.json"
+        source.write_text("[1]")
+        cache = DataLoadCache(ttl_seconds=0, mode="file")
+
+        cache.set("key", [1], source=source)
+        assert cache.get("key") == [1]
+
+        source.write_text("[1, 2]")
+        assert cache.get("key") is None
+
+    def test_file_mode_detects_replaced_file(self, tmp_path):
+        source = tmp_path / "data.json"
+        source.write_text("[1]")
+        cache = DataLoadCache(mode="file")
+        cache.set("key", [1], source=source)
+
+        # Same size, atomically swapped in with the original mtime
+        replacement = tmp_path / "data.json.tmp"
+        replacement.write_text("[2]")
+        stat = source.stat()
+        os.utime(replacement, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        os.replace(replacement, source)
+
+        assert cache.get("key") is None
+
+    def test_ttl_mode_also_invalidates_on_change(self, tmp_path):
+        source = tmp_path / "data.json"
+        source.write_text("[1]")
+        cache = DataLoadCache(ttl_seconds=3600, mode="ttl")
+        cache.set("key", [1], source=source)
+
+        source.unlink()
+        assert cache.get("key") is None
+
+    def test_reload_changed_runs_loader(self, tmp_path):
+        source = tmp_path / "data.json"
+        source.write_text("[1]")
+        cache = DataLoadCache(mode="file")
+
+        def load():
+            return json.loads(source.read_text())
+
+        cache.get_or_load("key", load, source=source)
+        assert cache.reload_changed() == []
+
+        source.write_text("[1, 2]")
+        bump_mtime(source)
+        assert cache.reload_changed() == ["key"]
+        assert cache.get("key") == [1, 2]
+
+    def test_entry_from_other_source_is_a_miss(self, tmp_path):
+        first, second = tmp_path / "a.csv", tmp_path / "b.arrow"
+        first.write_text("a")
+        second.write_text("b")
+        cache = DataLoadCache(mode="file")
+
+        cache.get_or_load("key", lambda: "a", source=first)
+        assert cache.get_or_load("key", lambda: "b", source=second) == "b"
+
+
+class TestSingleFlight:
+    def test_concurrent_misses_share_one_load(self):
+        cache = DataLoadCache()
+        calls = []
+        release = threading.Event()
+
+        def load():
+            calls.append(1)
+            release.wait(5)
+            return "value"
+
+        results = []
+        threads = [
+            threading.Thread(
+                target=lambda: results.append(cache.get_or_load("key", load))
+            )
+            for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        # Let every thread reach the cache before the load finishes
+        time.sleep(0.1)
+        release.set()
+        for thread in threads:
+            thread.join(5)
+
+        assert len(calls) == 1
+        assert results == ["value"] * 8
+
+    def test_load_error_reaches_waiters_and_is_not_cached(self):
+        cache = DataLoadCache()
+        release = threading.Event()
+        errors = []
+
+        def failing_load():
+            release.wait(5)
+            raise FileNotFoundError("gone")
+
+        def call():
+            try:
+                cache.get_or_load("key", failing_load)
+            except FileNotFoundError as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=call) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        time.sleep(0.1)
+        release.set()
+        for thread in threads:
+            thread.join(5)
+
+        assert len(errors) == 3
+        assert cache.get_or_load("key", lambda: "recovered") == "recovered"
+
+    def test_stale_value_served_while_revalidating(self, tmp_path):
+        source = tmp_path / "data.json"
+        source.write_text("[1]")
+        cache = DataLoadCache(ttl_seconds=0, stale_while_revalidate=True)
+        cache.get_or_load("key", lambda: "old", source=source)
+
+        refreshed = threading.Event()
+
+        def reload():
+            refreshed.set()
+            return "new"
+
+        # Expired but unchanged: the stale value comes back immediately
+        assert cache.get_or_load("key", reload, source=source) == "old"
+        assert refreshed.wait(5)
+
+        deadline = time.monotonic() + 5
+        while cache.cache["key"].value != "new" and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert cache.cache["key"].value == "new"
+
+    def test_changed_source_is_never_served_stale(self, tmp_path):
+        source = tmp_path / "data.json"
+        source.write_text("[1]")
+        cache = DataLoadCache(ttl_seconds=0, stale_while_revalidate=True)
+        cache.get_or_load("key", lambda: "old", source=source)
+
+        source.write_text("[1, 2]")
+        bump_mtime(source)
+        assert cache.get_or_load("key", lambda: "new", source=source) == "new"
+
+
+class TestAsyncLoading:
+    def test_misses_load_off_the_event_loop_once(self):
+        cache = DataLoadCache(max_workers=2)
+        loader_threads = []
+
+        def slow_load():
+            loader_threads.append(threading.get_ident())
+            time.sleep(0.2)
+            return "value"
+
+        async def main():
+            ticks = 0
+
+            async def ticker():
+                nonlocal ticks
+                while True:
+                    ticks += 1
+                    await asyncio.sleep(0.01)
+
+            ticking = asyncio.create_task(ticker())
+            results = await asyncio.gather(
+                *(cache.aget_or_load("key", slow_load) for _ in range(5))
+            )
+            ticking.cancel()
+            return results, ticks
+
+        try:
+            results, ticks = asyncio.run(main())
+        finally:
+            cache.shutdown()
+
+        assert results == ["value"] * 5
+        assert loader_threads != [threading.get_ident()]
+        assert len(loader_threads) == 1
+        # The loop kept running other tasks while the file was "read"
+        assert ticks >= 5
+
+    def test_async_loader_returns_cached_records(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(insight_loader, "_cache", DataLoadCache())
+        write_alerts(tmp_path / "outbreak_alerts.json", [3, 1])
+
+        async def load_twice():
+            first = await insight_loader.load_outbreak_alerts_async(str(tmp_path))
+            second = await insight_loader.load_outbreak_alerts_async(str(tmp_path))
+            return first, second
+
+        first, second = asyncio.run(load_twice())
+        assert len(first) == 2
+        assert second is first
+        assert insight_loader.load_outbreak_alerts(str(tmp_path)) is first
+
+
+class TestFileInvalidatedLoaders:
+    def test_loader_picks_up_rewritten_output(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(
+            insight_loader, "_cache", DataLoadCache(ttl_seconds=3600, mode="file")
+        )
+        alerts_path = tmp_path / "outbreak_alerts.json"
+        write_alerts(alerts_path, [3])
+
+        first = insight_loader.load_outbreak_alerts(str(tmp_path))
+        assert insight_loader.load_outbreak_alerts(str(tmp_path)) is first
+
+        write_alerts(alerts_path, [3, 1])
+        bump_mtime(alerts_path)
+        assert len(insight_loader.load_outbreak_alerts(str(tmp_path))) == 2
+
+    def test_telecom_advice_cached_until_file_changes(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(
+            insight_loader, "_cache", DataLoadCache(ttl_seconds=3600, mode="file")
+        )
+        csv_path = tmp_path / "telecommunication.csv"
+        csv_path.write_text("PHC Name,LGA,State,Network\nA PHC,Ikeja,Lagos,4G good\n")
+
+        first = insight_loader.get_telecom_advice(str(tmp_path))
+        assert insight_loader.get_telecom_advice(str(tmp_path)) is first
+        assert first[0]["preferred_channel"] == "WhatsApp"
+
+        with open(csv_path, "a") as f:
+            f.write("B PHC,Jalingo,Taraba,Poor 4G\n")
+        bump_mtime(csv_path)
+        advice = insight_loader.get_telecom_advice(str(tmp_path))
+        assert [r["preferred_channel"] for r in advice] == ["WhatsApp", "SMS"]
+
+    def test_alerts_feed_rebuilt_only_when_data_changes(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(
+            insight_loader, "_cache", DataLoadCache(ttl_seconds=3600, mode="file")
+        )
+        alerts_path = tmp_path / "outbreak_alerts.json"
+        write_alerts(alerts_path, [3])
+
+        first = asyncio.run(alerts_feed.load_alerts_feed_async(str(tmp_path)))
+        again = asyncio.run(alerts_feed.load_alerts_feed_async(str(tmp_path)))
+        assert again is first
+        assert len(first.select()) == 1
+
+        write_alerts(alerts_path, [3, 1])
+        bump_mtime(alerts_path)
+        rebuilt = asyncio.run(alerts_feed.load_alerts_feed_async(str(tmp_path)))
+        assert rebuilt is not first
+        items = rebuilt.select()
+        assert [i["phc_name"] for i in items] == ["phc 0", "phc 1"]
+        # The unchanged alert keeps its ID
+        assert items[0]["id"] == first.select()[0]["id"]
+
+    def test_alerts_feed_rebuilt_once_for_concurrent_requests(
+        self, tmp_path, monkeypatch
+    ):
+        monkeypatch.setattr(
+            insight_loader, "_cache", DataLoadCache(ttl_seconds=3600, mode="file")
+        )
+        write_alerts(tmp_path / "outbreak_alerts.json", [3, 1])
+        builds = []
+        build_feed = alerts_feed.AlertsFeed
+
+        def counting_feed(sources, validate_item):
+            builds.append(sources)
+            time.sleep(0.05)
+            return build_feed(sources, validate_item)
+
+        monkeypatch.setattr(alerts_feed, "AlertsFeed", counting_feed)
+        monkeypatch.setattr(alerts_feed, "_feeds", {})
+
+        async def concurrent_requests():
+            return await asyncio.gather(
+                *(alerts_feed.load_alerts_feed_async(str(tmp_path)) for _ in range(5))
+            )
+
+        feeds = asyncio.run(concurrent_requests())
+        assert len(builds) == 1
+        assert all(feed is feeds[0] for feed in feeds)
+
+
+class TestCacheWatcher:
+    @pytest.mark.parametrize("use_notifications", [False, True])
+    def test_watcher_reloads_in_background(
+        self, tmp_path, monkeypatch, use_notifications
+    ):
+        cache = DataLoadCache(ttl_seconds=3600, mode="file")
+        monkeypatch.setattr(insight_loader, "_cache", cache)
+        alerts_path = tmp_path / "outbreak_alerts.json"
+        write_alerts(alerts_path, [3])
+        insight_loader.load_outbreak_alerts(str(tmp_path))
+
+        watcher = CacheWatcher(
+            cache, [tmp_path], interval=0.05, use_notifications=use_notifications
+        )
+        watcher.start()
+        try:
+            write_alerts(alerts_path, [3, 1, 2])
+            bump_mtime(alerts_path)
+
+            deadline = time.monotonic() + 5
+            key = f"outbreak_alerts_{tmp_path}"
+            while time.monotonic() < deadline:
+                cached = cache.get(key)
+                if cached is not None and len(cached) == 3:
+                    break
+                time.sleep(0.02)
+        finally:
+            watcher.stop()
+
+        # Reloaded by the watcher, without a request calling the loader
+        assert len(cache.get(key)) == 3
+        assert not watcher.running
@@ -0,0 +1,79 @@
+"""
+Tests for response compression.
+"""
+
+import gzip
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api.v1.conditional import response_cache
+from app.core import compression
+from app.core.compression import compress, negotiate
+
+GZIP = {"Accept-Encoding": "gzip"}
+IDENTITY = {"Accept-Encoding": "identity"}
+
+
+class TestNegotiate:
+    @pytest.mark.parametrize(
+        "header, expected",
+        [
+            (None, None),
+            ("", None),
+            ("identity", None),
+            ("gzip", "gzip"),
+            ("deflate, GZIP;q=0.5", "gzip"),
+            ("gzip;q=0", None),
+            ("*", "gzip"),
+            ("*, gzip;q=0", None),
+        ],
+    )
+    def test_gzip_only(self, header, expected, monkeypatch):
+        monkeypatch.setattr(compression, "supported_encodings", lambda: ["gzip"])
+        assert negotiate(header) == expected
+
+    def test_prefers_brotli_when_available(self, monkeypatch):
+        monkeypatch.setattr(compression, "supported_encodings", lambda: ["br", "gzip"])
+        assert negotiate("gzip, br") == "br"
+        assert negotiate("gzip, br;q=0") == "gzip"
+
+    def test_gzip_output_is_deterministic(self):
+        body = b'{"data": []}' * 100
+        assert compress(body, "gzip", 6) == compress(body, "gzip", 6)
+        assert gzip.decompress(compress(body, "gzip", 6)) == body
+
+
+class TestCompressedResponses:
+    def test_api_body_is_compressed_and_cached_once(self, client: TestClient):
+        path = "/api/v1/alerts-feed"
+        plain = client.get(path, headers=IDENTITY)
+        assert "content-encoding" not in plain.headers
+
+        response = client.get(path, headers=GZIP)
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.headers["vary"] == "Accept-Encoding"
+        assert response.content == plain.content
+        assert response.headers["etag"] == plain.headers["etag"][:-1] + '-gzip"'
+
+        (entry,) = response_cache._entries.values()
+        compressed = entry.variants["gzip"]
+        client.get(path, headers=GZIP)
+        assert entry.variants["gzip"] is compressed
+
+    def test_compressed_etag_revalidates(self, client: TestClient):
+        path = "/api/v1/alerts-feed"
+        etag = client.get(path, headers=GZIP).headers["etag"]
+        response = client.get(path, headers={**GZIP, "If-None-Match": etag})
+        assert response.status_code == 304
+        assert response.headers["etag"] == etag
+
+    def test_small_bodies_are_not_compressed(self, client: TestClient):
+        response = client.get("/api/v1/alerts-feed?limit=1", headers=GZIP)
+        assert response.status_code == 200
+        assert "content-encoding" not in response.headers
+
+    def test_middleware_compresses_other_responses(self, client: TestClient):
+        response = client.get("/openapi.json", headers=GZIP)
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.json()["openapi"]
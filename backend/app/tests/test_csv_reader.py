@@ -0,0 +1,75 @@
+"""
+Tests for the pandas-free CSV reader.
+"""
+
+import subprocess
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from app.services.csv_reader import read_csv, to_records
+
+BACKEND_DIR = Path(__file__).parent.parent.parent
+
+
+def _write(tmp_path, text: str) -> Path:
+    path = tmp_path / "table.csv"
+    path.write_text(text)
+    return path
+
+
+class TestReadCsv:
+    @pytest.mark.parametrize(
+        "file_name", ["metrics_summary.csv", "telecommunication.csv"]
+    )
+    def test_matches_pandas_on_fixtures(self, test_fixtures_dir, file_name):
+        path = test_fixtures_dir / file_name
+        expected = pd.read_csv(path, float_precision="round_trip")
+        expected = expected.astype(object).where(expected.notna(), None)
+
+        records = to_records(read_csv(path))
+        assert records == expected.to_dict("records")
+        assert [type(v) for v in records[0].values()] == [
+            type(v) for v in expected.to_dict("records")[0].values()
+        ]
+
+    def test_infers_column_types(self, tmp_path):
+        columns = read_csv(
+            _write(
+                tmp_path,
+                "count,partial,score,flag,label,mixed\n"
+                "1,2,0.5,True,a,1\n"
+                "3,,NA,false,,x\n",
+            )
+        )
+        assert columns == {
+            "count": [1, 3],
+            "partial": [2.0, None],
+            "score": [0.5, None],
+            "flag": [True, False],
+            "label": ["a", None],
+            "mixed": ["1", "x"],
+        }
+        assert type(columns["partial"][0]) is float
+
+    def test_header_quirks(self, tmp_path):
+        columns = read_csv(_write(tmp_path, "\ufeffa,a,b\n1,2\n\n3,4,5,6\n"))
+        assert columns == {"a": [1, 3], "a.1": [2, 4], "b": [None, 5]}
+
+    def test_missing_file(self, tmp_path):
+        with pytest.raises(FileNotFoundError):
+            read_csv(tmp_path / "missing.csv")
+
+
+def test_api_does_not_import_pandas():
+    code = "import sys, app.main; print('pandas' in sys.modules)"
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert result.stdout.strip().splitlines()[-1] == "False"
@@ -395,6 +395,27 @@ class TestAlertsFeedEndpoint:
 
                 assert current_priority >= next_priority
 
+    def test_alerts_feed_limit_is_prefix_of_full_feed(self, client: TestClient):
+        """Test the merged top-k matches truncating the fully sorted feed."""
+        for query in ["", "&state=Taraba", "&types=underserved,resource"]:
+            full = client.get(f"/api/v1/alerts-feed?limit=1000{query}").json()["feed"]
+            top = client.get(f"/api/v1/alerts-feed?limit=4{query}").json()["feed"]
+            assert [i["phc_name"] for i in top] == [i["phc_name"] for i in full[:4]]
+            assert [i["type"] for i in top] == [i["type"] for i in full[:4]]
+
+    def test_alerts_feed_ids_are_stable_across_polls(self, client: TestClient):
+        """Test that IDs derive from content, not from the request time."""
+        first = client.get("/api/v1/alerts-feed").json()["feed"]
+        second = client.get("/api/v1/alerts-feed?refresh=true").json()["feed"]
+        assert [i["id"] for i in first] == [i["id"] for i in second]
+        assert [i["timestamp"] for i in first] == [i["timestamp"] for i in second]
+
+        # Filtering selects from the same items, IDs included
+        by_id = {i["id"]: i for i in first}
+        filtered = client.get("/api/v1/alerts-feed?types=resource&state=Taraba")
+        for item in filtered.json()["feed"]:
+            assert by_id[item["id"]] == item
+
 
 class TestTelecomAdviceEndpoint:
     """Test /api/v1/telecom-advice endpoint."""
@@ -471,6 +492,17 @@ class TestTelecomAdviceEndpoint:
         for record in data["data"]:
             assert record["state"] == "Taraba"
 
+    def test_column_classifier_matches_per_row_rules(self):
+        """Test the column classifier agrees with determine_preferred_channel."""
+        from app.services.insight_loader import (
+            classify_preferred_channels,
+            determine_preferred_channel,
+        )
+
+        notes = ["4G good", "Poor 4G", "", "STABLE", "no network", "4G good", None]
+        expected = [determine_preferred_channel(n) for n in notes]
+        assert list(classify_preferred_channels(notes)) == expected
+
 
 class TestDataNormalization:
     """Test PHC name normalization and consistency."""
@@ -515,3 +547,305 @@ class TestErrorHandling:
 
         # Results should be the same
         assert response1.json() == response2.json()
+
+    def test_invalid_record_is_a_server_error(
+        self, client: TestClient, test_fixtures_dir, tmp_path, monkeypatch
+    ):
+        """Test records failing the response schema still return 500."""
+        records = json.loads((test_fixtures_dir / "resource_warnings.json").read_text())
+        records[0]["resource_risk_score"] = -1
+        (tmp_path / "resource_warnings.json").write_text(json.dumps(records))
+        monkeypatch.setattr(settings, "OUTPUT_DIR", str(tmp_path))
+
+        response = client.get("/api/v1/resource-warnings")
+        assert response.status_code == 500
+        assert "Invalid data structure" in response.json()["detail"]
+
+
+class TestMetricsSummaryEndpoint:
+    """Test /api/v1/metrics-summary endpoint."""
+
+    def test_get_metrics_summary(self, client: TestClient):
+        """Test metrics are read from the CSV summary."""
+        response = client.get("/api/v1/metrics-summary")
+        assert response.status_code == 200
+        data = response.json()
+
+        assert data["count"] == 5
+        record = data["data"][0]
+        assert record["name"] == "ikeja central phc"
+        assert record["lga"] == "Ikeja"
+        assert record["resource_alert"] == "High"
+
+    def test_metrics_summary_filter_by_state(self, client: TestClient):
+        """Test filtering metrics by state."""
+        response = client.get("/api/v1/metrics-summary?state=taraba")
+        assert response.status_code == 200
+        data = response.json()
+
+        assert data["count"] == 3
+        for record in data["data"]:
+            assert record["state"] == "Taraba"
+
+    def test_metrics_summary_missing_file(
+        self, client: TestClient, tmp_path, monkeypatch
+    ):
+        """Test a missing metrics file returns 404."""
+        monkeypatch.setattr(settings, "OUTPUT_DIR", str(tmp_path))
+        response = client.get("/api/v1/metrics-summary")
+        assert response.status_code == 404
+
+    def test_metrics_summary_reads_columnar_file(
+        self, client: TestClient, test_fixtures_dir, tmp_path, monkeypatch
+    ):
+        """Test metrics.arrow is preferred and matches the CSV response."""
+        pytest.importorskip("pyarrow")
+        import pandas as pd
+
+        from insight_engine.columnar import COLUMNAR_FILE, to_arrow_ipc
+
+        expected = client.get("/api/v1/metrics-summary").json()
+
+        merged = pd.read_csv(test_fixtures_dir / "metrics_summary.csv")
+        (tmp_path / COLUMNAR_FILE).write_bytes(to_arrow_ipc(merged))
+        monkeypatch.setattr(settings, "OUTPUT_DIR", str(tmp_path))
+
+        response = client.get("/api/v1/metrics-summary")
+        assert response.status_code == 200
+        assert response.json() == expected
+
+    def test_metrics_summary_cache_invalidated_on_file_change(
+        self, client: TestClient, test_fixtures_dir, tmp_path, monkeypatch
+    ):
+        """Test the cached summary is reused until the file changes."""
+        from app.services import insight_loader
+
+        csv_path = tmp_path / "metrics_summary.csv"
+        csv_path.write_text((test_fixtures_dir / "metrics_summary.csv").read_text())
+        monkeypatch.setattr(settings, "OUTPUT_DIR", str(tmp_path))
+
+        first = insight_loader.load_metrics_summary(str(tmp_path))
+        assert insight_loader.load_metrics_summary(str(tmp_path)) is first
+
+        with open(csv_path, "a") as f:
+            f.write("new phc,1.0,3.0,0.5,Gassol,Taraba,0.5,0,0.4,Medium\n")
+
+        response = client.get("/api/v1/metrics-summary?state=Taraba&lga=gassol")
+        assert response.status_code == 200
+        data = response.json()
+        assert data["count"] == 1
+        assert data["data"][0]["name"] == "new phc"
+
+
+class TestCursorPagination:
+    """Test keyset pagination with next_cursor tokens."""
+
+    def page_through(self, client: TestClient, path: str, limit: int):
+        records, cursor, pages = [], None, 0
+        while True:
+            url = f"{path}?limit={limit}" + (f"&cursor={cursor}" if cursor else "")
+            response = client.get(url)
+            assert response.status_code == 200
+            data = response.json()
+            records.extend(data["data"])
+            pages += 1
+            cursor = data["next_cursor"]
+            if cursor is None:
+                return records, pages
+
+    @pytest.mark.parametrize(
+        "path", ["/api/v1/outbreak-alerts", "/api/v1/resource-warnings"]
+    )
+    def test_cursor_pages_cover_sorted_list(self, client: TestClient, path):
+        """Test paging by cursor returns the full list in order, once."""
+        everything = client.get(path).json()["data"]
+        records, pages = self.page_through(client, path, limit=2)
+
+        assert records == everything
+        assert pages == (len(everything) + 1) // 2
+
+    def test_cursor_pages_metrics_summary(self, client: TestClient):
+        """Test cursor paging over the file-ordered metrics summary."""
+        everything = client.get("/api/v1/metrics-summary").json()["data"]
+        records, _ = self.page_through(client, "/api/v1/metrics-summary", limit=3)
+        assert records == everything
+
+    def test_cursor_respects_filters(self, client: TestClient):
+        """Test a cursor continues within the filtered matches."""
+        first = client.get("/api/v1/metrics-summary?state=Taraba&limit=2").json()
+        assert first["next_cursor"] is not None
+
+        second = client.get(
+            f"/api/v1/metrics-summary?state=Taraba&limit=2&cursor={first['next_cursor']}"
+        ).json()
+        assert second["count"] == 1
+        assert second["next_cursor"] is None
+        assert second["data"][0]["state"] == "Taraba"
+
+    def test_invalid_cursor_returns_400(self, client: TestClient):
+        """Test malformed cursors and cursor+offset are rejected."""
+        response = client.get("/api/v1/outbreak-alerts?cursor=not-a-cursor")
+        assert response.status_code == 400
+
+        cursor = client.get("/api/v1/outbreak-alerts?limit=1").json()["next_cursor"]
+        response = client.get(f"/api/v1/outbreak-alerts?offset=1&cursor={cursor}")
+        assert response.status_code == 400
+
+    def test_cursor_seeks_by_sort_key_after_reload(
+        self, client: TestClient, test_fixtures_dir, tmp_path, monkeypatch
+    ):
+        """Test a cursor from an older data version resumes after its sort key."""
+        alerts_path = tmp_path / "outbreak_alerts.json"
+        records = json.loads((test_fixtures_dir / "outbreak_alerts.json").read_text())
+        alerts_path.write_text(json.dumps(records))
+        monkeypatch.setattr(settings, "OUTPUT_DIR", str(tmp_path))
+
+        first = client.get("/api/v1/outbreak-alerts?limit=2").json()
+        last_seen = first["data"][-1]
+
+        # Regenerated outputs with a new low-priority record appended
+        records.append(
+            {
+                "phc_name": "New PHC",
+                "lga": "Gassol",
+                "state": "Taraba",
+                "shortage_score": 0,
+                "alert_level": "Low",
+            }
+        )
+        alerts_path.write_text(json.dumps(records))
+
+        rest = client.get(
+            f"/api/v1/outbreak-alerts?limit=100&cursor={first['next_cursor']}"
+        ).json()["data"]
+        everything = client.get("/api/v1/outbreak-alerts?limit=100").json()["data"]
+
+        resumed_at = everything.index(last_seen) + 1
+        assert rest == everything[resumed_at:]
+        assert rest[-1]["name"] == "new phc"
+
+    def test_stale_cursor_on_file_ordered_data_returns_400(
+        self, client: TestClient, test_fixtures_dir, tmp_path, monkeypatch
+    ):
+        """Test a cursor over file-ordered data can't resume after a reload."""
+        csv_path = tmp_path / "metrics_summary.csv"
+        csv_path.write_text((test_fixtures_dir / "metrics_summary.csv").read_text())
+        monkeypatch.setattr(settings, "OUTPUT_DIR", str(tmp_path))
+
+        cursor = client.get("/api/v1/metrics-summary?limit=2").json()["next_cursor"]
+        with open(csv_path, "a") as f:
+            f.write("new phc,1.0,3.0,0.5,Gassol,Taraba,0.5,0,0.4,Medium\n")
+
+        response = client.get(f"/api/v1/metrics-summary?cursor={cursor}")
+        assert response.status_code == 400
+
+
+class TestConditionalRequests:
+    """Test ETag / Last-Modified validation and 304 responses."""
+
+    def test_responses_carry_validators(self, client: TestClient):
+        """Test that successful responses are tagged."""
+        response = client.get("/api/v1/outbreak-alerts")
+        assert response.status_code == 200
+        assert response.headers["etag"].startswith('"')
+        assert "last-modified" in response.headers
+        assert "max-age=" in response.headers["cache-control"]
+
+    @pytest.mark.parametrize(
+        "path",
+        [
+            "/api/v1/outbreak-alerts?state=Taraba",
+            "/api/v1/underserved",
+            "/api/v1/alerts-feed?limit=5",
+            "/api/v1/telecom-advice",
+            "/api/v1/metrics-summary",
+        ],
+    )
+    def test_matching_etag_returns_304(self, client: TestClient, path):
+        """Test that a poll with the current ETag gets an empty 304."""
+        etag = client.get(path).headers["etag"]
+
+        response = client.get(path, headers={"If-None-Match": etag})
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["etag"] == etag
+
+        response = client.get(path, headers={"If-None-Match": '"stale"'})
+        assert response.status_code == 200
+
+    def test_etag_depends_on_query_but_not_order(self, client: TestClient):
+        """Test that the ETag covers the normalized query parameters."""
+        path = "/api/v1/outbreak-alerts"
+        a = client.get(f"{path}?state=Taraba&limit=5").headers["etag"]
+        b = client.get(f"{path}?limit=5&state=Taraba").headers["etag"]
+        c = client.get(f"{path}?state=Lagos&limit=5").headers["etag"]
+        assert a == b
+        assert a != c
+
+    def test_invalid_params_are_rejected_before_revalidation(self, client: TestClient):
+        """Test that a conditional poll with invalid params gets its 422."""
+        path = "/api/v1/outbreak-alerts"
+        last_modified = client.get(path).headers["last-modified"]
+
+        for headers in [{"If-None-Match": "*"}, {"If-Modified-Since": last_modified}]:
+            response = client.get(f"{path}?limit=0", headers=headers)
+            assert response.status_code == 422
+
+    def test_etag_depends_on_content_not_file_identity(
+        self, client: TestClient, test_fixtures_dir, tmp_path, monkeypatch
+    ):
+        """Test that identical data served from other files keeps the ETag."""
+        path = "/api/v1/outbreak-alerts"
+        etag = client.get(path).headers["etag"]
+
+        for fixture in test_fixtures_dir.iterdir():
+            (tmp_path / fixture.name).write_bytes(fixture.read_bytes())
+        monkeypatch.setattr(settings, "OUTPUT_DIR", str(tmp_path))
+        monkeypatch.setattr(settings, "DATA_DIR", str(tmp_path))
+
+        assert client.get(path).headers["etag"] == etag
+
+    def test_if_modified_since(self, client: TestClient):
+        """Test Last-Modified revalidation."""
+        path = "/api/v1/underserved"
+        last_modified = client.get(path).headers["last-modified"]
+
+        response = client.get(path, headers={"If-Modified-Since": last_modified})
+        assert response.status_code == 304
+
+        old = "Mon, 01 Jan 2001 00:00:00 GMT"
+        response = client.get(path, headers={"If-Modified-Since": old})
+        assert response.status_code == 200
+
+    def test_refresh_bypasses_validation(self, client: TestClient):
+        """Test that refresh=true always returns the body."""
+        path = "/api/v1/underserved"
+        etag = client.get(path).headers["etag"]
+        response = client.get(f"{path}?refresh=true", headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.headers["etag"] == etag
+
+    def test_errors_are_not_tagged(self, client: TestClient):
+        """Test that error responses pass through without validators."""
+        response = client.get("/api/v1/outbreak-alerts?level=Extreme")
+        assert response.status_code == 400
+        assert "etag" not in response.headers
+
+    def test_data_change_changes_etag(
+        self, client: TestClient, test_fixtures_dir, tmp_path, monkeypatch
+    ):
+        """Test that regenerated outputs invalidate the client's copy."""
+        alerts_path = tmp_path / "outbreak_alerts.json"
+        alerts = json.loads((test_fixtures_dir / "outbreak_alerts.json").read_text())
+        alerts_path.write_text(json.dumps(alerts))
+        monkeypatch.setattr(settings, "OUTPUT_DIR", str(tmp_path))
+
+        etag = client.get("/api/v1/outbreak-alerts").headers["etag"]
+        alerts_path.write_text(json.dumps(alerts[:1]))
+
+        response = client.get(
+            "/api/v1/outbreak-alerts", headers={"If-None-Match": etag}
+        )
+        assert response.status_code == 200
+        assert response.json()["count"] == 1
+        assert response.headers["etag"] != etag
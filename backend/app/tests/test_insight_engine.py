@@ -0,0 +1,265 @@
+"""
+Regression tests for the insight engine's columnar scoring.
+
+The vectorized helpers must reproduce the original row-wise
+`apply(lambda ...)` logic exactly, including NaN and mixed-type cells.
+"""
+
+import pickle
+import shutil
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from insight_engine.consolidate import KEY_COLS, consolidate, consolidate_sheets
+from insight_engine.incremental import StageCache
+from insight_engine.insight_engine import (
+    INFRA_FAILURE_TOKENS,
+    PHC_NAME_COL,
+    SHORTAGE_TOKENS,
+    SOURCES,
+    InsightPipeline,
+    band_resource_alert,
+    band_shortage_level,
+    communities_col,
+    count_token_matches,
+    infra_fail_cols,
+    main,
+    shortage_cols,
+)
+
+DATA_DIR = Path(__file__).resolve().parents[2] / "data"
+
+
+def legacy_token_count(df, columns, tokens):
+    """Original row-wise implementation kept as the reference."""
+    return df[columns].apply(
+        lambda x: sum(x.fillna("").str.lower().isin(list(tokens))), axis=1
+    )
+
+
+def legacy_shortage_level(scores):
+    return scores.apply(lambda x: "Low" if x == 0 else "Medium" if x <= 2 else "High")
+
+
+def legacy_resource_alert(scores):
+    return scores.apply(lambda x: "Low" if x < 0.3 else "Medium" if x < 0.6 else "High")
+
+
+@pytest.fixture
+def mixed_answers():
+    """Frame with the awkward cell values seen in survey exports."""
+    return pd.DataFrame(
+        {
+            shortage_cols[0]: ["Yes", "no", np.nan, "YES", "Identified", " yes", True],
+            shortage_cols[1]: [np.nan, np.nan, np.nan, "true", "No", "TRUE", 1.0],
+            shortage_cols[2]: ["yes", "No", np.nan, "Yes", "identified", "", "Yes"],
+        }
+    )
+
+
+class TestCountTokenMatches:
+    """count_token_matches must equal the legacy apply-based count."""
+
+    def test_matches_legacy_on_mixed_values(self, mixed_answers):
+        expected = legacy_token_count(mixed_answers, shortage_cols, SHORTAGE_TOKENS)
+        result = count_token_matches(mixed_answers, shortage_cols, SHORTAGE_TOKENS)
+        pd.testing.assert_series_equal(result, expected, check_dtype=False)
+
+    def test_all_missing_column(self):
+        df = pd.DataFrame({"a": [np.nan, np.nan], "b": ["Yes", np.nan]})
+        result = count_token_matches(df, ["a", "b"], SHORTAGE_TOKENS)
+        assert result.tolist() == [1, 0]
+
+    def test_preserves_index(self):
+        df = pd.DataFrame({"a": ["Yes", "No"]}, index=[10, 20])
+        result = count_token_matches(df, ["a"], SHORTAGE_TOKENS)
+        assert result.index.tolist() == [10, 20]
+
+    @pytest.mark.parametrize(
+        "file_name, columns, tokens",
+        [
+            ("service_delivery.csv", shortage_cols, SHORTAGE_TOKENS),
+            ("infrastructure.csv", infra_fail_cols, INFRA_FAILURE_TOKENS),
+        ],
+    )
+    def test_matches_legacy_on_source_data(self, file_name, columns, tokens):
+        df = pd.read_csv(DATA_DIR / file_name)
+        expected = legacy_token_count(df, columns, tokens)
+        result = count_token_matches(df, columns, tokens)
+        pd.testing.assert_series_equal(result, expected, check_dtype=False)
+
+
+class TestBanding:
+    """Banding helpers must equal the legacy per-element lambdas."""
+
+    def test_shortage_level(self):
+        scores = pd.Series([0, 1, 2, 3, 4, 0])
+        pd.testing.assert_series_equal(
+            band_shortage_level(scores), legacy_shortage_level(scores)
+        )
+
+    def test_resource_alert(self):
+        scores = pd.Series([0.0, 0.29999, 0.3, 0.5999, 0.6, 1.0, np.nan])
+        pd.testing.assert_series_equal(
+            band_resource_alert(scores), legacy_resource_alert(scores)
+        )
+
+
+class TestInsightPipeline:
+    """InsightPipeline stages and CLI."""
+
+    def test_run_writes_outputs(self, tmp_path):
+        pipeline = InsightPipeline(data_dir=DATA_DIR, output_dir=tmp_path)
+        timings = pipeline.run()
+
+        assert [t.stage for t in timings] == list(InsightPipeline.STAGES)
+        assert all(t.peak_bytes is None for t in timings)
+        for file_name in [
+            "outbreak_alerts.json",
+            "underserved_phcs.json",
+            "resource_warnings.json",
+            "metrics_summary.csv",
+        ]:
+            assert (tmp_path / file_name).exists()
+
+        assert pipeline.merged[PHC_NAME_COL].is_unique
+
+    def test_run_traces_memory(self, tmp_path):
+        timings = InsightPipeline(DATA_DIR, tmp_path).run(trace_memory=True)
+        assert all(t.peak_bytes > 0 for t in timings)
+
+    def test_cli_reports_stage_timings(self, tmp_path, capsys):
+        exit_code = main(["--output-dir", str(tmp_path), "--no-memory"])
+        assert exit_code == 0
+
+        report = capsys.readouterr().out
+        for stage in InsightPipeline.STAGES:
+            assert stage in report
+        assert (tmp_path / "underserved_phcs.json").exists()
+
+    def test_cli_missing_input(self, tmp_path):
+        assert main(["--data-dir", str(tmp_path / "missing")]) == 1
+
+
+class TestConsolidation:
+    """Keyed consolidation of the unconsolidated survey sheets."""
+
+    def test_duplicate_keys_do_not_multiply_rows(self):
+        ceiling = pd.DataFrame(
+            {
+                PHC_NAME_COL: ["Kunini PHC", "Kunini PHC", "Rigasa PHC"],
+                "PHC LGA": ["Ardo Kola", "Ardo Kola", "Igabi"],
+                "State of PHC": ["Taraba State", "Taraba State", "Kaduna State"],
+                "Broken Ceiling": ["Yes", "Yes", "No"],
+            }
+        )
+        doors = pd.DataFrame(
+            {
+                PHC_NAME_COL: [" kunini  phc", "KUNINI PHC", "Rigasa PHC"],
+                "PHC LGA": ["ardo kola", "Ardo Kola", "Igabi"],
+                "State of PHC": ["Taraba State", "Taraba State", "Kaduna State"],
+                "Damaged Door": [np.nan, "No", "Yes"],
+                "Unnamed: 4": [np.nan, np.nan, np.nan],
+            }
+        )
+        wards = pd.DataFrame(
+            {
+                PHC_NAME_COL: ["Kunini PHC", "Kunini PHC", "Lau PHC"],
+                "State of PHC": ["Taraba State", "Taraba State", "Taraba State"],
+                "Wards": [3, 3, 1],
+            }
+        )
+
+        frame, reports = consolidate_sheets(
+            iter([("ceiling", ceiling), ("doors", doors), ("wards", wards)])
+        )
+
+        assert [(r.rows_in, r.rows_out) for r in reports] == [(3, 2), (3, 2), (3, 2)]
+        assert len(frame) == 3
+        assert list(frame.columns[:3]) == KEY_COLS
+        assert "Unnamed: 4" not in frame.columns
+
+        kunini = frame[frame[PHC_NAME_COL] == "Kunini PHC"].iloc[0]
+        assert kunini["Damaged Door"] == "No"  # first non-null answer
+        assert kunini["Wards"] == 3
+
+        lau = frame[frame[PHC_NAME_COL] == "Lau PHC"].iloc[0]
+        assert pd.isna(lau["Broken Ceiling"])
+
+    def test_source_sheets_consolidate_to_one_row_per_facility(self, tmp_path):
+        reports = consolidate(DATA_DIR / "unconsolidated", tmp_path)
+
+        for report in reports:
+            frame = pd.read_csv(tmp_path / report.output)
+            assert len(frame) == report.rows
+            assert report.rows <= sum(sheet.rows_in for sheet in report.sheets)
+            assert report.rows <= max(sheet.rows_in for sheet in report.sheets)
+
+
+class TestIncrementalPipeline:
+    """Content-hash driven incremental runs."""
+
+    @pytest.fixture
+    def data_copy(self, tmp_path):
+        data_dir = tmp_path / "data"
+        data_dir.mkdir()
+        for file_name in [
+            "service_delivery.csv",
+            "infrastructure.csv",
+            "inclusivity.csv",
+        ]:
+            shutil.copy(DATA_DIR / file_name, data_dir / file_name)
+        return data_dir
+
+    def run_cached(self, data_dir, tmp_path):
+        pipeline = InsightPipeline(
+            data_dir, tmp_path / "outputs", cache_dir=tmp_path / "cache"
+        )
+        pipeline.run()
+        return pipeline
+
+    def test_rerun_without_changes_recomputes_nothing(self, data_copy, tmp_path):
+        first = self.run_cached(data_copy, tmp_path)
+        assert first.stale_sources == list(SOURCES)
+        assert len(first.written) == 4
+
+        second = self.run_cached(data_copy, tmp_path)
+        assert second.stale_sources == []
+        assert second.merged_from_cache
+        assert second.written == []
+
+    def test_only_changed_source_is_rescored(self, data_copy, tmp_path):
+        self.run_cached(data_copy, tmp_path)
+
+        inclusivity = pd.read_csv(data_copy / "inclusivity.csv")
+        inclusivity.loc[0, communities_col] = "1"
+        inclusivity.to_csv(data_copy / "inclusivity.csv", index=False)
+
+        pipeline = self.run_cached(data_copy, tmp_path)
+        assert pipeline.stale_sources == ["inclusivity"]
+        assert not pipeline.merged_from_cache
+
+        # Incremental outputs match a from-scratch run on the same inputs
+        full_dir = tmp_path / "full"
+        InsightPipeline(data_copy, full_dir).run()
+        for path in (tmp_path / "outputs").iterdir():
+            assert path.read_bytes() == (full_dir / path.name).read_bytes()
+
+    def test_frames_not_matching_the_manifest_are_ignored(self, tmp_path):
+        frames = {"scored": pd.DataFrame({"a": [1, 2]})}
+        cache = StageCache(tmp_path)
+        cache.put_frames("source", "input-hash", frames)
+
+        # Saved with the frame, so a crash before the run ends keeps it valid
+        reopened = StageCache(tmp_path)
+        cached = reopened.get_frames("source", "input-hash")
+        pd.testing.assert_frame_equal(cached["scored"], frames["scored"])
+
+        # A frame file left behind by a crashed run is not trusted
+        other = {"scored": pd.DataFrame({"a": [3]})}
+        (tmp_path / "source.pkl").write_bytes(pickle.dumps(other))
+        assert reopened.get_frames("source", "input-hash") is None
+        assert not list(tmp_path.glob(".*.tmp"))
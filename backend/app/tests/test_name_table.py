@@ -0,0 +1,62 @@
+"""
+Tests for the shared PHC name table.
+"""
+
+from app.services import insight_loader
+from app.services.insight_loader import get_display_name, normalize_phc_name
+from app.services.name_table import NameTable
+
+
+class TestNameTable:
+    def setup_method(self):
+        self.calls = []
+
+        def normalize(name):
+            self.calls.append(name)
+            return normalize_phc_name(name)
+
+        self.table = NameTable(normalize, get_display_name)
+
+    def test_matches_the_normalizers(self):
+        raw = "  Ikeja   Central PHC. "
+        assert self.table.lookup(raw) == (
+            normalize_phc_name(raw),
+            get_display_name(raw),
+        )
+
+    def test_normalizes_each_distinct_name_once(self):
+        first = self.table.lookup("Ikeja Central PHC")
+        # A different string object with the same text
+        again = self.table.lookup(" ".join(["Ikeja", "Central", "PHC"]))
+        assert again is first
+        assert self.calls == ["Ikeja Central PHC"]
+
+    def test_equal_normalized_names_share_one_string(self):
+        a, _ = self.table.lookup("Ikeja Central PHC")
+        b, _ = self.table.lookup("IKEJA  central phc")
+        assert a == b
+        assert a is b
+
+    def test_non_strings_are_not_memoized(self):
+        assert self.table.lookup(None) == ("", "")
+        assert len(self.table) == 0
+
+    def test_empties_when_full(self):
+        table = NameTable(normalize_phc_name, get_display_name, max_size=2)
+        for name in ["a", "b", "c"]:
+            table.lookup(name)
+        assert len(table) == 1
+
+
+class TestSharedAcrossLoaders:
+    def test_datasets_share_name_strings(self, test_fixtures_dir):
+        alerts = insight_loader.load_outbreak_alerts(str(test_fixtures_dir))
+        warnings = insight_loader.load_resource_warnings(str(test_fixtures_dir))
+        alert_names = {r["name"]: r for r in alerts}
+
+        shared = [r for r in warnings if r["name"] in alert_names]
+        assert shared
+        for record in shared:
+            other = alert_names[record["name"]]
+            assert record["name"] is other["name"]
+            assert record["display_name"] is other["display_name"]
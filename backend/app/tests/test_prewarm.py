@@ -0,0 +1,94 @@
+"""
+Tests for the startup prewarm and the /ready endpoint.
+"""
+
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api.v1 import schemas
+from app.api.v1.conditional import data_version
+from app.api.v1.prewarm import DATASETS, prewarm, readiness
+from app.services import insight_loader
+
+
+@pytest.fixture(autouse=True)
+def reset_readiness():
+    readiness.reset()
+    yield
+    readiness.reset()
+
+
+class TestPrewarm:
+    def test_not_ready_before_prewarm(self, client: TestClient):
+        response = client.get("/ready")
+        assert response.status_code == 503
+        assert response.json()["status"] == "not_started"
+
+    def test_prewarm_loads_and_validates_every_dataset(
+        self, client: TestClient, test_fixtures_dir
+    ):
+        fixtures = str(test_fixtures_dir)
+        asyncio.run(prewarm(fixtures, fixtures))
+
+        assert readiness.ready
+        assert set(readiness.records) == {*DATASETS, "alerts_feed"}
+        assert readiness.missing == [] and readiness.errors == {}
+
+        # Served from the cache with the validated rows already built
+        alerts = insight_loader.load_outbreak_alerts(fixtures)
+        assert f"validated_{schemas.OutbreakAlertRecord.__name__}" in alerts._views
+
+        response = client.get("/ready")
+        assert response.status_code == 200
+        body = response.json()
+        assert body["status"] == "ready"
+        assert body["load_seconds"] >= 0
+        assert body["data_version"] == data_version(fixtures, fixtures)
+
+    def test_missing_files_are_skipped(self, tmp_path):
+        asyncio.run(prewarm(str(tmp_path), str(tmp_path)))
+
+        assert readiness.ready
+        assert sorted(readiness.missing) == sorted(DATASETS)
+
+    def test_unreadable_dataset_is_not_ready(self, client: TestClient, tmp_path):
+        (tmp_path / insight_loader.OUTBREAK_ALERTS_FILE).write_text("not json")
+        asyncio.run(prewarm(str(tmp_path), str(tmp_path), retry_seconds=0))
+
+        assert not readiness.ready
+        assert "outbreak_alerts" in readiness.errors
+
+        response = client.get("/ready")
+        assert response.status_code == 503
+        assert response.json()["status"] == "failed"
+
+    def test_failed_dataset_is_retried_until_it_loads(
+        self, client: TestClient, tmp_path
+    ):
+        alerts_file = tmp_path / insight_loader.OUTBREAK_ALERTS_FILE
+        alerts_file.write_text("not json")
+
+        async def prewarm_and_fix():
+            task = asyncio.create_task(
+                prewarm(str(tmp_path), str(tmp_path), retry_seconds=0.01)
+            )
+            while not readiness.errors:
+                await asyncio.sleep(0.005)
+            assert client.get("/ready").status_code == 503
+            alerts_file.write_text("[]")
+            return await task
+
+        asyncio.run(prewarm_and_fix())
+
+        assert readiness.ready
+        assert readiness.errors == {}
+        assert readiness.retries >= 1
+        assert readiness.records["outbreak_alerts"] == 0
+        assert client.get("/ready").status_code == 200
+
+    def test_data_version_changes_with_the_files(self, tmp_path):
+        before = data_version(str(tmp_path), str(tmp_path))
+        (tmp_path / insight_loader.UNDERSERVED_PHCS_FILE).write_text("[]")
+        assert data_version(str(tmp_path), str(tmp_path)) != before
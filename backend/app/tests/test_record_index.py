@@ -0,0 +1,129 @@
+"""
+Tests for the indexed record lists served by the API.
+"""
+
+from app.services.record_index import (
+    IndexedRecords,
+    level_then_score,
+    score_descending,
+)
+
+RECORDS = [
+    {"name": "a", "state": "Taraba", "lga": "Jalingo", "alert_level": "High"},
+    {"name": "b", "state": "Lagos", "lga": "Ikeja", "alert_level": "Low"},
+    {"name": "c", "state": "taraba", "lga": "Wukari", "alert_level": "Low"},
+    {"name": "d", "state": "Taraba", "lga": "jalingo", "alert_level": "Medium"},
+    {"name": "e", "state": None, "lga": "", "alert_level": "High"},
+]
+
+
+def names(records):
+    return [r["name"] for r in records]
+
+
+def scan(records, field, value):
+    """Case-insensitive linear filter the indexes must agree with."""
+    if not value:
+        return records
+    return [r for r in records if r.get(field, "").lower() == value.lower()]
+
+
+def sort_by_level_then_score(records, level_field, score_field):
+    """Per-request sort the presorted order must agree with."""
+    priority = {"High": 3, "Medium": 2, "Low": 1}
+    return sorted(
+        records,
+        key=lambda r: (
+            -priority.get(r.get(level_field, "Low"), 0),
+            -r.get(score_field, 0),
+        ),
+    )
+
+
+class TestIndexedRecords:
+    def setup_method(self):
+        self.indexed = IndexedRecords(RECORDS, level_field="alert_level")
+
+    def test_behaves_like_the_record_list(self):
+        assert len(self.indexed) == len(RECORDS)
+        assert list(self.indexed) == RECORDS
+        assert self.indexed[1] == RECORDS[1]
+        assert list(self.indexed.filter()) == RECORDS
+
+    def test_filters_match_linear_scan(self):
+        for state in ["Taraba", "TARABA", "Lagos", "Kano"]:
+            for lga in [None, "Jalingo", "ikeja"]:
+                expected = scan(RECORDS[:4], "state", state)
+                expected = scan(expected, "lga", lga)
+                assert names(self.indexed.filter(state=state, lga=lga)) == names(
+                    expected
+                )
+
+    def test_level_index_alone_and_combined(self):
+        assert names(self.indexed.filter(level="High")) == ["a", "e"]
+        assert names(self.indexed.filter(state="taraba", level="Low")) == ["c"]
+        assert self.indexed.filter(level="Unknown") == []
+
+    def test_missing_state_indexes_as_empty(self):
+        assert self.indexed.by_state[""] == [4]
+
+
+class TestPresortedRecords:
+    SCORED = [
+        {"name": "a", "state": "Taraba", "alert_level": "Low", "score": 1.0},
+        {"name": "b", "state": "Taraba", "alert_level": "High", "score": 2.0},
+        {"name": "c", "state": "Lagos", "alert_level": "High", "score": 5.0},
+        {"name": "d", "state": "Taraba", "alert_level": "Medium", "score": 9.0},
+        {"name": "e", "state": "Taraba", "alert_level": "High", "score": 2.0},
+    ]
+
+    def test_level_then_score_matches_per_request_sort(self):
+        indexed = IndexedRecords(
+            self.SCORED,
+            level_field="alert_level",
+            sort_key=level_then_score("alert_level", "score"),
+        )
+        expected = sort_by_level_then_score(self.SCORED, "alert_level", "score")
+        assert list(indexed) == expected
+        # Ties keep file order
+        assert names(indexed) == ["c", "b", "e", "d", "a"]
+
+    def test_score_descending_matches_reverse_sort(self):
+        indexed = IndexedRecords(self.SCORED, sort_key=score_descending("score"))
+        expected = sorted(self.SCORED, key=lambda r: r["score"], reverse=True)
+        assert list(indexed) == expected
+
+    def test_pages_are_slices_of_the_sorted_filter(self):
+        indexed = IndexedRecords(
+            self.SCORED,
+            level_field="alert_level",
+            sort_key=level_then_score("alert_level", "score"),
+        )
+        total, page, _ = indexed.page(state="taraba", offset=1, limit=2)
+        assert total == 4
+        assert names(page) == ["e", "d"]
+
+        total, page, _ = indexed.page(offset=4, limit=10)
+        assert total == 5
+        assert names(page) == ["a"]
+
+    def test_mapped_rows_follow_filters_and_pages(self):
+        indexed = IndexedRecords(
+            self.SCORED,
+            level_field="alert_level",
+            sort_key=level_then_score("alert_level", "score"),
+        )
+        calls = []
+
+        def upper_name(record):
+            calls.append(record["name"])
+            return {"name": record["name"].upper()}
+
+        rows = indexed.mapped("upper", upper_name)
+        assert indexed.mapped("upper", upper_name) is rows
+        assert len(calls) == 5
+
+        assert names(indexed.filter(state="taraba", rows=rows)) == ["B", "E", "D", "A"]
+        total, page, _ = indexed.page(state="taraba", offset=1, limit=2, rows=rows)
+        assert total == 4
+        assert names(page) == ["E", "D"]
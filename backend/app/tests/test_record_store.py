@@ -0,0 +1,112 @@
+"""
+Tests for the compact column store.
+"""
+
+import math
+
+import pytest
+
+from app.services.record_store import _MISSING, ColumnStore, Row, classify_column
+
+RECORDS = [
+    {
+        "name": "a phc",
+        "state": "Taraba",
+        "score": 1.5,
+        "rank": 3,
+        "flag": True,
+        "note": None,
+    },
+    {
+        "name": "b phc",
+        "state": "Taraba",
+        "score": None,
+        "rank": 1,
+        "flag": False,
+        "note": "x",
+    },
+    {
+        "name": "c phc",
+        "state": "Lagos",
+        "score": 2.0,
+        "rank": 2,
+        "flag": False,
+        "note": None,
+    },
+    {
+        "name": "d phc",
+        "state": "Taraba",
+        "score": 0.25,
+        "rank": 4,
+        "flag": True,
+        "note": None,
+    },
+]
+
+
+class TestColumnStore:
+    def setup_method(self):
+        self.store = ColumnStore(RECORDS)
+
+    def test_round_trips_values_and_types(self):
+        assert self.store.dicts(range(len(RECORDS))) == RECORDS
+        row = self.store.dicts([1])[0]
+        assert row["score"] is None
+        assert row["flag"] is False
+        assert type(row["rank"]) is int
+
+    def test_rows_are_read_only_mapping_views(self):
+        row = self.store[2]
+        assert isinstance(row, Row)
+        assert row == RECORDS[2]
+        assert row.get("missing", "default") == "default"
+        assert list(row) == list(RECORDS[2])
+        assert not hasattr(row, "__dict__")
+        with pytest.raises(TypeError):
+            row["name"] = "changed"
+
+    def test_sequence_behaviour(self):
+        assert len(self.store) == 4
+        assert self.store[-1] == RECORDS[-1]
+        assert [r["name"] for r in self.store[1:3]] == ["b phc", "c phc"]
+        with pytest.raises(IndexError):
+            self.store[4]
+
+    def test_missing_fields_stay_missing(self):
+        store = ColumnStore([{"a": 1, "b": 2}, {"a": 3}])
+        assert store.dicts([0, 1]) == [{"a": 1, "b": 2}, {"a": 3}]
+        assert "b" not in store[1]
+        assert dict(store[1]) == {"a": 3}
+
+    def test_nan_and_none_are_kept_apart(self):
+        store = ColumnStore([{"v": math.nan}, {"v": 1.0}])
+        assert math.isnan(store[0]["v"])
+
+        store = ColumnStore([{"v": math.nan}, {"v": None}])
+        assert math.isnan(store[0]["v"])
+        assert store[1]["v"] is None
+
+    def test_ints_and_floats_are_not_mixed(self):
+        store = ColumnStore([{"v": 1}, {"v": 2.5}])
+        assert store.dicts([0, 1]) == [{"v": 1}, {"v": 2.5}]
+        assert type(store[0]["v"]) is int
+
+
+@pytest.mark.parametrize(
+    "values, kind",
+    [
+        ([True, False], "bool"),
+        ([1, 2], "int"),
+        ([2**63, 1], "values"),
+        ([1.5, 2.5], "float"),
+        ([1.5, None], "nullable_float"),
+        ([math.nan, None], "values"),
+        (["Lagos", "Lagos", "Taraba", "Lagos"], "dict"),
+        (["a", "b"], "str"),
+        ([1, 2.5], "values"),
+        ([1, _MISSING], "values"),
+        ([], "values"),
+    ],
+)
+def test_classify_column(values, kind):
+    assert classify_column(values)[0] == kind
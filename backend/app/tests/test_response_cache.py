@@ -0,0 +1,75 @@
+"""
+Tests for the serialized response cache.
+"""
+
+from fastapi.testclient import TestClient
+
+from app.api.v1.conditional import response_cache
+from app.api.v1.response_cache import CachedResponse, ResponseCache
+
+
+def body(size: int) -> CachedResponse:
+    return CachedResponse(b"x" * size, "application/json")
+
+
+class TestResponseCache:
+    def test_counts_hits_and_misses(self):
+        cache = ResponseCache(max_bytes=100)
+        assert cache.get("a") is None
+        cache.set("a", body(10))
+        assert cache.get("a").size == 10
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+
+    def test_evicts_least_recently_used_by_size(self):
+        cache = ResponseCache(max_bytes=100)
+        cache.set("a", body(40))
+        cache.set("b", body(40))
+        cache.get("a")
+        cache.set("c", body(40))
+
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+        assert cache.get("c") is not None
+        assert cache.size == 80
+        assert cache.evictions == 1
+
+    def test_replacing_an_entry_updates_the_size(self):
+        cache = ResponseCache(max_bytes=100)
+        cache.set("a", body(40))
+        cache.set("a", body(10))
+        assert cache.size == 10
+        assert cache.stats()["entries"] == 1
+
+    def test_skips_entries_larger_than_the_cache(self):
+        cache = ResponseCache(max_bytes=100)
+        cache.set("a", body(101))
+        assert cache.get("a") is None
+        assert cache.size == 0
+
+        disabled = ResponseCache(max_bytes=0)
+        disabled.set("a", body(1))
+        assert disabled.get("a") is None
+
+
+class TestCachedEndpoints:
+    def test_identical_queries_are_served_from_cache(self, client: TestClient):
+        first = client.get("/api/v1/alerts-feed?limit=5&state=Taraba")
+        second = client.get("/api/v1/alerts-feed?state=Taraba&limit=5")
+
+        assert second.status_code == 200
+        assert second.content == first.content
+        assert second.headers["content-type"] == "application/json"
+        assert second.headers["etag"] == first.headers["etag"]
+        assert response_cache.stats()["hits"] == 1
+
+    def test_errors_are_not_cached(self, client: TestClient):
+        client.get("/api/v1/outbreak-alerts?level=Extreme")
+        assert response_cache.stats()["entries"] == 0
+
+    def test_health_reports_counters(self, client: TestClient):
+        client.get("/api/v1/underserved")
+        client.get("/api/v1/underserved")
+        stats = client.get("/health").json()["response_cache"]
+        assert stats["hits"] == 1
+        assert stats["entries"] == 1
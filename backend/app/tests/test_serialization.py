@@ -0,0 +1,100 @@
+"""
+Tests for the fast serialization path.
+"""
+
+import asyncio
+import threading
+
+import pytest
+from fastapi.responses import JSONResponse, ORJSONResponse
+
+from app.api.v1 import schemas, serialization
+from app.api.v1.serialization import (
+    json_response_class,
+    validated_rows_async,
+    validator,
+)
+from app.services.record_index import IndexedRecords
+
+WARNING = {
+    "name": "a phc",
+    "display_name": "A PHC",
+    "lga": "Ikeja",
+    "state": "Lagos",
+    "resource_risk_score": 3,
+    "resource_alert": "High",
+}
+
+
+class TestValidator:
+    def test_coerces_and_drops_extra_fields(self):
+        validate = validator(schemas.ResourceWarningRecord)
+        row = validate(
+            {
+                "name": "a phc",
+                "display_name": "A PHC",
+                "lga": "Ikeja",
+                "state": "Lagos",
+                "resource_risk_score": 3,
+                "resource_alert": "High",
+                "raw_column": "dropped",
+            }
+        )
+        assert "raw_column" not in row
+        assert row["resource_risk_score"] == 3.0
+
+    def test_invalid_record_raises_value_error(self):
+        validate = validator(schemas.ResourceWarningRecord)
+        with pytest.raises(ValueError):
+            validate({"name": "a phc", "resource_alert": "Extreme"})
+
+
+class TestValidatedRowsAsync:
+    def test_validates_in_the_pool_once(self, monkeypatch):
+        records = IndexedRecords([WARNING, dict(WARNING, name="b phc")])
+        threads = []
+        validate = validator(schemas.ResourceWarningRecord)
+
+        def recording_validator(model):
+            def validate_in_thread(record):
+                threads.append(threading.current_thread())
+                return validate(record)
+
+            return validate_in_thread
+
+        monkeypatch.setattr(serialization, "validator", recording_validator)
+
+        async def validate_concurrently():
+            return await asyncio.gather(
+                *(
+                    validated_rows_async(records, schemas.ResourceWarningRecord)
+                    for _ in range(3)
+                )
+            )
+
+        rows = asyncio.run(validate_concurrently())
+        assert rows[0] is rows[1] is rows[2]
+        assert len(threads) == 2
+        assert threading.main_thread() not in threads
+        assert rows[0].dicts(range(2))[1]["resource_risk_score"] == 3.0
+
+
+class TestJsonResponseClass:
+    def test_json_uses_stdlib_encoder(self):
+        assert json_response_class("json") is JSONResponse
+
+    @pytest.mark.parametrize("encoder", ["auto", "orjson"])
+    def test_orjson_when_installed(self, encoder, monkeypatch):
+        monkeypatch.setattr(serialization, "_orjson_available", lambda: True)
+        assert json_response_class(encoder) is ORJSONResponse
+
+        monkeypatch.setattr(serialization, "_orjson_available", lambda: False)
+        assert json_response_class(encoder) is JSONResponse
+
+    def test_rejects_unknown_encoder(self):
+        with pytest.raises(ValueError):
+            json_response_class("ujson")
+
+    def test_encoders_produce_the_same_body(self):
+        body = {"count": 1, "data": [{"name": "é phc", "score": 0.1}], "next": None}
+        assert ORJSONResponse(body).body == JSONResponse(body).body
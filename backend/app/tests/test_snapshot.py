@@ -0,0 +1,194 @@
+"""
+Tests for the shared memory-mapped dataset snapshots.
+"""
+
+import math
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.services import snapshot
+from app.services.record_index import IndexedRecords, level_then_score
+from app.services.record_store import ColumnStore
+from app.services.snapshot import (
+    SnapshotStore,
+    encode_columns,
+    encode_dataset,
+    map_columns,
+    map_dataset,
+)
+
+RECORDS = [
+    {
+        "name": f"phc {i}",
+        "display_name": f"Phc {i} – Ikeja",
+        "state": ["Lagos", "Taraba"][i % 2],
+        "lga": ["Ikeja", "Jalingo", "Ibi"][i % 3],
+        "alert_level": ["High", "Medium", "Low"][i % 3],
+        "shortage_score": i % 4,
+        "index": None if i % 5 == 0 else i / 7,
+        "flag": i % 2 == 0,
+        "big": 2**70 if i == 3 else i,
+        "mixed": "n/a" if i % 4 == 0 else i,
+    }
+    for i in range(12)
+]
+
+
+def _dict(row):
+    return {k: ("nan" if v != v else v) for k, v in dict(row).items()}
+
+
+def _write(tmp_path, data: bytes):
+    path = tmp_path / "test.snap"
+    path.write_bytes(data)
+    return path
+
+
+class TestSnapshotFormat:
+    def test_columns_round_trip(self, tmp_path):
+        records = [
+            *RECORDS,
+            {"name": "sparse", "extra": [1, 2]},
+            {"name": "nan", "index": math.nan},
+        ]
+        store = ColumnStore(records)
+        mapped = map_columns(_write(tmp_path, encode_columns(store)))
+
+        assert len(mapped) == len(store)
+        assert [_dict(row) for row in mapped] == [_dict(row) for row in store]
+        assert "extra" not in mapped[0] and mapped[12]["extra"] == [1, 2]
+
+    def test_empty_store(self, tmp_path):
+        mapped = map_columns(_write(tmp_path, encode_columns(ColumnStore([]))))
+        assert len(mapped) == 0 and list(mapped) == []
+
+    def test_dataset_round_trip(self, tmp_path):
+        indexed = IndexedRecords(
+            RECORDS,
+            level_field="alert_level",
+            sort_key=level_then_score("alert_level", "shortage_score"),
+        )
+        mapped = map_dataset(_write(tmp_path, encode_dataset(indexed)))
+
+        assert mapped.version == indexed.version
+        assert [_dict(r) for r in mapped] == [_dict(r) for r in indexed]
+        for filters in [
+            {},
+            {"state": "lagos"},
+            {"lga": "IBI"},
+            {"state": "Taraba", "lga": "Jalingo"},
+            {"level": "High"},
+            {"state": "Lagos", "level": "Low"},
+        ]:
+            assert list(mapped.positions(**filters)) == list(
+                indexed.positions(**filters)
+            )
+
+        total, page, cursor = mapped.page(limit=5)
+        assert (total, page, cursor) == indexed.page(limit=5)
+        assert mapped.page(limit=5, cursor=cursor) == indexed.page(
+            limit=5, cursor=cursor
+        )
+
+
+class TestSnapshotStore:
+    def setup_method(self):
+        self.builds = 0
+
+    def build(self):
+        self.builds += 1
+        return IndexedRecords(RECORDS, level_field="alert_level")
+
+    def test_written_once_and_mapped_by_every_worker(self, tmp_path):
+        source = tmp_path / "data.json"
+        source.write_text("[]")
+        first = SnapshotStore(tmp_path / "snapshots")
+        second = SnapshotStore(tmp_path / "snapshots")
+
+        records = first.load("alerts", source, self.build)
+        other = second.load("alerts", source, self.build)
+        assert self.builds == 1
+        assert [dict(r) for r in other] == [dict(r) for r in records]
+        # A reload of unchanged data reuses the mapped records
+        assert first.load("alerts", source, self.build) is records
+
+        validations = []
+
+        def validate(record):
+            validations.append(record)
+            return {"name": record["name"].upper()}
+
+        rows = records.mapped("validated", validate)
+        assert other.mapped("validated", validate).dicts([0]) == rows.dicts([0])
+        assert len(validations) == len(RECORDS)
+
+    def test_changed_source_replaces_the_snapshot(self, tmp_path):
+        source = tmp_path / "data.json"
+        source.write_text("[]")
+        store = SnapshotStore(tmp_path)
+        store.load("alerts", source, self.build).mapped("view", dict)
+        old_files = set(tmp_path.glob("alerts-*"))
+
+        source.write_text("[ ]")
+        store.load("alerts", source, self.build)
+        assert self.builds == 2
+        new_files = set(tmp_path.glob("alerts-*"))
+        assert not old_files & new_files
+        assert len([p for p in new_files if p.suffix == ".snap"]) == 1
+        assert not list(tmp_path.glob("*.lock"))
+
+    def test_new_format_version_gets_a_new_snapshot(self, tmp_path, monkeypatch):
+        source = tmp_path / "data.json"
+        source.write_text("[]")
+        store = SnapshotStore(tmp_path / "snapshots")
+        store.load("alerts", source, self.build)
+
+        monkeypatch.setattr(
+            snapshot, "SNAPSHOT_FORMAT_VERSION", snapshot.SNAPSHOT_FORMAT_VERSION + 1
+        )
+        SnapshotStore(tmp_path / "snapshots").load("alerts", source, self.build)
+        assert self.builds == 2
+
+    def test_build_errors_propagate(self, tmp_path):
+        def missing():
+            raise FileNotFoundError("no data")
+
+        with pytest.raises(FileNotFoundError):
+            SnapshotStore(tmp_path).load("alerts", tmp_path / "x.json", missing)
+        assert not list(tmp_path.glob("*.snap"))
+
+    def test_unwritable_snapshot_keeps_records_in_process(self, tmp_path, monkeypatch):
+        def fail(path, data):
+            raise OSError("read-only file system")
+
+        monkeypatch.setattr(snapshot, "_write_atomic", fail)
+        records = SnapshotStore(tmp_path).load("alerts", None, self.build)
+        assert [dict(r) for r in records] == [
+            dict(r) for r in IndexedRecords(RECORDS, level_field="alert_level")
+        ]
+        assert records.share_view is None
+
+
+def test_endpoints_serve_the_same_data_from_snapshots(
+    client: TestClient, tmp_path, monkeypatch
+):
+    from app.api.v1.conditional import response_cache
+    from app.services.insight_loader import clear_cache
+
+    paths = [
+        "/api/v1/outbreak-alerts?state=Taraba&limit=3",
+        "/api/v1/underserved",
+        "/api/v1/alerts-feed",
+        "/api/v1/telecom-advice",
+        "/api/v1/resource-warnings?level=High",
+        "/api/v1/metrics-summary",
+    ]
+    expected = [client.get(path).json() for path in paths]
+
+    monkeypatch.setattr(settings, "SNAPSHOT_DIR", str(tmp_path))
+    clear_cache()
+    response_cache.clear()
+    assert [client.get(path).json() for path in paths] == expected
+    assert list(tmp_path.glob("outbreak_alerts_*.snap"))
@@ -0,0 +1,139 @@
+"""
+Measure the API's cold start: import time and time to first byte.
+
+- imports: runs `python -X importtime -c "import app.main"` and reports the
+  total import time, the heaviest imported packages and whether pandas,
+  numpy or pyarrow were imported at all (the API should import none)
+- time to first byte: starts `uvicorn app.main:app` on a free port and times
+  from process start until the first byte of a response to `--path`
+  (with `--ready`, until `/ready` answers 200, i.e. the prewarm is done)
+
+Each measurement runs in a fresh interpreter; the best and median of
+`--runs` are reported.
+
+Usage (from backend/):
+    python -m benchmarks.cold_start [--runs 5] [--top 10] [--path /health] [--ready]
+"""
+
+import argparse
+import http.client
+import os
+import re
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+# Imports the API process should not pay for
+HEAVY_MODULES = ("pandas", "numpy", "pyarrow")
+
+IMPORTTIME_LINE = re.compile(r"import time:\s+\d+ \|\s+(\d+) \| *(\S+)")
+
+
+def import_profile() -> Tuple[float, Dict[str, float]]:
+    """
+    Import app.main in a fresh interpreter under `-X importtime`.
+
+    Returns:
+        (seconds to import app.main, package -> cumulative seconds of its
+        outermost import)
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    total = 0.0
+    packages: Dict[str, float] = {}
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if not match:
+            continue
+        name, seconds = match.group(2), int(match.group(1)) / 1e6
+        if name == "app.main":
+            total = seconds
+        package = name.split(".")[0]
+        packages[package] = max(packages.get(package, 0.0), seconds)
+    return total, packages
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def time_to_first_byte(path: str, ready: bool, timeout: float = 60.0) -> float:
+    """Seconds from starting uvicorn until `path` (or a 200 /ready) answers."""
+    port = _free_port()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port)],
+        cwd=BACKEND_DIR,
+        env={**os.environ, "CACHE_WATCH": "False"},
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    started = time.perf_counter()
+    try:
+        while time.perf_counter() - started < timeout:
+            if server.poll() is not None:
+                raise RuntimeError(f"uvicorn exited with code {server.returncode}")
+            connection = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+            try:
+                connection.request("GET", "/ready" if ready else path)
+                response = connection.getresponse()
+                response.read(1)
+                if not ready or response.status == 200:
+                    return time.perf_counter() - started
+            except OSError:
+                pass
+            finally:
+                connection.close()
+            time.sleep(0.005)
+        raise TimeoutError(f"No response within {timeout}s")
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def _summary(samples: List[float]) -> str:
+    return (
+        f"best {min(samples) * 1000:8.1f} ms   "
+        f"median {statistics.median(samples) * 1000:8.1f} ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--path", default="/health")
+    parser.add_argument(
+        "--ready", action="store_true", help="time until /ready answers 200"
+    )
+    args = parser.parse_args()
+
+    profiles = [import_profile() for _ in range(args.runs)]
+    totals = [total for total, _ in profiles]
+    print(f"{'import app.main':<32} {_summary(totals)}")
+
+    _, modules = min(profiles, key=lambda profile: profile[0])
+    for name, seconds in sorted(modules.items(), key=lambda item: -item[1])[: args.top]:
+        print(f"  {name:<30} {seconds * 1000:8.1f} ms")
+    heavy = [name for name in HEAVY_MODULES if name in modules]
+    print(f"  heavy imports: {', '.join(heavy) if heavy else 'none'}")
+
+    target = "/ready (200)" if args.ready else args.path
+    samples = [time_to_first_byte(args.path, args.ready) for _ in range(args.runs)]
+    print(f"{'first byte of ' + target:<32} {_summary(samples)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Compare JSON response encoders on the API's real payloads.
+
+Builds the bodies the endpoints return for the files in `outputs/` (records
+are repeated to reach the requested payload size, e.g. 1000-item pages) and
+times each encoder rendering them:
+
+- jsonable_encoder + json: FastAPI's default path for a returned dict/model
+- json: `JSONResponse.render` on already-validated rows
+- orjson: `ORJSONResponse.render` on the same rows (if orjson is installed)
+
+Usage (from backend/):
+    python -m benchmarks.json_encoding [--output-dir outputs] [--items 1000]
+"""
+
+import argparse
+import asyncio
+import json
+import timeit
+from itertools import cycle, islice
+from typing import Callable, Dict, List, Optional
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from app.api.v1 import schemas
+from app.api.v1.serialization import _orjson_available, validated_rows
+from app.services import alerts_feed, insight_loader
+from app.services.record_store import ColumnStore
+
+
+def _repeat(rows: List[Dict], items: int) -> List[Dict]:
+    return list(islice(cycle(rows), items)) if rows else []
+
+
+def _dicts(rows: ColumnStore) -> List[Dict]:
+    """Validated rows as the plain dicts the endpoints render."""
+    return rows.dicts(range(len(rows)))
+
+
+def build_payloads(output_dir: str, items: int) -> Dict[str, Dict]:
+    """Response bodies shaped like the endpoints', `items` records each."""
+    alerts = insight_loader.load_outbreak_alerts(output_dir)
+    warnings = insight_loader.load_resource_warnings(output_dir)
+    underserved = insight_loader.load_underserved_phcs(output_dir)
+    metrics = insight_loader.load_metrics_summary(output_dir)
+    feed = asyncio.run(alerts_feed.load_alerts_feed_async(output_dir))
+
+    def page(rows: ColumnStore) -> Dict:
+        data = _repeat(_dicts(rows), items)
+        return {"count": len(data), "data": data, "next_cursor": None}
+
+    return {
+        "/outbreak-alerts": page(validated_rows(alerts, schemas.OutbreakAlertRecord)),
+        "/resource-warnings": page(
+            validated_rows(warnings, schemas.ResourceWarningRecord)
+        ),
+        "/underserved": page(validated_rows(underserved, schemas.UnderservedPHCRecord)),
+        "/metrics-summary": page(validated_rows(metrics, schemas.MetricsSummaryRecord)),
+        "/alerts-feed": {
+            "total": items,
+            "feed": _repeat(feed.select(limit=items), items),
+        },
+    }
+
+
+def encoders() -> Dict[str, Callable[[Dict], bytes]]:
+    found = {
+        "jsonable_encoder + json": lambda body: JSONResponse(
+            jsonable_encoder(body)
+        ).body,
+        "json": lambda body: JSONResponse(body).body,
+    }
+    if _orjson_available():
+        from fastapi.responses import ORJSONResponse
+
+        found["orjson"] = lambda body: ORJSONResponse(body).body
+    return found
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--output-dir", default="outputs")
+    parser.add_argument("--items", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args(argv)
+
+    payloads = build_payloads(args.output_dir, args.items)
+    candidates = encoders()
+
+    print(
+        f"{'endpoint':<20} {'encoder':<25} {'KiB':>8} {'ms/render':>10} {'speedup':>8}"
+    )
+    for endpoint, body in payloads.items():
+        baseline = None
+        for name, encode in candidates.items():
+            # Every encoder must produce the same document
+            assert json.loads(encode(body)) == json.loads(candidates["json"](body))
+            seconds = min(
+                timeit.repeat(lambda: encode(body), number=args.repeat, repeat=5)
+            )
+            per_call = seconds / args.repeat * 1000
+            baseline = baseline or per_call
+            size = len(encode(body)) / 1024
+            print(
+                f"{endpoint:<20} {name:<25} {size:>8.1f} {per_call:>10.3f} "
+                f"{baseline / per_call:>7.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
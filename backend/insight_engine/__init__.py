@@ -0,0 +1,5 @@
+"""Insight engine: scores PHC survey data and exports the API's output files."""
+
+from insight_engine.insight_engine import InsightPipeline, StageTiming
+
+__all__ = ["InsightPipeline", "StageTiming"]
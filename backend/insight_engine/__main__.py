@@ -0,0 +1,7 @@
+"""Allow `python -m insight_engine` to regenerate the outputs."""
+
+import sys
+
+from insight_engine.insight_engine import main
+
+sys.exit(main())
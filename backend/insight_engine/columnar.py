@@ -0,0 +1,51 @@
+"""
+Columnar (Arrow IPC / Feather v2) export of the merged per-PHC metrics.
+
+One typed file holds every metric column of `metrics_summary.csv`, with the
+LGA, state and alert columns dictionary-encoded and the record batches
+optionally compressed. The API memory-maps it instead of parsing CSV/JSON.
+pyarrow is only needed when columnar output is requested.
+"""
+
+import pandas as pd
+
+COLUMNAR_FILE = "metrics.arrow"
+
+# Low-cardinality string columns stored as dictionary indices + a string table
+DICTIONARY_COLUMNS = ["PHC LGA", "State of PHC", "resource_alert"]
+
+COMPRESSIONS = ("zstd", "lz4", "none")
+
+
+def to_arrow_ipc(merged: pd.DataFrame, compression: str = "zstd") -> bytes:
+    """
+    Serialize the merged metrics frame to Arrow IPC file bytes.
+
+    Args:
+        merged: Merged per-PHC frame (one row per facility)
+        compression: "zstd", "lz4", or "none" (uncompressed buffers can be
+            memory-mapped zero-copy by readers)
+
+    Raises:
+        RuntimeError: If pyarrow is not installed
+        ValueError: If compression is not supported
+    """
+    if compression not in COMPRESSIONS:
+        raise ValueError(f"Unsupported compression '{compression}', expected one of {COMPRESSIONS}")
+
+    try:
+        import pyarrow as pa
+    except ImportError as e:
+        raise RuntimeError("Columnar output requires pyarrow (pip install pyarrow)") from e
+
+    table = pa.Table.from_pandas(merged, preserve_index=False).replace_schema_metadata(None)
+    for name in DICTIONARY_COLUMNS:
+        if name in table.column_names:
+            index = table.schema.get_field_index(name)
+            table = table.set_column(index, name, table.column(name).dictionary_encode())
+
+    options = pa.ipc.IpcWriteOptions(compression=None if compression == "none" else compression)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_file(sink, table.schema, options=options) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
@@ -0,0 +1,218 @@
+"""
+Consolidate the per-question survey sheets under data/unconsolidated/ into
+the per-theme CSVs the insight engine reads (infrastructure.csv, ...).
+
+Replaces the notebook's `reduce(pd.merge(..., how="outer"))` over raw sheets:
+PHC names repeat within and across sheets (with varying case/whitespace), so
+outer-merging the raw rows multiplied them (4,192 infrastructure rows for ~75
+facilities). Here every sheet is first collapsed to one row per
+(PHC, LGA, State) key, then joined on that key, so the consolidated size is
+bounded by the number of distinct facilities. Sheets are read one at a time
+and folded into the running result.
+"""
+
+import argparse
+import logging
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple
+
+import pandas as pd
+
+from insight_engine.insight_engine import BACKEND_DIR, DEFAULT_DATA_DIR, PHC_NAME_COL
+
+logger = logging.getLogger("insight_engine")
+
+DEFAULT_SOURCE_DIR = BACKEND_DIR / "data" / "unconsolidated"
+
+KEY_COLS = [PHC_NAME_COL, "PHC LGA", "State of PHC"]
+
+# Output CSV -> sheet sub-directory under the source directory
+CONSOLIDATED_OUTPUTS = {
+    "infrastructure.csv": "Infrastructure",
+    "service_delivery.csv": "Service delivery",
+    "inclusivity.csv": "inclusivity",
+    "telecommunication.csv": "telecommunication map",
+}
+
+
+@dataclass
+class SheetReport:
+    """Row cardinality of one sheet before and after per-key deduplication."""
+
+    output: str
+    sheet: str
+    rows_in: int
+    rows_out: int
+
+
+@dataclass
+class ConsolidationReport:
+    """Consolidated row count of one output CSV and its per-sheet reports."""
+
+    output: str
+    rows: int
+    sheets: List[SheetReport]
+
+
+def _key_name(column: str) -> str:
+    return f"__key__{column}"
+
+
+def normalize_key(values: pd.Series) -> pd.Series:
+    """Case/whitespace-insensitive join key ("Ali goro  PHCC " == "ali goro phcc")."""
+    return (
+        values.astype("string")
+        .str.strip()
+        .str.replace(r"\s+", " ", regex=True)
+        .str.lower()
+        .fillna("")
+    )
+
+
+def iter_sheets(sheet_dir: Path) -> Iterator[Tuple[str, pd.DataFrame]]:
+    """Yield (file name, frame) for each CSV sheet, reading one sheet at a time."""
+    for path in sorted(Path(sheet_dir).glob("*.csv")):
+        yield path.name, pd.read_csv(path)
+
+
+def dedupe_sheet(df: pd.DataFrame) -> Tuple[pd.DataFrame, List[str]]:
+    """
+    Collapse a sheet to one row per (PHC, LGA, State) key.
+
+    Keeps the first non-null answer per column for each key and drops the
+    spreadsheet's `Unnamed: n` filler columns. Sheets missing some key
+    columns (e.g. the wards sheet has no LGA) are keyed on what they have.
+
+    Returns:
+        (deduplicated frame with `__key__*` join columns, key columns used)
+    """
+    df = df.loc[:, ~df.columns.str.contains("^Unnamed")]
+    keys = [col for col in KEY_COLS if col in df.columns]
+    if PHC_NAME_COL not in keys:
+        raise ValueError(f"Sheet has no '{PHC_NAME_COL}' column")
+
+    df = df.assign(**{_key_name(col): normalize_key(df[col]) for col in keys})
+    df = df[df[_key_name(PHC_NAME_COL)] != ""]
+
+    key_names = [_key_name(col) for col in keys]
+    deduped = df.groupby(key_names, sort=False, as_index=False).first()
+    return deduped, keys
+
+
+def consolidate_sheets(
+    sheets: Iterator[Tuple[str, pd.DataFrame]], output: str = ""
+) -> Tuple[pd.DataFrame, List[SheetReport]]:
+    """
+    Fold deduplicated sheets into one frame keyed on (PHC, LGA, State).
+
+    Args:
+        sheets: Iterable of (sheet name, raw frame)
+        output: Name of the consolidated file (for reporting only)
+
+    Returns:
+        (consolidated frame, per-sheet cardinality reports)
+    """
+    result: Optional[pd.DataFrame] = None
+    reports: List[SheetReport] = []
+
+    for sheet_name, raw in sheets:
+        deduped, keys = dedupe_sheet(raw)
+        reports.append(SheetReport(output, sheet_name, len(raw), len(deduped)))
+        logger.info(
+            f"{output}: {sheet_name}: {len(raw)} rows -> {len(deduped)} unique keys"
+        )
+
+        if result is None:
+            result = deduped
+            continue
+
+        join_keys = [_key_name(col) for col in keys if _key_name(col) in result.columns]
+        result = result.merge(
+            deduped, on=join_keys, how="outer", sort=False, suffixes=("", "__right")
+        )
+        # Keep the first sheet's spelling of key columns, filling keys new to this sheet
+        for col in KEY_COLS:
+            right_col = f"{col}__right"
+            if right_col in result.columns:
+                result[col] = result[col].fillna(result[right_col])
+                result = result.drop(columns=right_col)
+            if _key_name(col) in result.columns:
+                result[_key_name(col)] = result[_key_name(col)].fillna("")
+
+    if result is None:
+        return pd.DataFrame(columns=KEY_COLS), reports
+
+    result = result.drop(columns=[c for c in result.columns if c.startswith("__key__")])
+    ordered = [col for col in KEY_COLS if col in result.columns]
+    result = result[ordered + [c for c in result.columns if c not in ordered]]
+    return result.reset_index(drop=True), reports
+
+
+def consolidate(
+    source_dir=DEFAULT_SOURCE_DIR, data_dir=DEFAULT_DATA_DIR
+) -> List[ConsolidationReport]:
+    """
+    Rebuild every consolidated CSV in `data_dir` from the sheets in `source_dir`.
+
+    Returns:
+        One ConsolidationReport per output CSV
+    """
+    source_dir = Path(source_dir)
+    data_dir = Path(data_dir)
+    data_dir.mkdir(parents=True, exist_ok=True)
+
+    all_reports = []
+    for output, sub_dir in CONSOLIDATED_OUTPUTS.items():
+        sheet_dir = source_dir / sub_dir
+        if not sheet_dir.is_dir():
+            raise FileNotFoundError(f"Sheet directory not found: {sheet_dir}")
+
+        frame, reports = consolidate_sheets(iter_sheets(sheet_dir), output)
+        frame.to_csv(data_dir / output, index=False)
+        logger.info(f"Wrote {output}: {len(frame)} rows from {len(reports)} sheets")
+        all_reports.append(ConsolidationReport(output, len(frame), reports))
+
+    return all_reports
+
+
+def format_reports(all_reports: List[ConsolidationReport]) -> str:
+    """Render the cardinality reports as a fixed-width table."""
+    lines = [f"{'rows in':>8}{'rows out':>10}  sheet"]
+    for report in all_reports:
+        lines.append(f"{report.output} ({report.rows} rows)")
+        for sheet in report.sheets:
+            lines.append(f"{sheet.rows_in:>8}{sheet.rows_out:>10}  {sheet.sheet}")
+    return "\n".join(lines)
+
+
+def main(argv=None) -> int:
+    """Command-line entry point: `python -m insight_engine.consolidate`."""
+    parser = argparse.ArgumentParser(
+        prog="python -m insight_engine.consolidate",
+        description="Consolidate unconsolidated survey sheets into per-theme CSVs.",
+    )
+    parser.add_argument("--source-dir", type=Path, default=DEFAULT_SOURCE_DIR,
+                        help=f"sheet directory (default: {DEFAULT_SOURCE_DIR})")
+    parser.add_argument("--data-dir", type=Path, default=DEFAULT_DATA_DIR,
+                        help=f"consolidated CSV directory (default: {DEFAULT_DATA_DIR})")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(
+        level=logging.WARNING,
+        format="%(asctime)s | %(levelname)-8s | %(name)s | %(message)s",
+    )
+
+    try:
+        all_reports = consolidate(args.source_dir, args.data_dir)
+    except (FileNotFoundError, ValueError) as e:
+        logger.error(str(e))
+        return 1
+
+    print(format_reports(all_reports))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
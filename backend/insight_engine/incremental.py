@@ -0,0 +1,156 @@
+"""
+Content-hash bookkeeping for incremental insight engine runs.
+
+A run records the SHA-256 of every input CSV and of every intermediate
+frame (per-source scored/grouped frames, and the merged frame keyed on the
+hashes of those) in a manifest next to pickled copies of the frames. Frames
+and manifest are written atomically, the manifest right after each frame,
+and a frame file is only trusted if its own hash matches the manifest, so
+a crashed run never leaves frames that a later run would reuse. The next
+run reuses the cached frames of every source whose input hash is
+unchanged, reuses the merged frame when no intermediate frame changed, and
+only rewrites output files whose content differs.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import pickle
+from pathlib import Path
+from typing import Dict, Optional
+
+import pandas as pd
+
+logger = logging.getLogger("insight_engine")
+
+# Bump when scoring logic changes so stale intermediate frames are discarded
+CACHE_VERSION = 1
+
+MANIFEST_NAME = "manifest.json"
+
+
+def file_digest(path: Path, chunk_size: int = 1 << 20) -> str:
+    """SHA-256 of a file's contents, read in chunks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def frame_digest(*frames: pd.DataFrame) -> str:
+    """SHA-256 over the columns, index and values of one or more frames."""
+    digest = hashlib.sha256()
+    for frame in frames:
+        digest.update("\x1f".join(map(str, frame.columns)).encode())
+        digest.update(pd.util.hash_pandas_object(frame, index=True).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def text_digest(text) -> str:
+    """SHA-256 of a str (UTF-8 encoded) or bytes."""
+    data = text.encode() if isinstance(text, str) else text
+    return hashlib.sha256(data).hexdigest()
+
+
+def write_atomic(path: Path, data: bytes):
+    """Write `path` through a temporary file, so readers never see it half written."""
+    temp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        with open(temp_path, "wb") as f:
+            f.write(data)
+        os.replace(temp_path, path)
+    finally:
+        if temp_path.exists():
+            temp_path.unlink()
+
+
+class StageCache:
+    """
+    Manifest of content hashes plus pickled intermediate frames.
+
+    Args:
+        cache_dir: Directory holding `manifest.json` and `<name>.pkl` files
+    """
+
+    def __init__(self, cache_dir):
+        self.cache_dir = Path(cache_dir)
+        self.manifest = self._read_manifest()
+
+    def _read_manifest(self) -> Dict:
+        empty = {"version": CACHE_VERSION, "pandas": pd.__version__, "frames": {}}
+        path = self.cache_dir / MANIFEST_NAME
+        if not path.exists():
+            return empty
+
+        try:
+            manifest = json.loads(path.read_text())
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable cache manifest {path}: {e}")
+            return empty
+
+        if manifest.get("version") != CACHE_VERSION or manifest.get("pandas") != pd.__version__:
+            logger.info("Cache manifest is from another engine/pandas version, rebuilding")
+            return empty
+        return manifest
+
+    def save(self):
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        write_atomic(self.cache_dir / MANIFEST_NAME, json.dumps(self.manifest, indent=2).encode())
+
+    # -----------------------------
+    # Intermediate frames
+    # -----------------------------
+    def get_frames(self, name: str, input_hash: str) -> Optional[Dict[str, pd.DataFrame]]:
+        """Return cached frames for `name` if they were built from `input_hash`."""
+        entry = self.manifest["frames"].get(name)
+        path = self.cache_dir / f"{name}.pkl"
+        if not entry or entry.get("input") != input_hash or not path.exists():
+            return None
+
+        try:
+            data = path.read_bytes()
+            # A frame file not written by the run that wrote this entry
+            if text_digest(data) != entry.get("file"):
+                logger.warning(f"Ignoring cached frame {path} that doesn't match the manifest")
+                return None
+            return pickle.loads(data)
+        except (OSError, pickle.UnpicklingError, EOFError) as e:
+            logger.warning(f"Ignoring unreadable cached frame {path}: {e}")
+            return None
+
+    def put_frames(self, name: str, input_hash: str, frames: Dict[str, pd.DataFrame]) -> str:
+        """Store frames for `name` and save the manifest; returns their content hash."""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        data = pickle.dumps(frames, protocol=pickle.HIGHEST_PROTOCOL)
+        write_atomic(self.cache_dir / f"{name}.pkl", data)
+
+        frame_hash = frame_digest(*frames.values())
+        self.manifest["frames"][name] = {
+            "input": input_hash,
+            "frame": frame_hash,
+            "file": text_digest(data),
+        }
+        self.save()
+        return frame_hash
+
+    def frame_hash(self, name: str) -> Optional[str]:
+        entry = self.manifest["frames"].get(name)
+        return entry.get("frame") if entry else None
+
+    # -----------------------------
+    # Merged frame
+    # -----------------------------
+    def get_merged(self, sources_hash: str) -> Optional[pd.DataFrame]:
+        """Return the cached merged frame if it was built from `sources_hash`."""
+        frames = self.get_frames("merged", sources_hash)
+        return frames["merged"] if frames else None
+
+    def put_merged(self, sources_hash: str, merged: pd.DataFrame):
+        self.put_frames("merged", sources_hash, {"merged": merged})
+
+
+def output_unchanged(path: Path, content) -> bool:
+    """True if `path` already holds exactly `content`."""
+    return path.exists() and file_digest(path) == text_digest(content)
@@ -1,37 +1,45 @@
-import pandas as pd
-import numpy as np
-import json
+import argparse
+import hashlib
+import io
+import logging
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass
 from pathlib import Path
+from typing import Dict, List, Optional
 
-# -----------------------------
-# Load datasets
-# -----------------------------
-base_path = Path("../Data")
-service_delivery = pd.read_csv(base_path / "service_delivery.csv")
-infrastructure = pd.read_csv(base_path / "infrastructure.csv")
-inclusivity = pd.read_csv(base_path / "inclusivity.csv")
+import numpy as np
+import pandas as pd
+
+from insight_engine.columnar import COLUMNAR_FILE, COMPRESSIONS, to_arrow_ipc
+from insight_engine.incremental import StageCache, output_unchanged, text_digest
+
+logger = logging.getLogger("insight_engine")
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+DEFAULT_DATA_DIR = BACKEND_DIR / "data"
+DEFAULT_OUTPUT_DIR = BACKEND_DIR / "outputs"
 
 # -----------------------------
-# 1. RESOURCE SHORTAGE DETECTION
+# Scoring constants
 # -----------------------------
 shortage_cols = [
     'Identify Shortages of Medical Supplies(Syringes)?',
     'Identify Shortages of Medical Supplies(Bandages)?',
     'Identify Shortages of Medical Supplies(Personal Protective Equipment)?'
 ]
+SHORTAGE_TOKENS = frozenset(["yes", "identified", "true"])
 
-service_delivery["shortage_score"] = service_delivery[shortage_cols].apply(
-    lambda x: sum(x.fillna("").str.lower().isin(["yes", "identified", "true"])), axis=1
-)
-
-service_delivery["alert_level"] = service_delivery["shortage_score"].apply(
-    lambda x: "Low" if x == 0 else "Medium" if x <= 2 else "High"
-)
+infra_fail_cols = [
+    "Check for any of these building failures./Broken Celling",
+    "Check for any of these building failures./Damaged Chairs",
+    "Check for any of these building failures./Damaged Door",
+    "Check for any of these building failures./Damaged/Leaking roofs"
+]
+INFRA_FAILURE_TOKENS = frozenset(["yes", "broken", "damaged", "true"])
 
-# -----------------------------
-# 2. SERVICE QUALITY SCORE
-# -----------------------------
-mapping = {
+service_rating_map = {
     "Very Poor": 1,
     "Poor": 2,
     "Fair": 3,
@@ -40,155 +48,458 @@ mapping = {
     "Excellent": 6
 }
 
-columns_to_convert = [
+service_rating_cols = [
     "Rate the Quality of Treatment in this PHC",
     "Rate the Immunization Services Provided in the PHC",
     "Give a General Rating for the PHC"
 ]
 
-for col in columns_to_convert:
-    service_delivery[col] = service_delivery[col].map(mapping)
+communities_col = "How Many Communities Rely on this PHC for Health Care"
+referrals_col = "How many Referrals to Larger Hospitals have occurred in the last 1 year"
+PHC_NAME_COL = "Name of Primary Health Center"
 
-service_delivery["mean_service_score"] = service_delivery[columns_to_convert].mean(axis=1)
-service_delivery["service_score_rank"] = service_delivery["mean_service_score"].rank(pct=True)
-
-# Flag lowest 10% performers
-service_delivery["low_quality_flag"] = np.where(service_delivery["service_score_rank"] <= 0.10, 1, 0)
 
 # -----------------------------
-# 3. INFRASTRUCTURE SCORING
+# Columnar scoring helpers
 # -----------------------------
-infra_fail_cols = [
-    "Check for any of these building failures./Broken Celling",
-    "Check for any of these building failures./Damaged Chairs",
-    "Check for any of these building failures./Damaged Door",
-    "Check for any of these building failures./Damaged/Leaking roofs"
-]
-
-infrastructure["infra_failures"] = infrastructure[infra_fail_cols].apply(
-    lambda x: sum(x.fillna("").str.lower().isin(["yes", "broken", "damaged", "true"])), axis=1
-)
+def count_token_matches(df, columns, tokens):
+    """
+    Count, per row, how many of `columns` hold one of `tokens` (case-insensitive).
+
+    Each column is converted to a categorical so the lowercase/lookup work runs
+    once per distinct answer ("Yes", "No", ...) instead of once per cell; the
+    per-row result is then a NumPy gather over the category codes.
+    Non-string cells (NaN, numbers, booleans) never match.
+    """
+    counts = np.zeros(len(df), dtype=np.int64)
+    for col in columns:
+        values = df[col].astype("category")
+        hits = np.fromiter(
+            (isinstance(c, str) and c.lower() in tokens for c in values.cat.categories),
+            dtype=bool,
+            count=len(values.cat.categories),
+        )
+        # Missing values carry code -1, which indexes the trailing False
+        hits = np.append(hits, False)
+        counts += hits[values.cat.codes.to_numpy()]
+    return pd.Series(counts, index=df.index)
+
+
+def band_shortage_level(scores):
+    """Band shortage scores: 0 -> Low, 1-2 -> Medium, 3+ -> High."""
+    levels = np.select([scores == 0, scores <= 2], ["Low", "Medium"], default="High")
+    return pd.Series(levels, index=scores.index, dtype=object)
+
+
+def band_resource_alert(scores):
+    """Band resource risk: < 0.3 -> Low, < 0.6 -> Medium, else (incl. NaN) High."""
+    levels = np.select([scores < 0.3, scores < 0.6], ["Low", "Medium"], default="High")
+    return pd.Series(levels, index=scores.index, dtype=object)
+
+
+def min_max(series):
+    """Min-max normalise a series to [0, 1]."""
+    return (series - series.min()) / (series.max() - series.min())
 
-infrastructure["infra_score"] = 1 - (infrastructure["infra_failures"] / len(infra_fail_cols))
-infrastructure["infra_score_norm"] = (infrastructure["infra_score"] - infrastructure["infra_score"].min()) / (
-    infrastructure["infra_score"].max() - infrastructure["infra_score"].min()
-)
 
-# -----------------------------
-# 4. INCLUSIVITY SCORING (FIXED)
-# -----------------------------
-col_name = "How Many Communities Rely on this PHC for Health Care"
-
-# Force numeric conversion, strip text, and fill NaN with 0
-inclusivity[col_name] = (
-    inclusivity[col_name]
-    .astype(str)
-    .str.extract("(\d+)", expand=False)      # extract any digits
-    .astype(float)
-    .fillna(0)
-)
-
-inclusivity["communities_served_norm"] = (
-    (inclusivity[col_name] - inclusivity[col_name].min()) /
-    (inclusivity[col_name].max() - inclusivity[col_name].min())
-)
+def clean_phc_names(df):
+    df[PHC_NAME_COL] = df[PHC_NAME_COL].astype(str).str.strip().str.lower()
+    return df
 
 
 # -----------------------------
-# 5. COMBINE DATASETS (DEDUP FIXED)
+# Per-source scoring
 # -----------------------------
-def clean_phc_names(df):
-    df["Name of Primary Health Center"] = (
-        df["Name of Primary Health Center"].astype(str).str.strip().str.lower()
+def score_service_delivery(service_delivery):
+    # 1. RESOURCE SHORTAGE DETECTION
+    service_delivery["shortage_score"] = count_token_matches(
+        service_delivery, shortage_cols, SHORTAGE_TOKENS
     )
-    return df
+    service_delivery["alert_level"] = band_shortage_level(service_delivery["shortage_score"])
 
-service_delivery = clean_phc_names(service_delivery)
-infrastructure = clean_phc_names(infrastructure)
-inclusivity = clean_phc_names(inclusivity)
+    # 2. SERVICE QUALITY SCORE
+    for col in service_rating_cols:
+        service_delivery[col] = service_delivery[col].map(service_rating_map)
 
-# Keep the first non-null LGA/State for reference
-phc_meta = (
-    service_delivery[["Name of Primary Health Center", "PHC LGA", "State of PHC"]]
-    .drop_duplicates(subset="Name of Primary Health Center")
-)
+    service_delivery["mean_service_score"] = service_delivery[service_rating_cols].mean(axis=1)
+    service_delivery["service_score_rank"] = service_delivery["mean_service_score"].rank(pct=True)
 
-# Average numeric values
-service_delivery_grp = service_delivery.groupby("Name of Primary Health Center", as_index=False).mean(numeric_only=True)
-infrastructure_grp = infrastructure.groupby("Name of Primary Health Center", as_index=False).mean(numeric_only=True)
-inclusivity_grp = inclusivity.groupby("Name of Primary Health Center", as_index=False).mean(numeric_only=True)
-
-# Merge grouped frames
-merged = (
-    service_delivery_grp
-    .merge(infrastructure_grp, on="Name of Primary Health Center", how="left")
-    .merge(inclusivity_grp, on="Name of Primary Health Center", how="left")
-    .merge(phc_meta, on="Name of Primary Health Center", how="left")
-)
-
-print(f"Merged dataset size after grouping: {merged.shape}")
-
-
-# Normalize service score
-merged["service_score_norm"] = (merged["mean_service_score"] - merged["mean_service_score"].min()) / (
-    merged["mean_service_score"].max() - merged["mean_service_score"].min()
-)
-
-# -----------------------------
-# 6. UNDERSERVED INDEX
-# -----------------------------
-merged["underserved_index"] = (
-    0.5 * (1 - merged["infra_score_norm"].fillna(0)) +
-    0.3 * (1 - merged["service_score_norm"].fillna(0)) +
-    0.2 * merged["communities_served_norm"].fillna(0)
-)
+    # Flag lowest 10% performers
+    service_delivery["low_quality_flag"] = np.where(service_delivery["service_score_rank"] <= 0.10, 1, 0)
+    return service_delivery
 
-merged["underserved_rank"] = merged["underserved_index"].rank(ascending=False, pct=True)
-merged["underserved_flag"] = np.where(merged["underserved_rank"] >= 0.90, 1, 0) # top 10% worst
 
-# -----------------------------
-# 7. RESOURCE FORECASTING (BONUS)
-# -----------------------------
-merged["referrals"] = service_delivery["How many Referrals to Larger Hospitals have occurred in the last 1 year"]
-merged["referrals_norm"] = (merged["referrals"] - merged["referrals"].min()) / (
-    merged["referrals"].max() - merged["referrals"].min()
-)
+def score_infrastructure(infrastructure):
+    # 3. INFRASTRUCTURE SCORING
+    infrastructure["infra_failures"] = count_token_matches(
+        infrastructure, infra_fail_cols, INFRA_FAILURE_TOKENS
+    )
+    infrastructure["infra_score"] = 1 - (infrastructure["infra_failures"] / len(infra_fail_cols))
+    infrastructure["infra_score_norm"] = min_max(infrastructure["infra_score"])
+    return infrastructure
+
+
+def score_inclusivity(inclusivity):
+    # 4. INCLUSIVITY SCORING (FIXED)
+    # Force numeric conversion, strip text, and fill NaN with 0
+    inclusivity[communities_col] = (
+        inclusivity[communities_col]
+        .astype(str)
+        .str.extract(r"(\d+)", expand=False)      # extract any digits
+        .astype(float)
+        .fillna(0)
+    )
+    inclusivity["communities_served_norm"] = min_max(inclusivity[communities_col])
+    return inclusivity
 
-merged["resource_risk_score"] = (
-    0.6 * merged["shortage_score"].fillna(0) / 3 +
-    0.4 * merged["referrals_norm"].fillna(0)
-)
 
-merged["resource_alert"] = merged["resource_risk_score"].apply(
-    lambda x: "Low" if x < 0.3 else "Medium" if x < 0.6 else "High"
-)
+# Source name -> (consolidated CSV, scorer)
+SOURCES = {
+    "service_delivery": ("service_delivery.csv", score_service_delivery),
+    "infrastructure": ("infrastructure.csv", score_infrastructure),
+    "inclusivity": ("inclusivity.csv", score_inclusivity),
+}
 
-# -----------------------------
-# 8. EXPORT RESULTS (FIXED)
-# -----------------------------
-out_dir = Path("../Outputs")
-out_dir.mkdir(exist_ok=True)
-
-# Resource shortage alerts
-resource_alerts = merged[
-    ["Name of Primary Health Center", "PHC LGA", "State of PHC", "shortage_score"]
-].copy()
-resource_alerts["alert_level"] = merged.get("alert_level", "Unknown")
-resource_alerts.to_json(out_dir / "outbreak_alerts.json", orient="records", indent=2)
-
-# Underserved PHCs
-underserved = merged[
-    ["Name of Primary Health Center", "PHC LGA", "State of PHC", "underserved_index", "underserved_flag"]
-]
-underserved.to_json(out_dir / "underserved_phcs.json", orient="records", indent=2)
 
-# Resource warnings
-resource_warnings = merged[
-    ["Name of Primary Health Center", "PHC LGA", "State of PHC", "resource_risk_score", "resource_alert"]
-]
-resource_warnings.to_json(out_dir / "resource_warnings.json", orient="records", indent=2)
+@dataclass
+class StageTiming:
+    """Wall time and peak traced memory of one pipeline stage."""
+
+    stage: str
+    seconds: float
+    peak_bytes: Optional[int] = None
+
+
+class InsightPipeline:
+    """
+    Insight engine pipeline: load -> score -> merge -> index -> export.
+
+    Stages run in order and keep their results on the instance, so callers
+    can run the whole pipeline with `run()` or drive (and inspect) individual
+    stages, e.g. from the API process or a profiler.
+
+    With `columnar=True` the export stage also writes `metrics.arrow`, a typed
+    Arrow IPC file with every per-PHC metric (see `insight_engine.columnar`).
+
+    With a `cache_dir` the pipeline is incremental: only sources whose CSV
+    content changed are re-read and re-scored, the merge/index stages are
+    skipped when no scored frame changed, and only output files whose
+    content changed are rewritten (see `insight_engine.incremental`).
+
+    Args:
+        data_dir: Directory holding the consolidated source CSVs
+        output_dir: Directory the JSON/CSV outputs are written to
+        cache_dir: Directory for content hashes and intermediate frames
+            (None runs every stage from scratch)
+        columnar: Also export the Arrow IPC metrics file (requires pyarrow)
+        columnar_compression: "zstd", "lz4" or "none" for the Arrow file
+    """
+
+    STAGES = ("load", "score", "merge", "index", "export")
+
+    def __init__(
+        self,
+        data_dir=DEFAULT_DATA_DIR,
+        output_dir=DEFAULT_OUTPUT_DIR,
+        cache_dir=None,
+        columnar: bool = False,
+        columnar_compression: str = "zstd",
+    ):
+        self.data_dir = Path(data_dir)
+        self.output_dir = Path(output_dir)
+        self.cache = StageCache(cache_dir) if cache_dir is not None else None
+        self.columnar = columnar
+        self.columnar_compression = columnar_compression
+
+        # Per-source row-level (scored) and per-PHC (grouped) frames
+        self.frames: Dict[str, pd.DataFrame] = {}
+        self.grouped: Dict[str, pd.DataFrame] = {}
+        self.input_hashes: Dict[str, str] = {}
+        self.stale_sources: List[str] = []
+        self.merged: Optional[pd.DataFrame] = None
+        self.merged_from_cache = False
+        self.written: List[Path] = []
+        self.timings: List[StageTiming] = []
+
+    # -----------------------------
+    # Load datasets
+    # -----------------------------
+    def load(self):
+        """Read the source CSVs, reusing cached frames for unchanged files."""
+        self.stale_sources = []
+        for source, (file_name, _) in SOURCES.items():
+            path = self.data_dir / file_name
+            if self.cache is None:
+                self.frames[source] = pd.read_csv(path)
+                self.stale_sources.append(source)
+                continue
+
+            content = path.read_bytes()
+            input_hash = hashlib.sha256(content).hexdigest()
+            self.input_hashes[source] = input_hash
+
+            cached = self.cache.get_frames(source, input_hash)
+            if cached is not None:
+                self.frames[source] = cached["scored"]
+                self.grouped[source] = cached["grouped"]
+            else:
+                self.frames[source] = pd.read_csv(io.BytesIO(content))
+                self.stale_sources.append(source)
+
+        logger.info(f"Sources to (re)score: {self.stale_sources or 'none'}")
+
+    def score(self):
+        """Score each changed source, normalise its PHC names and group it per PHC."""
+        for source in self.stale_sources:
+            scorer = SOURCES[source][1]
+            scored = clean_phc_names(scorer(self.frames[source]))
+            # Average numeric values
+            grouped = scored.groupby(PHC_NAME_COL, as_index=False).mean(numeric_only=True)
+
+            self.frames[source] = scored
+            self.grouped[source] = grouped
+            if self.cache is not None:
+                self.cache.put_frames(
+                    source, self.input_hashes[source], {"scored": scored, "grouped": grouped}
+                )
+
+    # -----------------------------
+    # 5. COMBINE DATASETS (DEDUP FIXED)
+    # -----------------------------
+    def merge(self):
+        """Merge the per-PHC frames into one row per facility."""
+        self.merged_from_cache = False
+        if self.cache is not None:
+            cached = self.cache.get_merged(self._sources_hash())
+            if cached is not None:
+                logger.info("Scored frames unchanged, reusing cached merged frame")
+                self.merged = cached
+                self.merged_from_cache = True
+                return
+
+        # Keep the first non-null LGA/State for reference
+        phc_meta = (
+            self.frames["service_delivery"][[PHC_NAME_COL, "PHC LGA", "State of PHC"]]
+            .drop_duplicates(subset=PHC_NAME_COL)
+        )
+
+        # Merge grouped frames
+        merged = (
+            self.grouped["service_delivery"]
+            .merge(self.grouped["infrastructure"], on=PHC_NAME_COL, how="left")
+            .merge(self.grouped["inclusivity"], on=PHC_NAME_COL, how="left")
+            .merge(phc_meta, on=PHC_NAME_COL, how="left")
+        )
+
+        logger.info(f"Merged dataset size after grouping: {merged.shape}")
+
+        # Normalize service score
+        merged["service_score_norm"] = min_max(merged["mean_service_score"])
+        self.merged = merged
+
+    def index(self):
+        """Derive the underserved index and resource risk score per PHC."""
+        if self.merged_from_cache:
+            return
+        merged = self.merged
+
+        # -----------------------------
+        # 6. UNDERSERVED INDEX
+        # -----------------------------
+        merged["underserved_index"] = (
+            0.5 * (1 - merged["infra_score_norm"].fillna(0)) +
+            0.3 * (1 - merged["service_score_norm"].fillna(0)) +
+            0.2 * merged["communities_served_norm"].fillna(0)
+        )
+
+        merged["underserved_rank"] = merged["underserved_index"].rank(ascending=False, pct=True)
+        merged["underserved_flag"] = np.where(merged["underserved_rank"] >= 0.90, 1, 0) # top 10% worst
+
+        # -----------------------------
+        # 7. RESOURCE FORECASTING (BONUS)
+        # -----------------------------
+        merged["referrals"] = self.frames["service_delivery"][referrals_col]
+        merged["referrals_norm"] = min_max(merged["referrals"])
+
+        merged["resource_risk_score"] = (
+            0.6 * merged["shortage_score"].fillna(0) / 3 +
+            0.4 * merged["referrals_norm"].fillna(0)
+        )
+
+        merged["resource_alert"] = band_resource_alert(merged["resource_risk_score"])
+
+        if self.cache is not None:
+            self.cache.put_merged(self._sources_hash(), merged)
+
+    # -----------------------------
+    # 8. EXPORT RESULTS (FIXED)
+    # -----------------------------
+    def export(self) -> Dict[str, Path]:
+        """Write the JSON outputs, CSV summary and optional Arrow file; returns the output paths."""
+        merged = self.merged
+        out_dir = self.output_dir
+        out_dir.mkdir(parents=True, exist_ok=True)
+
+        paths = {
+            "outbreak_alerts": out_dir / "outbreak_alerts.json",
+            "underserved_phcs": out_dir / "underserved_phcs.json",
+            "resource_warnings": out_dir / "resource_warnings.json",
+            "metrics_summary": out_dir / "metrics_summary.csv",
+        }
+
+        # Resource shortage alerts
+        resource_alerts = merged[
+            [PHC_NAME_COL, "PHC LGA", "State of PHC", "shortage_score"]
+        ].copy()
+        resource_alerts["alert_level"] = merged.get("alert_level", "Unknown")
+
+        # Underserved PHCs
+        underserved = merged[
+            [PHC_NAME_COL, "PHC LGA", "State of PHC", "underserved_index", "underserved_flag"]
+        ]
+
+        # Resource warnings
+        resource_warnings = merged[
+            [PHC_NAME_COL, "PHC LGA", "State of PHC", "resource_risk_score", "resource_alert"]
+        ]
+
+        contents = {
+            "outbreak_alerts": resource_alerts.to_json(orient="records", indent=2),
+            "underserved_phcs": underserved.to_json(orient="records", indent=2),
+            "resource_warnings": resource_warnings.to_json(orient="records", indent=2),
+            # Optional CSV summary for inspection
+            "metrics_summary": merged.to_csv(index=False),
+        }
+
+        columnar_path = out_dir / COLUMNAR_FILE
+        if self.columnar:
+            paths["metrics_columnar"] = columnar_path
+            contents["metrics_columnar"] = to_arrow_ipc(merged, self.columnar_compression)
+        elif columnar_path.exists():
+            # Never leave a columnar file behind that no longer matches the CSV
+            logger.info(f"Removing stale {columnar_path}")
+            columnar_path.unlink()
+
+        self.written = []
+        for name, content in contents.items():
+            path = paths[name]
+            if self.cache is not None and output_unchanged(path, content):
+                continue
+            if isinstance(content, bytes):
+                path.write_bytes(content)
+            else:
+                path.write_text(content)
+            self.written.append(path)
+
+        if self.cache is not None:
+            self.cache.save()
+
+        logger.info(
+            f"Insight engine wrote {len(self.written)} of {len(paths)} outputs in {out_dir}"
+        )
+        return paths
+
+    def _sources_hash(self) -> str:
+        """Combined content hash of every source's scored/grouped frames."""
+        return text_digest("".join(self.cache.frame_hash(source) or "" for source in SOURCES))
+
+    def run(self, trace_memory: bool = False) -> List[StageTiming]:
+        """
+        Run every stage in order, recording per-stage timings.
+
+        Args:
+            trace_memory: Also record each stage's peak allocated memory
+                (via tracemalloc, which slows the run down noticeably)
+
+        Returns:
+            List of StageTiming, one per stage
+        """
+        self.timings = []
+        started_tracing = trace_memory and not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start()
+
+        try:
+            for stage in self.STAGES:
+                if trace_memory:
+                    tracemalloc.reset_peak()
+                start = time.perf_counter()
+                getattr(self, stage)()
+                elapsed = time.perf_counter() - start
+                peak = tracemalloc.get_traced_memory()[1] if trace_memory else None
+                self.timings.append(StageTiming(stage, elapsed, peak))
+                logger.debug(f"Stage '{stage}' finished in {elapsed:.3f}s")
+        finally:
+            if started_tracing:
+                tracemalloc.stop()
+
+        return self.timings
+
+
+def format_timings(timings: List[StageTiming]) -> str:
+    """Render stage timings as a fixed-width table."""
+    lines = [f"{'stage':<10}{'wall time (s)':>16}{'peak memory (MiB)':>20}"]
+    for timing in timings:
+        peak = "-" if timing.peak_bytes is None else f"{timing.peak_bytes / 2**20:.2f}"
+        lines.append(f"{timing.stage:<10}{timing.seconds:>16.3f}{peak:>20}")
+    total = sum(t.seconds for t in timings)
+    lines.append(f"{'total':<10}{total:>16.3f}")
+    return "\n".join(lines)
+
+
+def main(argv=None) -> int:
+    """Command-line entry point: `python -m insight_engine`."""
+    parser = argparse.ArgumentParser(
+        prog="python -m insight_engine",
+        description="Generate CheckMyPHC insight outputs from the consolidated source CSVs.",
+    )
+    parser.add_argument("--data-dir", type=Path, default=DEFAULT_DATA_DIR,
+                        help=f"source CSV directory (default: {DEFAULT_DATA_DIR})")
+    parser.add_argument("--output-dir", type=Path, default=DEFAULT_OUTPUT_DIR,
+                        help=f"output directory (default: {DEFAULT_OUTPUT_DIR})")
+    parser.add_argument("--cache-dir", type=Path, default=None,
+                        help="incremental cache directory (default: <output-dir>/.cache)")
+    parser.add_argument("--full", action="store_true",
+                        help="recompute every stage, ignoring and not updating the cache")
+    parser.add_argument("--columnar", action="store_true",
+                        help=f"also write {COLUMNAR_FILE} (Arrow IPC, requires pyarrow)")
+    parser.add_argument("--columnar-compression", choices=COMPRESSIONS, default="zstd",
+                        help="compression of the Arrow file (default: zstd)")
+    parser.add_argument("--no-memory", action="store_true",
+                        help="skip tracemalloc peak-memory tracking")
+    parser.add_argument("-v", "--verbose", action="store_true", help="log each stage")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(
+        level=logging.DEBUG if args.verbose else logging.INFO,
+        format="%(asctime)s | %(levelname)-8s | %(name)s | %(message)s",
+    )
 
-# Optional CSV summary for inspection
-merged.to_csv(out_dir / "metrics_summary.csv", index=False)
+    cache_dir = None
+    if not args.full:
+        cache_dir = args.cache_dir or args.output_dir / ".cache"
 
-print("Insight engine successfully generated JSON outputs.")
\ No newline at end of file
+    pipeline = InsightPipeline(
+        data_dir=args.data_dir,
+        output_dir=args.output_dir,
+        cache_dir=cache_dir,
+        columnar=args.columnar,
+        columnar_compression=args.columnar_compression,
+    )
+    try:
+        timings = pipeline.run(trace_memory=not args.no_memory)
+    except FileNotFoundError as e:
+        logger.error(f"Input file not found: {e}")
+        return 1
+    except RuntimeError as e:
+        logger.error(str(e))
+        return 1
+
+    print(format_timings(timings))
+    print(f"rescored sources: {', '.join(pipeline.stale_sources) or 'none'}")
+    print(f"rewritten outputs: {', '.join(p.name for p in pipeline.written) or 'none'}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -163,7 +163,7 @@ echo "9. Checking render.yaml configuration..."
 if [ -f "render.yaml" ]; then
     check_passed "render.yaml found"
     
-    if grep -q "healthCheckPath: /health" render.yaml; then
+    if grep -q "healthCheckPath: /ready" render.yaml; then
         check_passed "Health check configured"
     else
         check_warning "Health check not configured in render.yaml"